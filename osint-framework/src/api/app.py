@@ -35,34 +35,45 @@ Design Tradeoffs
 - Review trigger: If WebSocket connection drops below 90%, optimize connection handling
 """
 
-from fastapi import FastAPI, WebSocket, WebSocketDisconnect, HTTPException, BackgroundTasks, Depends
-from fastapi.responses import HTMLResponse, JSONResponse
+from fastapi import FastAPI, WebSocket, WebSocketDisconnect, HTTPException, BackgroundTasks, Depends, Request
+from fastapi.responses import HTMLResponse, JSONResponse, StreamingResponse, Response
 from fastapi.staticfiles import StaticFiles
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel, Field, validator
 from typing import Dict, List, Any, Optional, Set
 import asyncio
+import hashlib
 import json
 import logging
 import uuid
 from datetime import datetime
+from pathlib import Path
 import structlog
-from sqlalchemy.orm import Session
 
 from ..core.pipeline.discovery import DiscoveryEngine
 from ..core.pipeline.fetch import FetchManager
 from ..core.pipeline.parse import ParseEngine
 from ..core.pipeline.normalize import NormalizationEngine
+from ..core.pipeline.normalization_cache import NormalizationCache
 from ..core.pipeline.resolve import EntityResolver
 from ..core.pipeline.report import ReportGenerator, ReportFormat
 from ..core.models.entities import InvestigationInput, InvestigationReport
 from ..connectors.base import ConnectorRegistry
 from ..config import get_config
+from .jobs import InvestigationQueue, QueueFullError
+from .job_queue import create_job_queue
+from .status_writer import StatusWriter
+from .maintenance import StorageMaintenance
+from .report_cache import ReportExportCache, RenderedReport
 from ..db import (
     get_db, init_db, Investigation as DBInvestigation, 
     InvestigationReport as DBInvestigationReport,
     get_investigation, save_investigation, save_investigation_report,
-    get_investigation_report, list_investigations, delete_investigation
+    get_investigation_report, list_investigations, delete_investigation, get_investigations,
+    find_investigations_with_entity, get_investigation_entities, get_entity_relationships,
+    get_cached_entities, save_cached_entities, search_reports, SearchUnavailableError,
+    list_investigations_page, stream_investigations, decode_cursor, get_latest_report_id,
+    get_report_ids
 )
 
 
@@ -106,6 +117,7 @@ class InvestigationStatus(BaseModel):
     started_at: Optional[datetime] = None
     estimated_completion: Optional[datetime] = None
     correlation_id: str
+    queue_position: Optional[int] = None  # set while waiting for a worker
 
 
 class WebSocketMessage(BaseModel):
@@ -127,7 +139,7 @@ class ConnectionManager:
     async def connect(self, websocket: WebSocket, investigation_id: str):
         """Accept WebSocket connection."""
         await websocket.accept()
-        connection_id = str(uuid4())
+        connection_id = str(uuid.uuid4())
         self.active_connections[connection_id] = websocket
         
         # Subscribe to investigation updates
@@ -235,7 +247,13 @@ def initialize_components(connector_registry: ConnectorRegistry):
     if parse_engine is None:
         parse_engine = ParseEngine()
     if normalization_engine is None:
-        normalization_engine = NormalizationEngine()
+        # Normalized entities are shared across investigations through entity_cache
+        normalization_engine = NormalizationEngine(cache=NormalizationCache(
+            max_entries=config.ENTITY_CACHE_SIZE,
+            ttl_seconds=config.ENTITY_CACHE_TTL_HOURS * 3600,
+            load=get_cached_entities,
+            save=save_cached_entities,
+        ))
     if entity_resolver is None:
         entity_resolver = EntityResolver()
     if report_generator is None:
@@ -247,6 +265,76 @@ active_investigations: Dict[str, InvestigationStatus] = {}
 
 config = get_config()
 
+# Admission-controlled worker pool for background investigations
+investigation_queue = InvestigationQueue(
+    workers=config.MAX_CONCURRENT_INVESTIGATIONS,
+    max_pending=config.INVESTIGATION_QUEUE_SIZE,
+    max_pending_per_tenant=config.INVESTIGATION_QUEUE_PER_TENANT,
+)
+
+# In worker mode investigations run in `python -m src.api.worker` processes instead
+job_queue = create_job_queue() if config.INVESTIGATION_EXECUTION == "worker" else None
+progress_relay_task: Optional[asyncio.Task] = None
+
+# Status changes are persisted in coalesced batches off the event loop
+status_writer = StatusWriter(flush_interval=config.STATUS_FLUSH_INTERVAL)
+report_export_cache = ReportExportCache(
+    directory=str(Path(config.REPORT_STORAGE_PATH) / "exports") if config.REPORT_EXPORT_CACHE_ON_DISK else None,
+    max_entries=config.REPORT_EXPORT_CACHE_SIZE,
+)
+storage_maintenance = StorageMaintenance(
+    interval=config.MAINTENANCE_INTERVAL_MINUTES * 60,
+    archive_after_days=config.REPORT_ARCHIVE_AFTER_DAYS,
+    batch_size=config.MAINTENANCE_BATCH_SIZE,
+    vacuum_pages=config.SQLITE_VACUUM_PAGES,
+    export_cache=report_export_cache,
+    export_max_bytes=config.REPORT_EXPORT_CACHE_MAX_MB * 1024 * 1024,
+)
+
+
+# Serializes the worker queue's admission check with the enqueue it admits
+worker_admission_lock = asyncio.Lock()
+
+
+async def remove_investigation(investigation_id: str) -> bool:
+    """Delete an investigation with its reports and their cached exports."""
+    report_ids = await get_report_ids(investigation_id)
+    deleted = await delete_investigation(investigation_id)
+    await report_export_cache.discard(report_ids)
+    return deleted
+
+
+def _bound_tenants() -> Dict[str, Set[str]]:
+    """TENANT_API_KEYS as {sha256 of API key: tenants that key may act for}."""
+    bound: Dict[str, Set[str]] = {}
+    for entry in config.TENANT_API_KEYS.split(","):
+        tenant, _, key_hash = entry.strip().rpartition(":")
+        if tenant and key_hash:
+            bound.setdefault(key_hash.lower(), set()).add(tenant)
+    return bound
+
+
+tenant_api_keys = _bound_tenants()
+
+
+def get_tenant(request: Request) -> str:
+    """
+    Tenant key for queue fairness.
+
+    The tenant header counts only when the request's API key is bound to that
+    tenant; otherwise the tenant is derived from a hash of the API key (the
+    key itself is never logged or stored), else the client address.
+    """
+    api_key = request.headers.get(config.API_KEY_HEADER)
+    if not api_key:
+        return request.client.host if request.client else "anonymous"
+    key_hash = hashlib.sha256(api_key.encode("utf-8")).hexdigest()
+    claimed = request.headers.get(config.TENANT_HEADER)
+    if claimed and claimed in tenant_api_keys.get(key_hash, ()):
+        return claimed
+    return f"key-{key_hash[:16]}"
+
+
 app = FastAPI(
     title=config.API_TITLE,
     description=config.API_DESCRIPTION,
@@ -731,10 +819,11 @@ async def read_root():
     return HTMLResponse(content=html_content)
 
 
-@app.post("/api/investigations", response_model=Dict[str, str])
-async def create_investigation(request: InvestigationRequest):
-    """Create a new investigation."""
-    correlation_id = str(uuid4())
+@app.post("/api/investigations", response_model=Dict[str, Any])
+async def create_investigation(request: InvestigationRequest, http_request: Request):
+    """Create a new investigation and queue it for a worker (429 when the queue is full)."""
+    correlation_id = str(uuid.uuid4())
+    tenant = get_tenant(http_request)
     
     logger.info("Creating new investigation", {
         "correlation_id": correlation_id,
@@ -742,6 +831,12 @@ async def create_investigation(request: InvestigationRequest):
     })
     
     try:
+        if job_queue is not None:
+            return await enqueue_worker_investigation(request, tenant, correlation_id)
+
+        # Reject early, before any planning work, when there is no room
+        investigation_queue.check_admission(tenant)
+
         # Convert request to InvestigationInput
         investigation_input = InvestigationInput(
             subject_identifiers=request.subject_identifiers,
@@ -752,12 +847,14 @@ async def create_investigation(request: InvestigationRequest):
         # Generate query plan
         query_plan = await discovery_engine.generate_query_plan(investigation_input, correlation_id)
         
+        investigation_id = investigation_input.investigation_id
+
         # Create investigation status
         investigation_status = InvestigationStatus(
-            investigation_id=investigation_input.investigation_id,
+            investigation_id=investigation_id,
             status="pending",
             progress_percentage=0.0,
-            current_stage="query_generation",
+            current_stage="queued",
             entities_found=0,
             queries_executed=len(query_plan.queries),
             errors=[],
@@ -765,7 +862,7 @@ async def create_investigation(request: InvestigationRequest):
             correlation_id=correlation_id
         )
         
-        active_investigations[investigation_input.investigation_id] = investigation_status
+        active_investigations[investigation_id] = investigation_status
         
         # Save initial investigation to database
         db_investigation = DBInvestigation(
@@ -776,24 +873,41 @@ async def create_investigation(request: InvestigationRequest):
             investigation_constraints=investigation_input.investigation_constraints,
             confidence_thresholds=investigation_input.confidence_thresholds,
             progress_percentage=0.0,
-            current_stage="query_generation",
+            current_stage="queued",
             entities_found=0,
             queries_executed=len(query_plan.queries),
             errors=[]
         )
-        save_investigation(db_investigation)
+        await save_investigation(db_investigation)
         
-        # Start investigation in background
-        asyncio.create_task(run_investigation(investigation_input, query_plan, correlation_id))
+        # submit() re-checks admission synchronously; undo the record if the queue filled up meanwhile
+        try:
+            position = investigation_queue.submit(
+                investigation_id, tenant,
+                lambda: run_investigation(investigation_input, query_plan, correlation_id))
+        except QueueFullError:
+            active_investigations.pop(investigation_id, None)
+            await remove_investigation(investigation_id)
+            raise
+        investigation_status.queue_position = position
         
-        logger.info("Investigation created successfully", {
+        logger.info("Investigation queued", {
             "correlation_id": correlation_id,
-            "investigation_id": investigation_input.investigation_id,
-            "queries_count": len(query_plan.queries)
+            "investigation_id": investigation_id,
+            "queries_count": len(query_plan.queries),
+            "queue_position": position
         })
         
-        return {"investigation_id": investigation_input.investigation_id, "status": "created"}
+        return {"investigation_id": investigation_id, "status": "created", "queue_position": position}
         
+    except QueueFullError as e:
+        logger.warning("Investigation rejected", {
+            "correlation_id": correlation_id,
+            "tenant": tenant,
+            "reason": str(e)
+        })
+        raise HTTPException(status_code=429, detail=str(e),
+                            headers={"Retry-After": str(e.retry_after)})
     except Exception as e:
         logger.error("Failed to create investigation", {
             "correlation_id": correlation_id,
@@ -802,6 +916,63 @@ async def create_investigation(request: InvestigationRequest):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+async def enqueue_worker_investigation(request: InvestigationRequest, tenant: str,
+                                       correlation_id: str) -> Dict[str, Any]:
+    """
+    Record the investigation and hand it to the worker processes via the job queue.
+
+    Admission and enqueue are serialized within this process. The queue
+    limits are soft across API processes: concurrent requests to different
+    processes can each pass the check, overshooting a limit by at most one
+    job per process.
+    """
+    # Cheap early rejection; re-checked together with the enqueue below
+    await asyncio.to_thread(job_queue.check_admission, tenant, config.INVESTIGATION_QUEUE_SIZE,
+                            config.INVESTIGATION_QUEUE_PER_TENANT)
+    investigation_id = str(uuid.uuid4())
+
+    await save_investigation(DBInvestigation(
+        investigation_id=investigation_id,
+        correlation_id=correlation_id,
+        status="pending",
+        subject_identifiers=request.subject_identifiers,
+        investigation_constraints=request.investigation_constraints,
+        confidence_thresholds=request.confidence_thresholds,
+        progress_percentage=0.0,
+        current_stage="queued",
+        entities_found=0,
+        queries_executed=0,
+        errors=[]
+    ))
+    # Workers plan the queries themselves, so the API does no pipeline work
+    payload = {
+        "input": {
+            "investigation_id": investigation_id,
+            "subject_identifiers": request.subject_identifiers,
+            "investigation_constraints": request.investigation_constraints or {},
+            "confidence_thresholds": request.confidence_thresholds or {},
+        },
+        "correlation_id": correlation_id,
+    }
+    try:
+        async with worker_admission_lock:
+            await asyncio.to_thread(job_queue.check_admission, tenant, config.INVESTIGATION_QUEUE_SIZE,
+                                    config.INVESTIGATION_QUEUE_PER_TENANT)
+            await asyncio.to_thread(job_queue.enqueue, investigation_id, tenant, payload)
+    except Exception:
+        # No job will ever run this investigation; don't leave it pending
+        await remove_investigation(investigation_id)
+        raise
+    position = await asyncio.to_thread(job_queue.position, investigation_id)
+
+    logger.info("Investigation queued for workers", {
+        "correlation_id": correlation_id,
+        "investigation_id": investigation_id,
+        "queue_position": position
+    })
+    return {"investigation_id": investigation_id, "status": "created", "queue_position": position}
+
+
 async def run_investigation(investigation_input: InvestigationInput, query_plan, correlation_id: str):
     """Run investigation in background with progress updates."""
     logger = structlog.get_logger("investigation_runner").bind(
@@ -895,7 +1066,7 @@ async def run_investigation(investigation_input: InvestigationInput, query_plan,
             detailed_findings=report.detailed_findings,
             confidence_score=report.confidence_score if hasattr(report, 'confidence_score') else 0.0
         )
-        save_investigation_report(db_report)
+        await save_investigation_report(db_report, entities=resolution_result.resolved_entities)
         
         # Update status: completed
         await update_investigation_status(
@@ -940,35 +1111,81 @@ async def run_investigation(investigation_input: InvestigationInput, query_plan,
 async def update_investigation_status(investigation_id: str, status: str, progress: float, 
                                   stage: str, correlation_id: str):
     """Update investigation status and broadcast to WebSocket clients."""
+    # Always persist: in a worker process the database is how progress reaches the API
+    status_writer.update(investigation_id, status=status, progress_percentage=progress,
+                         current_stage=stage)
+
     if investigation_id in active_investigations:
         active_investigations[investigation_id].status = status
         active_investigations[investigation_id].progress_percentage = progress
         active_investigations[investigation_id].current_stage = stage
-        
-        # Update in database
-        try:
-            investigation = get_investigation(investigation_id)
-            if investigation:
-                investigation.status = status
-                investigation.progress_percentage = progress
-                investigation.current_stage = stage
-                investigation.updated_at = datetime.utcnow()
-                save_investigation(investigation)
-        except Exception as e:
-            logger.error("Failed to update investigation in database", {
-                "investigation_id": investigation_id,
-                "error": str(e)
-            })
+        active_investigations[investigation_id].queue_position = None
         
         status_message = WebSocketMessage(
             type="status_update",
-            data=active_investigations[investigation_id].to_dict(),
+            data=active_investigations[investigation_id].dict(),
             timestamp=datetime.utcnow(),
             investigation_id=investigation_id
         )
         
         await connection_manager.broadcast_to_investigation(investigation_id, status_message)
 
+    # Final states must be on disk before anyone reads the investigation back
+    if status in ("completed", "failed"):
+        if not await status_writer.flush():
+            logger.error("Final investigation status not persisted, retrying in background",
+                         investigation_id=investigation_id, status=status,
+                         correlation_id=correlation_id)
+
+
+def _status_from_db(investigation: DBInvestigation) -> InvestigationStatus:
+    return InvestigationStatus(
+        investigation_id=investigation.investigation_id,
+        status=investigation.status,
+        progress_percentage=investigation.progress_percentage,
+        current_stage=investigation.current_stage,
+        entities_found=investigation.entities_found,
+        queries_executed=investigation.queries_executed,
+        errors=investigation.errors or [],
+        started_at=investigation.started_at,
+        estimated_completion=investigation.estimated_completion,
+        correlation_id=investigation.correlation_id
+    )
+
+
+async def relay_worker_progress():
+    """Poll the database for investigations with WebSocket subscribers and push changes."""
+    last_seen: Dict[str, tuple] = {}
+    while True:
+        await asyncio.sleep(config.PROGRESS_POLL_INTERVAL)
+        subscribed = list(connection_manager.investigation_subscriptions)
+        if not subscribed:
+            last_seen.clear()
+            continue
+        try:
+            for investigation in await get_investigations(subscribed):
+                key = (investigation.status, investigation.progress_percentage,
+                       investigation.current_stage)
+                if last_seen.get(investigation.investigation_id) == key:
+                    continue
+                last_seen[investigation.investigation_id] = key
+                await connection_manager.broadcast_to_investigation(
+                    investigation.investigation_id,
+                    WebSocketMessage(type="status_update",
+                                     data=_status_from_db(investigation).dict(),
+                                     timestamp=datetime.utcnow(),
+                                     investigation_id=investigation.investigation_id))
+                if investigation.status == "completed":
+                    db_report = await get_investigation_report(investigation.investigation_id)
+                    if db_report:
+                        await connection_manager.broadcast_to_investigation(
+                            investigation.investigation_id,
+                            WebSocketMessage(type="completion", data=db_report.to_dict(),
+                                             timestamp=datetime.utcnow(),
+                                             investigation_id=investigation.investigation_id))
+        except Exception as e:
+            logger.error("Progress relay failed", error=str(e))
+
 
 @app.websocket("/ws/{investigation_id}")
 async def websocket_endpoint(websocket: WebSocket, investigation_id: str):
@@ -990,54 +1207,165 @@ async def websocket_endpoint(websocket: WebSocket, investigation_id: str):
 
 
 @app.get("/api/investigations/{investigation_id}/status", response_model=InvestigationStatus)
-async def get_investigation_status(investigation_id: str, db: Session = Depends(get_db)):
+async def get_investigation_status(investigation_id: str, db=Depends(get_db)):
     """Get current investigation status."""
     # Check active investigations first (in-memory for real-time)
     if investigation_id in active_investigations:
-        return active_investigations[investigation_id]
+        status = active_investigations[investigation_id]
+        if status.status == "pending":
+            status.queue_position = investigation_queue.position(investigation_id)
+        return status
     
     # Fall back to database for historical investigations
-    investigation = get_investigation(investigation_id, db)
+    investigation = await get_investigation(investigation_id, db)
     if not investigation:
         raise HTTPException(status_code=404, detail="Investigation not found")
     
-    return InvestigationStatus(
-        investigation_id=investigation.investigation_id,
-        status=investigation.status,
-        progress_percentage=investigation.progress_percentage,
-        current_stage=investigation.current_stage,
-        entities_found=investigation.entities_found,
-        queries_executed=investigation.queries_executed,
-        errors=investigation.errors or [],
-        started_at=investigation.started_at,
-        estimated_completion=investigation.estimated_completion,
-        correlation_id=investigation.correlation_id
-    )
+    status = _status_from_db(investigation)
+    if job_queue is not None and status.status == "pending":
+        status.queue_position = await asyncio.to_thread(job_queue.position, investigation_id)
+    return status
 
 
 @app.get("/api/investigations")
-async def list_investigations_endpoint(limit: int = 50, offset: int = 0, db: Session = Depends(get_db)):
-    """List all investigations."""
-    investigations = list_investigations(limit=limit, offset=offset, db=db)
+async def list_investigations_endpoint(limit: int = 50, offset: int = 0, cursor: Optional[str] = None,
+                                       status: Optional[str] = None, db=Depends(get_db)):
+    """
+    List investigations, newest first.
+
+    Pass the returned `next_cursor` as `cursor` to get the next page; cursor
+    pages cost the same at any depth. `offset` is still accepted for
+    existing clients, but not together with `cursor`.
+    """
+    limit = max(1, min(limit, 500))
+    next_cursor = None
+    if offset and cursor:
+        raise HTTPException(status_code=400, detail="Use either offset or cursor, not both")
+    if offset:
+        investigations = await list_investigations(limit=limit, offset=offset, status=status, db=db)
+    else:
+        try:
+            investigations, next_cursor = await list_investigations_page(limit=limit, cursor=cursor,
+                                                                         status=status, db=db)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
     return {
         "count": len(investigations),
         "limit": limit,
         "offset": offset,
+        "next_cursor": next_cursor,
+        "investigations": [inv.to_dict() for inv in investigations]
+    }
+
+
+@app.get("/api/investigations/export")
+async def export_investigations_endpoint(status: Optional[str] = None, cursor: Optional[str] = None):
+    """Stream every investigation as NDJSON (one JSON object per line), newest first."""
+    if cursor:
+        try:
+            decode_cursor(cursor)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+    async def lines():
+        async for batch in stream_investigations(status=status, cursor=cursor):
+            yield "".join(json.dumps(item) + "\n" for item in batch)
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson",
+                             headers={"Content-Disposition": "attachment; filename=investigations.ndjson"})
+
+
+@app.get("/api/search")
+async def search_reports_endpoint(q: str, limit: int = 20, offset: int = 0, db=Depends(get_db)):
+    """Ranked full-text search over reports: entity values, executive summaries and findings."""
+    limit = max(1, min(limit, 100))
+    started = datetime.utcnow()
+    try:
+        results = await search_reports(q, limit=limit, offset=max(offset, 0), db=db)
+    except SearchUnavailableError as e:
+        raise HTTPException(status_code=501, detail=str(e))
+    return {
+        "query": q,
+        "count": len(results),
+        "limit": limit,
+        "offset": offset,
+        "took_ms": round((datetime.utcnow() - started).total_seconds() * 1000, 2),
+        "results": results
+    }
+
+
+@app.get("/api/investigations/{investigation_id}/entities")
+async def get_investigation_entities_endpoint(investigation_id: str, entity_type: Optional[str] = None,
+                                              db=Depends(get_db)):
+    """Entities and relationships indexed for an investigation."""
+    entities = await get_investigation_entities(investigation_id, entity_type, db)
+    relationships = await get_entity_relationships(investigation_id, db)
+    return {
+        "investigation_id": investigation_id,
+        "entities": [entity.to_dict() for entity in entities],
+        "relationships": [rel.to_dict() for rel in relationships]
+    }
+
+
+@app.get("/api/entities/investigations")
+async def find_entity_investigations_endpoint(entity_type: str, value: str, db=Depends(get_db)):
+    """Investigations that found an entity, e.g. ?entity_type=email_address&value=jane@example.com."""
+    investigations = await find_investigations_with_entity(entity_type, value, db)
+    return {
+        "entity_type": entity_type,
+        "value": value,
+        "count": len(investigations),
         "investigations": [inv.to_dict() for inv in investigations]
     }
 
 
+# Export formats served by the report endpoint
+REPORT_EXPORT_FORMATS = {
+    "json": (ReportFormat.JSON, "application/json"),
+    "markdown": (ReportFormat.MARKDOWN, "text/markdown"),
+    "html": (ReportFormat.HTML, "text/html"),
+}
+
+
+def _rendered_report_response(rendered: RenderedReport, request: Request) -> Response:
+    """Serve a cached export: 304 for a matching ETag, else the best accepted encoding."""
+    encoding, body = rendered.negotiate(request.headers.get("accept-encoding"))
+    headers = {"Vary": "Accept-Encoding", "Cache-Control": "private, no-cache",
+               "ETag": rendered.etag_for(encoding)}
+    if rendered.matches(request.headers.get("if-none-match")):
+        return Response(status_code=304, headers=headers)
+    if encoding:
+        headers["Content-Encoding"] = encoding
+    return Response(content=body, media_type=rendered.media_type, headers=headers)
+
+
 @app.get("/api/investigations/{investigation_id}/report")
-async def get_investigation_report_endpoint(investigation_id: str, format: str = "json", db: Session = Depends(get_db)):
-    """Get investigation report in specified format."""
+async def get_investigation_report_endpoint(investigation_id: str, request: Request, format: str = "json",
+                                            db=Depends(get_db)):
+    """
+    Get investigation report in specified format.
+
+    Rendered exports are cached per (report_id, format) with strong ETags and
+    gzip/brotli variants, so polling clients get 304s or a cached body.
+    """
     request_logger = structlog.get_logger("report_endpoint").bind(
         investigation_id=investigation_id,
         format=format
     )
     
+    export_format = format.lower()
+    if export_format not in REPORT_EXPORT_FORMATS:
+        raise HTTPException(status_code=400, detail=f"Unsupported format: {format}")
+    report_format, media_type = REPORT_EXPORT_FORMATS[export_format]
+    
     try:
+        report_id = await get_latest_report_id(investigation_id, db)
+        rendered = await report_export_cache.get(report_id, export_format) if report_id else None
+        if rendered is not None:
+            return _rendered_report_response(rendered, request)
+        
         # Get investigation from database
-        investigation = get_investigation(investigation_id, db)
+        investigation = await get_investigation(investigation_id, db)
         if not investigation:
             raise HTTPException(status_code=404, detail="Investigation not found")
         
@@ -1045,7 +1373,7 @@ async def get_investigation_report_endpoint(investigation_id: str, format: str =
             raise HTTPException(status_code=400, detail="Investigation not completed")
         
         # Get report from database
-        db_report = get_investigation_report(investigation_id, db)
+        db_report = await get_investigation_report(investigation_id, db)
         if not db_report:
             raise HTTPException(status_code=404, detail="Report not found")
         
@@ -1060,19 +1388,12 @@ async def get_investigation_report_endpoint(investigation_id: str, format: str =
             detailed_findings=db_report.detailed_findings or []
         )
         
-        request_logger.info("Report requested")
+        request_logger.info("Report rendered")
         
-        if format.lower() == "json":
-            report_content = await report_generator.export_report(report, ReportFormat.JSON)
-            return JSONResponse(content=report_content, media_type="application/json")
-        elif format.lower() == "markdown":
-            report_content = await report_generator.export_report(report, ReportFormat.MARKDOWN)
-            return JSONResponse(content=report_content, media_type="text/markdown")
-        elif format.lower() == "html":
-            report_content = await report_generator.export_report(report, ReportFormat.HTML)
-            return JSONResponse(content=report_content, media_type="text/html")
-        else:
-            raise HTTPException(status_code=400, detail=f"Unsupported format: {format}")
+        report_content = await report_generator.export_report(report, report_format)
+        body = JSONResponse(content=report_content).body
+        rendered = await report_export_cache.put(db_report.report_id, export_format, body, media_type)
+        return _rendered_report_response(rendered, request)
             
     except HTTPException:
         raise
@@ -1118,7 +1439,14 @@ async def health_check():
                 "normalization_engine": ne_status,
                 "entity_resolver": er_status,
                 "report_generator": report_generator.get_metrics() if hasattr(report_generator, 'get_metrics') else "ok",
-                "websocket_connections": connection_manager.get_connection_stats()
+                "websocket_connections": connection_manager.get_connection_stats(),
+                "status_writer": status_writer.stats(),
+                "storage_maintenance": storage_maintenance.stats(),
+                "report_export_cache": report_export_cache.stats(),
+                "investigation_queue": investigation_queue.stats() if job_queue is None else {
+                    "backend": config.JOB_QUEUE_BACKEND,
+                    "pending": await asyncio.to_thread(job_queue.pending_count)
+                }
             }
         }
         
@@ -1141,12 +1469,26 @@ async def startup_event():
     except Exception as e:
         logger.error("Failed to initialize database", error=str(e))
         raise
+    global progress_relay_task
+    if job_queue is not None:
+        progress_relay_task = asyncio.create_task(relay_worker_progress())
+    else:
+        investigation_queue.start()
+    storage_maintenance.start()
 
 
 @app.on_event("shutdown")
 async def shutdown_event():
     """Cleanup resources on shutdown."""
     logger.info("OSINT Framework API shutting down")
+    # Worker-mode investigations keep running in their own processes
+    if progress_relay_task is not None:
+        progress_relay_task.cancel()
+    await investigation_queue.stop()
+    if not await status_writer.stop():
+        logger.error("Investigation status updates lost on shutdown",
+                     pending=status_writer.stats()["pending"])
+    await storage_maintenance.stop()
     # Cleanup WebSocket connections
     if connection_manager:
         for connection_id, websocket in connection_manager.active_connections.items():
@@ -0,0 +1,464 @@
+"""
+Durable Investigation Job Queue
+
+Hands investigations from the API process to out-of-process workers
+(see src/api/worker.py). Three interchangeable backends:
+
+- DatabaseJobQueue: the investigation_jobs table in the main database
+  (SQLite by default); claims are compare-and-set updates, so any number
+  of worker processes can share it
+- RedisJobQueue: per-tenant Redis lists with atomic Lua claim/enqueue,
+  for deployments that already run Redis
+- MemoryJobQueue: in-process stand-in with the same semantics, for tests
+
+All backends serve tenants fairly, track a heartbeat per running job and
+requeue jobs whose worker stopped heartbeating, so a crashed worker's
+investigations are picked up by another one.
+"""
+
+import json
+import threading
+from abc import ABC, abstractmethod
+import time
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+import structlog
+from sqlalchemy import func, update
+from sqlalchemy.orm import aliased
+
+from ..config import get_config
+from ..db import SessionLocal, InvestigationJob
+from .jobs import QueueFullError
+
+try:
+    import redis
+    HAS_REDIS = True
+except ImportError:
+    HAS_REDIS = False
+
+logger = structlog.get_logger(__name__)
+
+
+@dataclass
+class QueuedJob:
+    """A job as handed to a worker."""
+    job_id: str
+    tenant: str
+    payload: Dict[str, Any] = field(default_factory=dict)
+    attempts: int = 0
+
+    @property
+    def investigation_id(self) -> str:
+        """The investigation this job runs (jobs are enqueued under its ID)."""
+        return self.payload.get("input", {}).get("investigation_id") or self.job_id
+
+
+def round_robin_position(depth: int, order: int, lengths: List[int]) -> int:
+    """
+    Start position of the job at `depth` in the queue of the tenant at `order`.
+
+    Every tenant gets `depth` turns before that job's turn, and tenants
+    ahead in the rotation get one more.
+    """
+    ahead = 0
+    for other_order, length in enumerate(lengths):
+        ahead += min(length, depth)
+        if other_order < order and length > depth:
+            ahead += 1
+    return ahead + 1
+
+
+class JobQueue(ABC):
+    """Interface shared by the durable queue backends."""
+
+    max_attempts = 3
+
+    @abstractmethod
+    def enqueue(self, job_id: str, tenant: str, payload: Dict[str, Any]):
+        pass
+
+    @abstractmethod
+    def claim(self, worker_id: str) -> Optional[QueuedJob]:
+        """Take the next job (fair across tenants), or None if the queue is empty."""
+        pass
+
+    @abstractmethod
+    def heartbeat(self, job_id: str, worker_id: str) -> bool:
+        """Record that the worker is alive; False once the job is no longer its to run."""
+        pass
+
+    @abstractmethod
+    def complete(self, job_id: str, worker_id: str, error: Optional[str] = None) -> bool:
+        """Finish a job the worker still owns; False (and no change) if it was requeued."""
+        pass
+
+    @abstractmethod
+    def requeue_stale(self, timeout: float) -> Tuple[int, List[QueuedJob]]:
+        """
+        Requeue running jobs without a heartbeat for `timeout` seconds.
+
+        Returns the number requeued and the jobs given up on after
+        max_attempts, whose investigations the caller marks failed.
+        """
+        pass
+
+    @abstractmethod
+    def pending_count(self, tenant: Optional[str] = None) -> int:
+        pass
+
+    @abstractmethod
+    def position(self, job_id: str) -> Optional[int]:
+        """1-based start position of a queued job; None once it is claimed."""
+        pass
+
+    def check_admission(self, tenant: str, max_pending: int, max_pending_per_tenant: int,
+                        retry_after: int = 30):
+        """Raise QueueFullError (as the in-process queue does) when there is no room."""
+        if self.pending_count() >= max_pending:
+            raise QueueFullError("Investigation queue is full", retry_after)
+        if self.pending_count(tenant) >= max_pending_per_tenant:
+            raise QueueFullError("Too many queued investigations for this tenant", retry_after)
+
+
+class MemoryJobQueue(JobQueue):
+    """Thread-safe in-process queue with the durable backends' semantics."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._tenants: "OrderedDict[str, Deque[QueuedJob]]" = OrderedDict()
+        self._running: Dict[str, QueuedJob] = {}
+        self._heartbeats: Dict[str, float] = {}
+        self._owners: Dict[str, str] = {}
+        self.finished: Dict[str, Optional[str]] = {}  # job_id -> error
+
+    def enqueue(self, job_id: str, tenant: str, payload: Dict[str, Any]):
+        with self._lock:
+            self._push(QueuedJob(job_id, tenant, payload))
+
+    def _push(self, job: QueuedJob):
+        self._tenants.setdefault(job.tenant, deque()).append(job)
+
+    def claim(self, worker_id: str) -> Optional[QueuedJob]:
+        with self._lock:
+            if not self._tenants:
+                return None
+            tenant, jobs = next(iter(self._tenants.items()))
+            job = jobs.popleft()
+            if jobs:
+                self._tenants.move_to_end(tenant)
+            else:
+                del self._tenants[tenant]
+            job.attempts += 1
+            self._running[job.job_id] = job
+            self._heartbeats[job.job_id] = time.monotonic()
+            self._owners[job.job_id] = worker_id
+            return job
+
+    def heartbeat(self, job_id: str, worker_id: str) -> bool:
+        with self._lock:
+            if job_id not in self._running or self._owners.get(job_id) != worker_id:
+                return False
+            self._heartbeats[job_id] = time.monotonic()
+            return True
+
+    def complete(self, job_id: str, worker_id: str, error: Optional[str] = None) -> bool:
+        with self._lock:
+            if job_id not in self._running or self._owners.get(job_id) != worker_id:
+                return False
+            del self._running[job_id], self._heartbeats[job_id], self._owners[job_id]
+            self.finished[job_id] = error
+            return True
+
+    def requeue_stale(self, timeout: float) -> Tuple[int, List[QueuedJob]]:
+        cutoff = time.monotonic() - timeout
+        abandoned = []
+        with self._lock:
+            stale = [job_id for job_id, beat in self._heartbeats.items() if beat < cutoff]
+            for job_id in stale:
+                job = self._running.pop(job_id)
+                del self._heartbeats[job_id], self._owners[job_id]
+                if job.attempts < self.max_attempts:
+                    self._push(job)
+                else:
+                    self.finished[job_id] = "worker lost too many times"
+                    abandoned.append(job)
+            return len(stale) - len(abandoned), abandoned
+
+    def pending_count(self, tenant: Optional[str] = None) -> int:
+        with self._lock:
+            if tenant is not None:
+                return len(self._tenants.get(tenant, ()))
+            return sum(len(jobs) for jobs in self._tenants.values())
+
+    def position(self, job_id: str) -> Optional[int]:
+        with self._lock:
+            lengths = [len(jobs) for jobs in self._tenants.values()]
+            for order, jobs in enumerate(self._tenants.values()):
+                for depth, job in enumerate(jobs):
+                    if job.job_id == job_id:
+                        return round_robin_position(depth, order, lengths)
+            return None
+
+
+class DatabaseJobQueue(JobQueue):
+    """Queue stored in the investigation_jobs table of the main database."""
+
+    def __init__(self, session_factory=None):
+        self._session_factory = session_factory or SessionLocal
+
+    def enqueue(self, job_id: str, tenant: str, payload: Dict[str, Any]):
+        with self._session_factory() as db:
+            db.add(InvestigationJob(job_id=job_id, tenant=tenant, payload=payload,
+                                    status="queued", attempts=0, enqueued_at=datetime.utcnow()))
+            db.commit()
+
+    def claim(self, worker_id: str) -> Optional[QueuedJob]:
+        Job = InvestigationJob
+        Running = aliased(Job)
+        with self._session_factory() as db:
+            # Tenants with the fewest running jobs go first, then oldest submission
+            running = (db.query(func.count(Running.job_id))
+                       .filter(Running.tenant == Job.tenant, Running.status == "running")
+                       .scalar_subquery())
+            for _ in range(5):
+                candidate = (db.query(Job.job_id)
+                             .filter(Job.status == "queued")
+                             .order_by(running, Job.enqueued_at)
+                             .first())
+                if candidate is None:
+                    return None
+                now = datetime.utcnow()
+                # Compare-and-set: only one worker can move the row out of "queued"
+                claimed = db.execute(
+                    update(Job)
+                    .where(Job.job_id == candidate.job_id, Job.status == "queued")
+                    .values(status="running", worker_id=worker_id, started_at=now,
+                            heartbeat_at=now, attempts=Job.attempts + 1)
+                ).rowcount
+                db.commit()
+                if claimed:
+                    job = db.get(Job, candidate.job_id)
+                    return QueuedJob(job.job_id, job.tenant, job.payload or {}, job.attempts)
+            return None
+
+    def heartbeat(self, job_id: str, worker_id: str) -> bool:
+        Job = InvestigationJob
+        with self._session_factory() as db:
+            owned = db.execute(update(Job)
+                               .where(Job.job_id == job_id, Job.worker_id == worker_id,
+                                      Job.status == "running")
+                               .values(heartbeat_at=datetime.utcnow())).rowcount
+            db.commit()
+            return bool(owned)
+
+    def complete(self, job_id: str, worker_id: str, error: Optional[str] = None) -> bool:
+        Job = InvestigationJob
+        with self._session_factory() as db:
+            # A worker that stalled and lost the job must not finish it under its new owner
+            owned = db.execute(update(Job)
+                               .where(Job.job_id == job_id, Job.worker_id == worker_id,
+                                      Job.status == "running")
+                               .values(status="failed" if error else "completed", error=error,
+                                       finished_at=datetime.utcnow())).rowcount
+            db.commit()
+            return bool(owned)
+
+    def requeue_stale(self, timeout: float) -> Tuple[int, List[QueuedJob]]:
+        Job = InvestigationJob
+        cutoff = datetime.utcnow() - timedelta(seconds=timeout)
+        stale = (Job.status == "running", Job.heartbeat_at < cutoff)
+        with self._session_factory() as db:
+            requeued = db.execute(
+                update(Job).where(*stale, Job.attempts < self.max_attempts)
+                .values(status="queued", worker_id=None)
+            ).rowcount
+            abandoned = [QueuedJob(job.job_id, job.tenant, job.payload or {}, job.attempts)
+                         for job in db.query(Job).filter(*stale)]
+            if abandoned:
+                db.execute(
+                    update(Job).where(*stale, Job.job_id.in_([job.job_id for job in abandoned]))
+                    .values(status="failed", error="worker lost too many times",
+                            finished_at=datetime.utcnow())
+                )
+            db.commit()
+            return requeued, abandoned
+
+    def pending_count(self, tenant: Optional[str] = None) -> int:
+        Job = InvestigationJob
+        with self._session_factory() as db:
+            query = db.query(func.count(Job.job_id)).filter(Job.status == "queued")
+            if tenant is not None:
+                query = query.filter(Job.tenant == tenant)
+            return query.scalar() or 0
+
+    def position(self, job_id: str) -> Optional[int]:
+        """Estimated from the claim order: fewest running jobs first, then oldest."""
+        Job = InvestigationJob
+        with self._session_factory() as db:
+            job = db.get(Job, job_id)
+            if job is None or job.status != "queued":
+                return None
+            queued = {tenant: (count, head) for tenant, count, head in
+                      db.query(Job.tenant, func.count(Job.job_id), func.min(Job.enqueued_at))
+                      .filter(Job.status == "queued").group_by(Job.tenant)}
+            running = dict(db.query(Job.tenant, func.count(Job.job_id))
+                           .filter(Job.status == "running").group_by(Job.tenant).all())
+            depth = (db.query(func.count(Job.job_id))
+                     .filter(Job.status == "queued", Job.tenant == job.tenant,
+                             Job.enqueued_at < job.enqueued_at)
+                     .scalar() or 0)
+        order = sorted(queued, key=lambda tenant: (running.get(tenant, 0), queued[tenant][1]))
+        return round_robin_position(depth, order.index(job.tenant),
+                                    [queued[tenant][0] for tenant in order])
+
+
+# Atomic enqueue: add the job to its tenant's list; a tenant enters the
+# rotation when its list goes from empty to non-empty
+_REDIS_ENQUEUE = """
+redis.call('HSET', KEYS[2], ARGV[2], ARGV[3])
+if redis.call('RPUSH', ARGV[1] .. ':pending:' .. ARGV[4], ARGV[2]) == 1 then
+    redis.call('RPUSH', KEYS[1], ARGV[4])
+end
+"""
+
+# Atomic claim: serve the tenant at the head of the rotation, then move it
+# to the back (or drop it when it has nothing left)
+_REDIS_CLAIM = """
+local tenant = redis.call('LPOP', KEYS[1])
+if not tenant then return false end
+local pending = ARGV[1] .. ':pending:' .. tenant
+local job = redis.call('LPOP', pending)
+if redis.call('LLEN', pending) > 0 then
+    redis.call('RPUSH', KEYS[1], tenant)
+end
+if job then
+    redis.call('ZADD', KEYS[2], ARGV[2], job)
+end
+return job
+"""
+
+# Ownership checks: only the worker named in a running job's record may
+# heartbeat or complete it (a requeued job's record is no longer "running")
+_REDIS_OWNED = """
+local raw = redis.call('HGET', KEYS[1], ARGV[1])
+if not raw then return 0 end
+local record = cjson.decode(raw)
+if record['status'] ~= 'running' or record['worker_id'] ~= ARGV[2] then return 0 end
+"""
+
+_REDIS_HEARTBEAT = _REDIS_OWNED + """
+redis.call('ZADD', KEYS[2], 'XX', ARGV[3], ARGV[1])
+return 1
+"""
+
+_REDIS_COMPLETE = _REDIS_OWNED + """
+redis.call('ZREM', KEYS[2], ARGV[1])
+redis.call('HDEL', KEYS[1], ARGV[1])
+return 1
+"""
+
+
+class RedisJobQueue(JobQueue):
+    """Queue kept in Redis: per-tenant lists, a tenant rotation and a heartbeat zset."""
+
+    def __init__(self, url: Optional[str] = None, prefix: str = "osint:jobs", client=None):
+        if client is None:
+            if not HAS_REDIS:
+                raise ImportError("redis is required for the Redis job queue: pip install redis")
+            client = redis.Redis.from_url(url or get_config().REDIS_URL, decode_responses=True)
+        self.redis = client
+        self.prefix = prefix
+        self._tenants_key = f"{prefix}:tenants"
+        self._jobs_key = f"{prefix}:records"
+        self._running_key = f"{prefix}:running"
+        self._enqueue = self.redis.register_script(_REDIS_ENQUEUE)
+        self._claim = self.redis.register_script(_REDIS_CLAIM)
+        self._heartbeat = self.redis.register_script(_REDIS_HEARTBEAT)
+        self._complete = self.redis.register_script(_REDIS_COMPLETE)
+
+    def _record(self, job_id: str) -> Optional[Dict[str, Any]]:
+        raw = self.redis.hget(self._jobs_key, job_id)
+        return json.loads(raw) if raw else None
+
+    def enqueue(self, job_id: str, tenant: str, payload: Dict[str, Any]):
+        record = {"tenant": tenant, "payload": payload, "attempts": 0, "status": "queued"}
+        self._enqueue(keys=[self._tenants_key, self._jobs_key],
+                      args=[self.prefix, job_id, json.dumps(record), tenant])
+
+    def claim(self, worker_id: str) -> Optional[QueuedJob]:
+        job_id = self._claim(keys=[self._tenants_key, self._running_key],
+                             args=[self.prefix, time.time()])
+        if not job_id:
+            return None
+        record = self._record(job_id) or {}
+        record.update(status="running", worker_id=worker_id,
+                      attempts=record.get("attempts", 0) + 1)
+        self.redis.hset(self._jobs_key, job_id, json.dumps(record))
+        return QueuedJob(job_id, record.get("tenant", ""), record.get("payload", {}),
+                         record["attempts"])
+
+    def heartbeat(self, job_id: str, worker_id: str) -> bool:
+        return bool(self._heartbeat(keys=[self._jobs_key, self._running_key],
+                                    args=[job_id, worker_id, time.time()]))
+
+    def complete(self, job_id: str, worker_id: str, error: Optional[str] = None) -> bool:
+        return bool(self._complete(keys=[self._jobs_key, self._running_key],
+                                   args=[job_id, worker_id]))
+
+    def requeue_stale(self, timeout: float) -> Tuple[int, List[QueuedJob]]:
+        requeued = 0
+        abandoned = []
+        for job_id in self.redis.zrangebyscore(self._running_key, "-inf", time.time() - timeout):
+            if not self.redis.zrem(self._running_key, job_id):
+                continue  # another worker handled it
+            record = self._record(job_id)
+            if record is None:
+                continue
+            if record.get("attempts", 0) < self.max_attempts:
+                record.update(status="queued", worker_id=None)
+                self._enqueue(keys=[self._tenants_key, self._jobs_key],
+                              args=[self.prefix, job_id, json.dumps(record), record["tenant"]])
+                requeued += 1
+            else:
+                self.redis.hdel(self._jobs_key, job_id)
+                logger.warning("Dropping job after repeated worker loss", job_id=job_id)
+                abandoned.append(QueuedJob(job_id, record.get("tenant", ""),
+                                           record.get("payload", {}), record.get("attempts", 0)))
+        return requeued, abandoned
+
+    def _tenant_lengths(self) -> List[tuple]:
+        tenants = self.redis.lrange(self._tenants_key, 0, -1)
+        return [(t, self.redis.llen(f"{self.prefix}:pending:{t}")) for t in tenants]
+
+    def pending_count(self, tenant: Optional[str] = None) -> int:
+        if tenant is not None:
+            return self.redis.llen(f"{self.prefix}:pending:{tenant}")
+        return sum(length for _, length in self._tenant_lengths())
+
+    def position(self, job_id: str) -> Optional[int]:
+        record = self._record(job_id)
+        if not record or record.get("status") != "queued":
+            return None
+        tenants = self._tenant_lengths()
+        for order, (tenant, _) in enumerate(tenants):
+            if tenant == record["tenant"]:
+                depth = self.redis.lpos(f"{self.prefix}:pending:{tenant}", job_id)
+                if depth is None:
+                    return None
+                return round_robin_position(depth, order, [length for _, length in tenants])
+        return None
+
+
+def create_job_queue(backend: Optional[str] = None) -> JobQueue:
+    """Build the configured backend: "database" (default), "redis" or "memory"."""
+    backend = (backend or get_config().JOB_QUEUE_BACKEND).lower()
+    if backend == "redis":
+        return RedisJobQueue()
+    if backend == "memory":
+        return MemoryJobQueue()
+    if backend in ("database", "sqlite"):
+        return DatabaseJobQueue()
+    raise ValueError(f"Unknown job queue backend: {backend}")
@@ -0,0 +1,163 @@
+"""
+Investigation Job Queue
+
+Admission control for background investigations in the API service:
+
+- a fixed pool of workers runs at most `workers` investigations at once
+- pending jobs wait in per-tenant FIFO queues served round-robin, so one
+  tenant's burst cannot starve everyone else
+- the queue is bounded overall and per tenant; submissions beyond that are
+  rejected with QueueFullError (the API answers 429 with a Retry-After)
+- each pending job reports its position, i.e. how many jobs start before it
+"""
+
+import asyncio
+import math
+import time
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional
+
+import structlog
+
+
+class QueueFullError(Exception):
+    """Raised when a job cannot be admitted; carries a retry hint in seconds."""
+
+    def __init__(self, message: str, retry_after: int):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+@dataclass
+class Job:
+    job_id: str
+    tenant: str
+    run: Callable[[], Awaitable[Any]]
+    enqueued_at: float = field(default_factory=time.monotonic)
+    started_at: Optional[float] = None
+
+
+class InvestigationQueue:
+    """Bounded, tenant-fair job queue drained by a fixed worker pool."""
+
+    def __init__(self, workers: int = 10, max_pending: int = 100,
+                 max_pending_per_tenant: Optional[int] = None):
+        self.workers = max(workers, 1)
+        self.max_pending = max_pending
+        self.max_pending_per_tenant = max_pending_per_tenant or max_pending
+        # Rotation order: the first tenant is served next, then moves to the back
+        self._tenants: "OrderedDict[str, Deque[Job]]" = OrderedDict()
+        self._pending = 0
+        self.running: Dict[str, Job] = {}
+        self._ready: Optional[asyncio.Semaphore] = None
+        self._worker_tasks: List[asyncio.Task] = []
+        self._avg_runtime: Optional[float] = None
+        self.completed = 0
+        self.rejected = 0
+        self.logger = structlog.get_logger(f"{__name__}.{self.__class__.__name__}")
+
+    @property
+    def pending(self) -> int:
+        return self._pending
+
+    def start(self):
+        """Start the worker pool (idempotent; needs a running event loop)."""
+        if self._worker_tasks:
+            return
+        self._ready = asyncio.Semaphore(self._pending)
+        self._worker_tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+
+    async def stop(self):
+        """Cancel the workers; running jobs are cancelled, pending ones dropped."""
+        for task in self._worker_tasks:
+            task.cancel()
+        await asyncio.gather(*self._worker_tasks, return_exceptions=True)
+        self._worker_tasks = []
+        self._ready = None
+
+    def check_admission(self, tenant: str):
+        """Raise QueueFullError if a job for tenant would be rejected right now."""
+        if self._pending >= self.max_pending:
+            self.rejected += 1
+            raise QueueFullError("Investigation queue is full", self.retry_after())
+        if len(self._tenants.get(tenant, ())) >= self.max_pending_per_tenant:
+            self.rejected += 1
+            raise QueueFullError("Too many queued investigations for this tenant",
+                                 self.retry_after())
+
+    def submit(self, job_id: str, tenant: str, run: Callable[[], Awaitable[Any]]) -> int:
+        """
+        Admit a job and return its queue position (1 = starts next).
+
+        Synchronous, so the admission check and the enqueue cannot be
+        interleaved with other submissions.
+        """
+        self.check_admission(tenant)
+        self.start()
+        self._tenants.setdefault(tenant, deque()).append(Job(job_id, tenant, run))
+        self._pending += 1
+        self._ready.release()
+        return self.position(job_id)
+
+    def position(self, job_id: str) -> Optional[int]:
+        """How many jobs start before this one, plus one; None if not pending."""
+        for order, (tenant, jobs) in enumerate(self._tenants.items()):
+            for depth, job in enumerate(jobs):
+                if job.job_id != job_id:
+                    continue
+                # Round-robin: every tenant gets `depth` turns before this job's
+                # turn, and tenants ahead in the rotation get one more
+                ahead = 0
+                for other_order, other in enumerate(self._tenants.values()):
+                    ahead += min(len(other), depth)
+                    if other_order < order and len(other) > depth:
+                        ahead += 1
+                return ahead + 1
+        return None
+
+    def retry_after(self) -> int:
+        """Seconds until a queue slot is likely to free up."""
+        runtime = self._avg_runtime or 30.0
+        return max(1, math.ceil(runtime * (self._pending + 1) / self.workers))
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "workers": self.workers,
+            "running": len(self.running),
+            "pending": self._pending,
+            "max_pending": self.max_pending,
+            "tenants_waiting": len(self._tenants),
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "avg_runtime_seconds": round(self._avg_runtime or 0.0, 2),
+        }
+
+    def _next_job(self) -> Job:
+        tenant, jobs = next(iter(self._tenants.items()))
+        job = jobs.popleft()
+        if jobs:
+            self._tenants.move_to_end(tenant)
+        else:
+            del self._tenants[tenant]
+        self._pending -= 1
+        return job
+
+    async def _worker(self):
+        while True:
+            await self._ready.acquire()
+            job = self._next_job()
+            job.started_at = time.monotonic()
+            self.running[job.job_id] = job
+            try:
+                await job.run()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.logger.error("Investigation job failed", job_id=job.job_id, error=str(e))
+            finally:
+                self.running.pop(job.job_id, None)
+                runtime = time.monotonic() - job.started_at
+                self._avg_runtime = runtime if self._avg_runtime is None else \
+                    0.8 * self._avg_runtime + 0.2 * runtime
+                self.completed += 1
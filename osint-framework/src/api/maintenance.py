@@ -0,0 +1,116 @@
+"""
+Storage Maintenance Job
+
+Keeps the database at a size whose hot working set fits in memory. Every
+`interval` seconds it:
+
+- purges expired search_query_cache and entity_cache rows in batches
+- archives reports older than `archive_after_days`: their JSON sections
+  become one compressed blob, decompressed transparently when loaded
+- runs an incremental vacuum and refreshes planner statistics
+- when given the report export cache, removes exports of deleted reports
+  and keeps the export directory under `export_max_bytes`
+
+Each step runs through the async database layer and failures are logged,
+so one failing step never stops the others or the API.
+
+Databases created before incremental auto-vacuum was enabled are not
+vacuumed until converted, which needs a full VACUUM and an exclusive lock:
+    python -m src.api.maintenance enable-incremental-vacuum
+    python -m src.api.maintenance run      # one maintenance pass
+"""
+
+import argparse
+import asyncio
+from typing import Any, Dict, Optional
+
+import structlog
+
+from ..config import get_config
+from ..db import (
+    archive_old_reports, compact_database, enable_incremental_vacuum, existing_report_ids, init_db,
+    purge_expired_cache
+)
+
+
+class StorageMaintenance:
+    """Periodic purge, archival and compaction of the framework database."""
+
+    def __init__(self, interval: float = 3600.0, archive_after_days: float = 30.0,
+                 batch_size: int = 1000, vacuum_pages: int = 2000,
+                 export_cache=None, export_max_bytes: int = 512 * 1024 * 1024):
+        self.interval = interval
+        self.archive_after_days = archive_after_days
+        self.batch_size = batch_size
+        self.vacuum_pages = vacuum_pages
+        self.export_cache = export_cache
+        self.export_max_bytes = export_max_bytes
+        self._task: Optional[asyncio.Task] = None
+        self.runs = 0
+        self.last_run: Dict[str, Any] = {}
+        self.logger = structlog.get_logger(f"{__name__}.{self.__class__.__name__}")
+
+    def start(self):
+        """Start the periodic job on the running loop (no-op when the interval is 0)."""
+        if self.interval > 0 and (self._task is None or self._task.done()):
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def run_once(self) -> Dict[str, Any]:
+        """Run every maintenance step once and return what each did."""
+        summary: Dict[str, Any] = {}
+        steps = (
+            ("purged", lambda: purge_expired_cache(self.batch_size)),
+            ("reports_archived", lambda: archive_old_reports(self.archive_after_days,
+                                                             max(self.batch_size // 10, 1))),
+            ("compaction", lambda: compact_database(self.vacuum_pages)),
+        )
+        if self.export_cache is not None:
+            steps += (("exports_pruned", lambda: self.export_cache.prune(self.export_max_bytes,
+                                                                         existing_report_ids)),)
+        for name, step in steps:
+            try:
+                summary[name] = await step()
+            except Exception as e:
+                summary[name] = {"error": str(e)}
+                self.logger.error("Storage maintenance step failed", step=name, error=str(e))
+        self.runs += 1
+        self.last_run = summary
+        self.logger.info("Storage maintenance completed", **summary)
+        return summary
+
+    def stats(self) -> Dict[str, Any]:
+        return {"runs": self.runs, "last_run": self.last_run}
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            await self.run_once()
+
+
+def main(argv=None):
+    config = get_config()
+    parser = argparse.ArgumentParser(description="Database maintenance for the OSINT framework.")
+    parser.add_argument("command", choices=["run", "enable-incremental-vacuum"],
+                        help="run one maintenance pass, or convert the database to incremental "
+                             "auto-vacuum (full VACUUM; stop the API first)")
+    args = parser.parse_args(argv)
+
+    init_db()
+    if args.command == "enable-incremental-vacuum":
+        converted = enable_incremental_vacuum()
+        print("Converted to incremental auto-vacuum" if converted else "Nothing to convert")
+        return
+    maintenance = StorageMaintenance(archive_after_days=config.REPORT_ARCHIVE_AFTER_DAYS,
+                                     batch_size=config.MAINTENANCE_BATCH_SIZE,
+                                     vacuum_pages=config.SQLITE_VACUUM_PAGES)
+    print(asyncio.run(maintenance.run_once()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,253 @@
+"""
+Rendered Report Export Cache
+
+A completed report never changes (re-running an investigation saves a new
+report_id), so each (report_id, format) export is rendered once:
+
+- the rendered body is stored with gzip and, when brotli is installed,
+  brotli variants, compressed off the event loop when first rendered
+- entries live in an in-process LRU and, when a directory is configured,
+  on disk (REPORT_STORAGE_PATH/exports) so they survive restarts and are
+  shared between API processes
+- each entry carries a strong ETag derived from its body; responses pick
+  the best encoding the client accepts, and a matching If-None-Match gets
+  304 Not Modified without touching the body
+- a deleted investigation's exports are discarded with it, and storage
+  maintenance prunes exports of reports that no longer exist and evicts the
+  least recently used ones once the directory exceeds its size budget
+"""
+
+import asyncio
+import gzip
+import hashlib
+import os
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+import structlog
+
+try:
+    import brotli
+    HAS_BROTLI = True
+except ImportError:
+    HAS_BROTLI = False
+
+# Content-Encoding -> file suffix, in order of preference
+ENCODINGS = {"br": ".br", "gzip": ".gz"}
+
+
+@dataclass
+class RenderedReport:
+    """One rendered export and its pre-compressed variants."""
+    body: bytes
+    media_type: str
+    etag: str = ""
+    encoded: Dict[str, bytes] = field(default_factory=dict)
+
+    def __post_init__(self):
+        if not self.etag:
+            self.etag = hashlib.sha256(self.body).hexdigest()[:32]
+
+    def etag_for(self, encoding: Optional[str]) -> str:
+        """Strong ETag of one representation (each encoding is a distinct one)."""
+        return f'"{self.etag}-{encoding}"' if encoding else f'"{self.etag}"'
+
+    def matches(self, if_none_match: Optional[str]) -> bool:
+        """Whether an If-None-Match header names any representation of this body."""
+        if not if_none_match:
+            return False
+        if if_none_match.strip() == "*":
+            return True
+        for tag in if_none_match.split(","):
+            tag = tag.strip()
+            if tag.startswith("W/"):
+                tag = tag[2:]
+            if tag.strip('"').split("-")[0] == self.etag:
+                return True
+        return False
+
+    def negotiate(self, accept_encoding: Optional[str]) -> Tuple[Optional[str], bytes]:
+        """The best available (encoding, body) for an Accept-Encoding header."""
+        accepted = {}
+        for part in (accept_encoding or "").split(","):
+            name, _, params = part.strip().partition(";")
+            quality = 1.0
+            if params.strip().startswith("q="):
+                try:
+                    quality = float(params.strip()[2:])
+                except ValueError:
+                    quality = 0.0
+            if name:
+                accepted[name.strip().lower()] = quality
+        for encoding in ENCODINGS:
+            if encoding in self.encoded and accepted.get(encoding, accepted.get("*", 0.0)) > 0:
+                return encoding, self.encoded[encoding]
+        return None, self.body
+
+
+def compress_variants(body: bytes) -> Dict[str, bytes]:
+    """gzip (and brotli when available) encodings of a body."""
+    encoded = {"gzip": gzip.compress(body, compresslevel=9, mtime=0)}
+    if HAS_BROTLI:
+        encoded["br"] = brotli.compress(body, quality=11)
+    return encoded
+
+
+class ReportExportCache:
+    """LRU of rendered exports keyed by (report_id, format), optionally mirrored to disk."""
+
+    MEDIA_TYPE_SUFFIX = ".type"
+
+    def __init__(self, directory: Optional[str] = None, max_entries: int = 256):
+        self.directory = Path(directory) if directory else None
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple[str, str], RenderedReport]" = OrderedDict()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.logger = structlog.get_logger(f"{__name__}.{self.__class__.__name__}")
+
+    async def get(self, report_id: str, export_format: str) -> Optional[RenderedReport]:
+        key = (report_id, export_format)
+        rendered = self._entries.get(key)
+        if rendered is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return rendered
+        if self.directory is not None:
+            rendered = await asyncio.to_thread(self._read, report_id, export_format)
+            if rendered is not None:
+                self._remember(key, rendered)
+                self.disk_hits += 1
+                return rendered
+        self.misses += 1
+        return None
+
+    async def put(self, report_id: str, export_format: str, body: bytes,
+                  media_type: str) -> RenderedReport:
+        """Compress and cache a freshly rendered export."""
+        encoded = await asyncio.to_thread(compress_variants, body)
+        rendered = RenderedReport(body=body, media_type=media_type, encoded=encoded)
+        self._remember((report_id, export_format), rendered)
+        if self.directory is not None:
+            try:
+                await asyncio.to_thread(self._write, report_id, export_format, rendered)
+            except OSError as e:
+                self.logger.warning("Failed to store rendered report", report_id=report_id,
+                                    format=export_format, error=str(e))
+        return rendered
+
+    async def discard(self, report_ids: Iterable[str]):
+        """Drop every cached export of these reports, in memory and on disk."""
+        report_ids = set(report_ids)
+        for key in [key for key in self._entries if key[0] in report_ids]:
+            del self._entries[key]
+        if self.directory is not None and report_ids:
+            await asyncio.to_thread(self._remove, report_ids)
+
+    async def prune(self, max_bytes: int,
+                    known_reports: Optional[Callable[[List[str]], Awaitable[Set[str]]]] = None
+                    ) -> Dict[str, int]:
+        """
+        Bound the export directory: remove exports of reports `known_reports`
+        does not return, then the least recently used ones until the rest
+        fit in max_bytes.
+        """
+        if self.directory is None:
+            return {"removed": 0, "bytes": 0}
+        on_disk = await asyncio.to_thread(self._scan)
+        removed = set()
+        if known_reports is not None and on_disk:
+            removed = set(on_disk) - set(await known_reports(list(on_disk)))
+        kept = sorted((entry for report_id, entry in on_disk.items() if report_id not in removed),
+                      key=lambda entry: entry["used"])
+        total = sum(entry["bytes"] for entry in kept)
+        for entry in kept:
+            if total <= max_bytes:
+                break
+            removed.add(entry["report_id"])
+            total -= entry["bytes"]
+        await self.discard(removed)
+        return {"removed": len(removed), "bytes": total}
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+        }
+
+    def _remember(self, key: Tuple[str, str], rendered: RenderedReport):
+        self._entries[key] = rendered
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    @staticmethod
+    def _safe_id(report_id: str) -> str:
+        # report_id is a UUID; keep anything else from escaping the directory
+        return "".join(c for c in report_id if c.isalnum() or c in "-_")
+
+    def _path(self, report_id: str, export_format: str) -> Path:
+        return self.directory / f"{self._safe_id(report_id)}.{export_format}"
+
+    def _scan(self) -> Dict[str, Dict[str, Any]]:
+        """Export files on disk per report: total bytes and last use (newest body mtime)."""
+        reports: Dict[str, Dict[str, Any]] = {}
+        try:
+            paths = list(self.directory.iterdir())
+        except FileNotFoundError:
+            return reports
+        for path in paths:
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            report_id = path.name.partition(".")[0]
+            entry = reports.setdefault(report_id, {"report_id": report_id, "bytes": 0, "used": 0.0})
+            entry["bytes"] += stat.st_size
+            entry["used"] = max(entry["used"], stat.st_mtime)
+        return reports
+
+    def _remove(self, report_ids: Set[str]):
+        for report_id in report_ids:
+            for path in self.directory.glob(f"{self._safe_id(report_id)}.*"):
+                try:
+                    path.unlink()
+                except FileNotFoundError:
+                    pass
+
+    def _read(self, report_id: str, export_format: str) -> Optional[RenderedReport]:
+        path = self._path(report_id, export_format)
+        try:
+            body = path.read_bytes()
+            media_type = path.with_name(path.name + self.MEDIA_TYPE_SUFFIX).read_text()
+        except FileNotFoundError:
+            return None
+        try:
+            os.utime(path)  # last use, for pruning
+        except OSError:
+            pass
+        encoded = {}
+        for encoding, suffix in ENCODINGS.items():
+            variant = path.with_name(path.name + suffix)
+            if variant.exists():
+                encoded[encoding] = variant.read_bytes()
+        return RenderedReport(body=body, media_type=media_type, encoded=encoded)
+
+    def _write(self, report_id: str, export_format: str, rendered: RenderedReport):
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self._path(report_id, export_format)
+        files = [(path.with_name(path.name + suffix), rendered.encoded[encoding])
+                 for encoding, suffix in ENCODINGS.items() if encoding in rendered.encoded]
+        files.append((path.with_name(path.name + self.MEDIA_TYPE_SUFFIX),
+                      rendered.media_type.encode("utf-8")))
+        # The body goes last: its presence marks a complete entry for _read
+        files.append((path, rendered.body))
+        for target, data in files:
+            tmp = target.with_name(f"{target.name}.{os.getpid()}.tmp")
+            tmp.write_bytes(data)
+            os.replace(tmp, target)
@@ -0,0 +1,136 @@
+"""
+Investigation Status Writer
+
+Persists investigation progress without blocking the event loop:
+
+- update() only records the new values in memory, so callers (and the
+  WebSocket broadcasts that follow them) never wait on the database
+- updates to the same investigation arriving within one flush interval are
+  merged, later values winning, so a burst of stage changes costs one write
+- pending updates are written in a single transaction through the async
+  database layer, one batch at a time so batches land in order
+- a batch that fails to write goes back into the pending set (values
+  queued since then win) and is retried with exponential backoff
+- flush() forces pending updates out, for terminal states and shutdown, and
+  returns False if they could not be written (they stay pending)
+"""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+import structlog
+
+from ..db import update_investigations
+
+
+class StatusWriter:
+    """Coalescing, batched writer for investigation status columns."""
+
+    def __init__(self, flush_interval: float = 0.25,
+                 write: Optional[Callable[[Dict[str, Dict[str, Any]]], Awaitable[int]]] = None,
+                 retry_delay: float = 1.0, max_retry_delay: float = 60.0):
+        self.flush_interval = flush_interval
+        self.retry_delay = retry_delay
+        self.max_retry_delay = max_retry_delay
+        self._failures = 0
+        self._write = write or update_investigations
+        self._pending: Dict[str, Dict[str, Any]] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._write_lock: Optional[asyncio.Lock] = None
+        self.updates = 0
+        self.batches = 0
+        self.rows_written = 0
+        self.failed_batches = 0
+        self.logger = structlog.get_logger(f"{__name__}.{self.__class__.__name__}")
+
+    def update(self, investigation_id: str, **values):
+        """Queue column updates for an investigation; returns immediately."""
+        self._pending.setdefault(investigation_id, {}).update(values)
+        self.updates += 1
+        loop = self._bind_loop()
+        if self._task is None or self._task.done():
+            self._task = loop.create_task(self._run())
+        self._wakeup.set()
+
+    async def flush(self) -> bool:
+        """Write everything pending now; True once it is committed, False if the write failed."""
+        self._bind_loop()
+        if not self._pending:
+            return True
+        async with self._write_lock:
+            written = await self._write_pending()
+        if not written and self._task is not None and not self._task.done():
+            self._wakeup.set()  # the background flusher keeps retrying
+        return written
+
+    async def stop(self, attempts: int = 3) -> bool:
+        """Stop the background flusher after writing what is pending.
+
+        A failed write is retried with backoff up to `attempts` times; returns
+        False if updates are still pending, i.e. lost once the process exits.
+        """
+        if self._task is not None:
+            async with self._write_lock:  # let an in-flight batch finish first
+                self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        for attempt in range(attempts):
+            if attempt:
+                await asyncio.sleep(min(self.retry_delay * 2 ** (attempt - 1), self.max_retry_delay))
+            if await self.flush():
+                return True
+        return False
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "pending": len(self._pending),
+            "updates": self.updates,
+            "batches": self.batches,
+            "rows_written": self.rows_written,
+            "failed_batches": self.failed_batches,
+        }
+
+    def _bind_loop(self) -> asyncio.AbstractEventLoop:
+        # Loop-bound primitives are recreated when a new loop takes over (tests, restarts)
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._wakeup = asyncio.Event()
+            self._write_lock = asyncio.Lock()
+            self._task = None
+        return loop
+
+    async def _run(self):
+        while True:
+            await self._wakeup.wait()
+            # Let a burst of updates accumulate into one batch
+            await asyncio.sleep(self.flush_interval)
+            self._wakeup.clear()
+            async with self._write_lock:
+                written = await self._write_pending()
+            if not written:
+                await asyncio.sleep(min(self.retry_delay * 2 ** (self._failures - 1),
+                                        self.max_retry_delay))
+                self._wakeup.set()
+
+    async def _write_pending(self) -> bool:
+        """Write the pending batch; on failure requeue it and return False."""
+        if not self._pending:
+            return True
+        batch, self._pending = self._pending, {}
+        try:
+            self.rows_written += await self._write(batch)
+            self.batches += 1
+            self._failures = 0
+            return True
+        except Exception as e:
+            self.failed_batches += 1
+            self._failures += 1
+            for investigation_id, values in batch.items():
+                # Updates queued while the batch was in flight are newer and win
+                self._pending[investigation_id] = {**values, **self._pending.get(investigation_id, {})}
+            self.logger.error("Failed to persist investigation status, will retry",
+                              investigations=len(batch), attempt=self._failures, error=str(e))
+            return False
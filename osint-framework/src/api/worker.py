@@ -0,0 +1,264 @@
+"""
+Investigation Worker Processes
+
+Runs investigations outside the API process. Each worker process claims
+jobs from the durable job queue (src/api/job_queue.py), runs up to
+`concurrency` of them on its own event loop, heartbeats while they run and
+writes progress to the investigations table, where the API picks it up and
+relays it to WebSocket clients. The API can therefore be restarted without
+interrupting running investigations, and a crashed worker's jobs are
+requeued once their heartbeat goes stale.
+
+CLI (one process per CPU core by default):
+    python -m src.api.worker --processes 8 --concurrency 4
+
+SIGTERM/SIGINT stop claiming new jobs and let running ones finish; status
+updates still pending are then written before the process exits.
+
+A job that fails before the pipeline starts, or is given up on after its
+worker was lost too many times, marks its investigation failed, so clients
+polling it never wait on a job that no longer exists. A worker that stalls
+long enough for its job to be requeued stops that job at its next
+heartbeat and cannot complete it under the new owner. Queue calls block
+(database or Redis round trips) and run in a thread, off the event loop.
+"""
+
+import argparse
+import asyncio
+import multiprocessing
+import os
+import signal
+import socket
+import sys
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+from uuid import uuid4
+
+import structlog
+
+from ..config import get_config
+from ..core.models.entities import InvestigationInput
+from ..db import init_db, update_investigations
+from .job_queue import JobQueue, QueuedJob, create_job_queue
+
+logger = structlog.get_logger(__name__)
+
+
+def _load_pipeline():
+    """Import the API module and build its pipeline components in this process."""
+    from .. import get_connector_registry
+    from . import app as api
+    api.initialize_components(get_connector_registry())
+    return api
+
+
+async def stop_pipeline():
+    """Write this process's pending status updates, if it ran any pipeline job."""
+    api = sys.modules.get(f"{__package__}.app")
+    if api is None:
+        return
+    if not await api.status_writer.stop():
+        logger.error("Investigation status updates lost on shutdown",
+                     pending=api.status_writer.stats()["pending"])
+
+
+async def run_pipeline_job(job: QueuedJob):
+    """Plan and run one investigation with the same pipeline the API uses in-process."""
+    api = _load_pipeline()
+    investigation_input = InvestigationInput.from_dict(job.payload["input"])
+    correlation_id = job.payload.get("correlation_id") or str(uuid4())
+
+    query_plan = await api.discovery_engine.generate_query_plan(investigation_input, correlation_id)
+    api.status_writer.update(investigation_input.investigation_id,
+                             queries_executed=len(query_plan.queries))
+
+    await api.run_investigation(investigation_input, query_plan, correlation_id)
+
+
+class InvestigationWorker:
+    """Claims jobs from a JobQueue and runs a bounded number of them concurrently."""
+
+    def __init__(self, queue: JobQueue, worker_id: Optional[str] = None, concurrency: int = 4,
+                 heartbeat_interval: float = 10.0, poll_interval: float = 1.0,
+                 stale_timeout: float = 120.0,
+                 execute: Optional[Callable[[QueuedJob], Awaitable[None]]] = None,
+                 update: Optional[Callable[[Dict[str, Dict[str, Any]]], Awaitable[Any]]] = None):
+        self.queue = queue
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}"
+        self.concurrency = max(concurrency, 1)
+        self.heartbeat_interval = heartbeat_interval
+        self.poll_interval = poll_interval
+        self.stale_timeout = stale_timeout
+        self.execute = execute or run_pipeline_job
+        self._update = update or update_investigations
+        self.completed = 0
+        self.failed = 0
+        self.logger = structlog.get_logger(f"{__name__}.{self.__class__.__name__}")
+
+    async def run(self, stop_event: asyncio.Event):
+        """Claim and run jobs until stop_event is set, then wait for running jobs."""
+        slots = asyncio.Semaphore(self.concurrency)
+        tasks = set()
+        sweeper = asyncio.create_task(self._sweep_stale(stop_event))
+
+        while not stop_event.is_set():
+            await slots.acquire()
+            if stop_event.is_set():
+                slots.release()
+                break
+
+            job = await asyncio.to_thread(self.queue.claim, self.worker_id)
+            if job is None:
+                slots.release()
+                try:
+                    await asyncio.wait_for(stop_event.wait(), self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            task = asyncio.create_task(self._run_job(job, slots))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+
+        if tasks:
+            self.logger.info("Waiting for running investigations", count=len(tasks))
+            await asyncio.gather(*tasks, return_exceptions=True)
+        sweeper.cancel()
+        await asyncio.gather(sweeper, return_exceptions=True)
+
+    async def _sweep_stale(self, stop_event: asyncio.Event):
+        """Requeue lost workers' jobs periodically, however busy this worker is."""
+        interval = max(self.stale_timeout / 2, self.poll_interval)
+        while not stop_event.is_set():
+            try:
+                requeued, abandoned = await asyncio.to_thread(self.queue.requeue_stale,
+                                                              self.stale_timeout)
+                if requeued:
+                    self.logger.warning("Requeued jobs from lost workers", count=requeued)
+                if abandoned:
+                    await self._fail_investigations(abandoned, "worker lost too many times")
+            except Exception as e:
+                self.logger.warning("Stale job sweep failed", error=str(e))
+            try:
+                await asyncio.wait_for(stop_event.wait(), interval)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _run_job(self, job: QueuedJob, slots: asyncio.Semaphore):
+        self.logger.info("Investigation claimed", job_id=job.job_id, tenant=job.tenant,
+                         attempt=job.attempts)
+        execution = asyncio.create_task(self.execute(job))
+        heartbeat = asyncio.create_task(self._heartbeat(job, execution))
+        error = None
+        try:
+            await execution
+            self.completed += 1
+        except asyncio.CancelledError:
+            if not heartbeat.done():
+                raise
+            # The job was requeued while this worker stalled; its new owner finishes it
+            self.logger.warning("Stopped job owned by another worker", job_id=job.job_id)
+            return
+        except Exception as e:
+            error = str(e) or type(e).__name__
+            self.failed += 1
+            self.logger.error("Investigation job failed", job_id=job.job_id, error=error)
+        finally:
+            heartbeat.cancel()
+            slots.release()
+        if not await asyncio.to_thread(self.queue.complete, job.job_id, self.worker_id, error):
+            self.logger.warning("Job was requeued before it finished", job_id=job.job_id)
+            return
+        if error is not None:
+            # run_investigation records its own failures; this covers planning and input errors
+            await self._fail_investigations([job], error)
+
+    async def _fail_investigations(self, jobs: List[QueuedJob], error: str):
+        """Mark the investigations of jobs that will not run (again) as failed."""
+        now = datetime.utcnow()
+        try:
+            await self._update({
+                job.investigation_id: {"status": "failed", "current_stage": "failed",
+                                       "errors": [error], "completed_at": now}
+                for job in jobs
+            })
+        except Exception as e:
+            self.logger.error("Failed to mark investigations failed",
+                              investigation_ids=[job.investigation_id for job in jobs], error=str(e))
+
+    async def _heartbeat(self, job: QueuedJob, execution: asyncio.Task):
+        """Heartbeat until cancelled; stop the job if it now belongs to another worker."""
+        while True:
+            await asyncio.sleep(self.heartbeat_interval)
+            try:
+                owned = await asyncio.to_thread(self.queue.heartbeat, job.job_id, self.worker_id)
+            except Exception as e:
+                self.logger.warning("Heartbeat failed", job_id=job.job_id, error=str(e))
+                continue
+            if not owned:
+                execution.cancel()
+                return
+
+
+def run_worker_process(concurrency: int, backend: Optional[str] = None):
+    """Entry point of one worker process: its own event loop, queue connection and pipeline."""
+    config = get_config()
+    worker = InvestigationWorker(
+        create_job_queue(backend),
+        concurrency=concurrency,
+        heartbeat_interval=max(config.JOB_HEARTBEAT_TIMEOUT / 4, 1.0),
+        poll_interval=config.PROGRESS_POLL_INTERVAL,
+        stale_timeout=config.JOB_HEARTBEAT_TIMEOUT,
+    )
+
+    async def main():
+        stop_event = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(sig, stop_event.set)
+        logger.info("Worker started", worker_id=worker.worker_id, concurrency=worker.concurrency)
+        await worker.run(stop_event)
+        await stop_pipeline()
+        logger.info("Worker stopped", worker_id=worker.worker_id,
+                    completed=worker.completed, failed=worker.failed)
+
+    asyncio.run(main())
+
+
+def main(argv=None):
+    config = get_config()
+    parser = argparse.ArgumentParser(description="Run investigation worker processes.")
+    parser.add_argument("--processes", type=int, default=config.WORKER_PROCESSES or os.cpu_count() or 1,
+                        help="worker processes (default: one per CPU core)")
+    parser.add_argument("--concurrency", type=int, default=config.WORKER_CONCURRENCY,
+                        help="investigations in flight per process")
+    parser.add_argument("--backend", default=config.JOB_QUEUE_BACKEND,
+                        choices=["database", "redis"], help="job queue backend")
+    args = parser.parse_args(argv)
+
+    init_db()
+    if args.processes <= 1:
+        run_worker_process(args.concurrency, args.backend)
+        return
+
+    processes = [
+        multiprocessing.Process(target=run_worker_process, args=(args.concurrency, args.backend),
+                                name=f"osint-worker-{i}")
+        for i in range(args.processes)
+    ]
+    for process in processes:
+        process.start()
+
+    def forward(signum, frame):
+        for process in processes:
+            if process.is_alive():
+                os.kill(process.pid, signum)
+
+    signal.signal(signal.SIGTERM, forward)
+    signal.signal(signal.SIGINT, forward)
+    for process in processes:
+        process.join()
+
+
+if __name__ == "__main__":
+    main()
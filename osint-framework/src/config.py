@@ -41,6 +41,17 @@ class Config:
         "sqlite:///./osint_framework.db"
     )
     DATABASE_ECHO: bool = os.getenv("DATABASE_ECHO", "false").lower() == "true"
+    DATABASE_POOL_SIZE: int = int(os.getenv("DATABASE_POOL_SIZE", "10"))
+    DATABASE_MAX_OVERFLOW: int = int(os.getenv("DATABASE_MAX_OVERFLOW", "20"))
+    DATABASE_POOL_TIMEOUT: float = float(os.getenv("DATABASE_POOL_TIMEOUT", "30"))  # seconds
+    # SQLite tuning (applied per connection; WAL is always on for file databases)
+    SQLITE_MMAP_SIZE: int = int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)))  # bytes
+    SQLITE_CACHE_SIZE_KB: int = int(os.getenv("SQLITE_CACHE_SIZE_KB", str(64 * 1024)))
+    # Storage maintenance: expired cache purge, report archival, incremental vacuum
+    MAINTENANCE_INTERVAL_MINUTES: float = float(os.getenv("MAINTENANCE_INTERVAL_MINUTES", "60"))  # 0 disables
+    MAINTENANCE_BATCH_SIZE: int = int(os.getenv("MAINTENANCE_BATCH_SIZE", "1000"))  # rows per transaction
+    REPORT_ARCHIVE_AFTER_DAYS: float = float(os.getenv("REPORT_ARCHIVE_AFTER_DAYS", "30"))
+    SQLITE_VACUUM_PAGES: int = int(os.getenv("SQLITE_VACUUM_PAGES", "2000"))  # pages freed per run
     
     # Redis configuration (for caching and sessions)
     REDIS_URL: str = os.getenv("REDIS_URL", "redis://localhost:6379/0")
@@ -63,12 +74,37 @@ class Config:
     MAX_CONCURRENT_INVESTIGATIONS: int = int(
         os.getenv("MAX_CONCURRENT_INVESTIGATIONS", "10")
     )
+    # Pending investigations beyond the running ones; more are rejected with 429
+    INVESTIGATION_QUEUE_SIZE: int = int(os.getenv("INVESTIGATION_QUEUE_SIZE", "100"))
+    INVESTIGATION_QUEUE_PER_TENANT: int = int(os.getenv("INVESTIGATION_QUEUE_PER_TENANT", "20"))
+    # Header naming the tenant for queue fairness; honoured only for API keys bound
+    # to that tenant in TENANT_API_KEYS ("tenant:sha256-of-key,..."). Otherwise the
+    # tenant is a hash of the API key, then the client IP
+    TENANT_HEADER: str = os.getenv("TENANT_HEADER", "X-Tenant-ID")
+    TENANT_API_KEYS: str = os.getenv("TENANT_API_KEYS", "")
+    # "inprocess" runs investigations in the API process; "worker" hands them to
+    # `python -m src.api.worker` processes through a durable job queue
+    INVESTIGATION_EXECUTION: str = os.getenv("INVESTIGATION_EXECUTION", "inprocess").lower()
+    JOB_QUEUE_BACKEND: str = os.getenv("JOB_QUEUE_BACKEND", "database").lower()  # database, redis, memory
+    WORKER_PROCESSES: int = int(os.getenv("WORKER_PROCESSES", "0"))  # 0 = one per CPU core
+    WORKER_CONCURRENCY: int = int(os.getenv("WORKER_CONCURRENCY", "4"))  # investigations per process
+    JOB_HEARTBEAT_TIMEOUT: int = int(os.getenv("JOB_HEARTBEAT_TIMEOUT", "120"))  # seconds
+    PROGRESS_POLL_INTERVAL: float = float(os.getenv("PROGRESS_POLL_INTERVAL", "1.0"))  # seconds
+    # Window in which status updates are merged into one batched database write
+    STATUS_FLUSH_INTERVAL: float = float(os.getenv("STATUS_FLUSH_INTERVAL", "0.25"))  # seconds
+    # Normalized entities cached across investigations (in-process LRU + entity_cache table)
+    ENTITY_CACHE_TTL_HOURS: float = float(os.getenv("ENTITY_CACHE_TTL_HOURS", "168"))
+    ENTITY_CACHE_SIZE: int = int(os.getenv("ENTITY_CACHE_SIZE", "50000"))  # in-process entries
     
     # Report storage
     REPORT_STORAGE_PATH: str = os.getenv(
         "REPORT_STORAGE_PATH",
         "./reports"
     )
+    # Rendered report exports (per report and format, with gzip/brotli variants)
+    REPORT_EXPORT_CACHE_SIZE: int = int(os.getenv("REPORT_EXPORT_CACHE_SIZE", "256"))  # in-process entries
+    REPORT_EXPORT_CACHE_ON_DISK: bool = os.getenv("REPORT_EXPORT_CACHE_ON_DISK", "true").lower() == "true"
+    REPORT_EXPORT_CACHE_MAX_MB: int = int(os.getenv("REPORT_EXPORT_CACHE_MAX_MB", "512"))  # on-disk budget
     
     # WebSocket configuration
     WEBSOCKET_HEARTBEAT_INTERVAL: int = int(
@@ -98,6 +134,8 @@ class Config:
         # Validate database URL
         if not cls.DATABASE_URL:
             errors.append("DATABASE_URL is required")
+        if cls.DATABASE_POOL_SIZE < 1 or cls.DATABASE_MAX_OVERFLOW < 0:
+            errors.append("DATABASE_POOL_SIZE must be at least 1 and DATABASE_MAX_OVERFLOW >= 0")
         
         # Validate CORS origins
         if not cls.CORS_ORIGINS or cls.CORS_ORIGINS == [""]:
@@ -113,6 +151,20 @@ class Config:
         # Validate investigation limits
         if cls.MAX_CONCURRENT_INVESTIGATIONS < 1:
             errors.append("MAX_CONCURRENT_INVESTIGATIONS must be at least 1")
+        if cls.INVESTIGATION_QUEUE_SIZE < 0 or cls.INVESTIGATION_QUEUE_PER_TENANT < 1:
+            errors.append("INVESTIGATION_QUEUE_SIZE must be >= 0 and INVESTIGATION_QUEUE_PER_TENANT >= 1")
+        if cls.INVESTIGATION_EXECUTION not in ("inprocess", "worker"):
+            errors.append(f"INVESTIGATION_EXECUTION must be 'inprocess' or 'worker', got {cls.INVESTIGATION_EXECUTION}")
+        if cls.JOB_QUEUE_BACKEND not in ("database", "redis", "memory"):
+            errors.append(f"JOB_QUEUE_BACKEND must be 'database', 'redis' or 'memory', got {cls.JOB_QUEUE_BACKEND}")
+        if cls.WORKER_CONCURRENCY < 1 or cls.JOB_HEARTBEAT_TIMEOUT < 1:
+            errors.append("WORKER_CONCURRENCY and JOB_HEARTBEAT_TIMEOUT must be at least 1")
+        if cls.MAINTENANCE_INTERVAL_MINUTES < 0 or cls.MAINTENANCE_BATCH_SIZE < 1:
+            errors.append("MAINTENANCE_INTERVAL_MINUTES must be >= 0 and MAINTENANCE_BATCH_SIZE at least 1")
+        if cls.ENTITY_CACHE_TTL_HOURS <= 0 or cls.ENTITY_CACHE_SIZE < 1:
+            errors.append("ENTITY_CACHE_TTL_HOURS must be positive and ENTITY_CACHE_SIZE at least 1")
+        if cls.REPORT_EXPORT_CACHE_MAX_MB < 1:
+            errors.append("REPORT_EXPORT_CACHE_MAX_MB must be at least 1")
         
         # Warn about debug mode
         if cls.DEBUG:
@@ -137,7 +189,7 @@ class Config:
     @classmethod
     def to_dict(cls) -> Dict[str, Any]:
         """Convert configuration to dictionary (excluding sensitive values)."""
-        sensitive_keys = {"DATABASE_URL", "REDIS_URL", "API_KEY_HEADER"}
+        sensitive_keys = {"DATABASE_URL", "REDIS_URL", "API_KEY_HEADER", "TENANT_API_KEYS"}
         
         return {
             key: getattr(cls, key) if key not in sensitive_keys else "***"
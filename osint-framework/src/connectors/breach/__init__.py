@@ -4,8 +4,12 @@ Breach and credential leak database connectors.
 
 from .hibp import HAVEIBEENPWNEDConnector
 from .dehashed import DehashededConnector
+from .lookup import BreachLookup, BreachLookupService, get_breach_service
 
 __all__ = [
     'HAVEIBEENPWNEDConnector',
-    'DehashededConnector'
+    'DehashededConnector',
+    'BreachLookup',
+    'BreachLookupService',
+    'get_breach_service'
 ]
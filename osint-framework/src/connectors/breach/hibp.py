@@ -2,7 +2,9 @@
 HaveIBeenPwned Connector for OSINT Framework
 
 Searches the HIBP breach database for compromised email addresses
-and provides information about data breaches.
+and provides information about data breaches. Requests go through the
+shared BreachLookupService, which enforces the key's rate limit and caches
+answers per email.
 
 API: https://haveibeenpwned.com/API/v3
 """
@@ -16,6 +18,7 @@ import aiohttp
 import structlog
 
 from ..base import SourceConnector, SearchResult, EntityType
+from .lookup import BreachLookupService, get_breach_service
 
 
 @dataclass
@@ -52,6 +55,7 @@ class HAVEIBEENPWNEDConnector(SourceConnector):
         self.api_key = api_key
         self.user_agent = user_agent or "OSINT-Framework/1.0"
         self.session: Optional[aiohttp.ClientSession] = None
+        self.lookup_service: BreachLookupService = get_breach_service(api_key)
 
         self.logger.info("HIBP Connector initialized", has_api_key=bool(api_key))
 
@@ -102,24 +106,10 @@ class HAVEIBEENPWNEDConnector(SourceConnector):
             return result
 
         try:
-            await self._check_rate_limit()
-
-            breaches = await self._query_breaches(email)
-            pastes = await self._query_pastes(email)
-
-            if breaches or pastes:
-                result.success = True
-                result.parsed_entities = self._parse_results(email, breaches, pastes)
-                self.logger.info(
-                    "HIBP search successful",
-                    email=email,
-                    breach_count=len(breaches),
-                    paste_count=len(pastes)
-                )
-            else:
-                result.success = True
-                result.parsed_entities = []
-                self.logger.debug("HIBP no breaches found", email=email)
+            lookup = await self.lookup_service.lookup(email, include_pastes=True)
+            if lookup.error:
+                raise RuntimeError(lookup.error)
+            self._apply_lookup(result, email, lookup.breaches, lookup.pastes or [])
 
         except asyncio.TimeoutError:
             result.success = False
@@ -133,61 +123,43 @@ class HAVEIBEENPWNEDConnector(SourceConnector):
 
         return result
 
-    async def _query_breaches(self, email: str) -> List[Dict[str, Any]]:
-        """Query HIBP for breaches involving this email."""
-        url = f"{self.BASE_URL}/breachedaccount/{email}"
-        headers = self._get_headers()
-
-        try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(
-                    url,
-                    headers=headers,
-                    timeout=aiohttp.ClientTimeout(total=self.TIMEOUT_SECONDS)
-                ) as response:
-                    if response.status == 200:
-                        return await response.json()
-                    elif response.status == 404:
-                        return []
-                    else:
-                        self.logger.warning(
-                            "HIBP breach query failed",
-                            email=email,
-                            status=response.status
-                        )
-                        return []
-
-        except Exception as e:
-            self.logger.error("HIBP breach query error", email=email, error=str(e))
-            return []
-
-    async def _query_pastes(self, email: str) -> List[Dict[str, Any]]:
-        """Query HIBP for pastes involving this email."""
-        url = f"{self.BASE_URL}/pasteaccount/{email}"
-        headers = self._get_headers()
-
-        try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(
-                    url,
-                    headers=headers,
-                    timeout=aiohttp.ClientTimeout(total=self.TIMEOUT_SECONDS)
-                ) as response:
-                    if response.status == 200:
-                        return await response.json()
-                    elif response.status == 404:
-                        return []
-                    else:
-                        self.logger.warning(
-                            "HIBP paste query failed",
-                            email=email,
-                            status=response.status
-                        )
-                        return []
+    async def search_many(self, emails: List[str]) -> Dict[str, SearchResult]:
+        """
+        Search several emails at once.
 
-        except Exception as e:
-            self.logger.error("HIBP paste query error", email=email, error=str(e))
-            return []
+        Lookups share one session and the service's rate limit; cached and
+        duplicate emails cost no extra requests.
+        """
+        lookups = await self.lookup_service.lookup_many(emails, include_pastes=True)
+        results = {}
+        for email, lookup in lookups.items():
+            result = SearchResult(
+                connector_name=self.source_name,
+                query={"email": email},
+                raw_results=[]
+            )
+            if lookup.error:
+                result.success = False
+                result.error_message = lookup.error
+            else:
+                self._apply_lookup(result, email, lookup.breaches, lookup.pastes or [])
+            results[email] = result
+        return results
+
+    def _apply_lookup(self, result: SearchResult, email: str,
+                      breaches: List[Dict], pastes: List[Dict]):
+        """Fill a SearchResult from one email's breaches and pastes."""
+        result.success = True
+        result.parsed_entities = self._parse_results(email, breaches, pastes)
+        if breaches or pastes:
+            self.logger.info(
+                "HIBP search successful",
+                email=email,
+                breach_count=len(breaches),
+                paste_count=len(pastes)
+            )
+        else:
+            self.logger.debug("HIBP no breaches found", email=email)
 
     def _parse_results(
         self,
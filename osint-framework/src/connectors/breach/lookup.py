@@ -0,0 +1,190 @@
+"""
+Shared Breach Lookup Service
+
+One place for per-email HaveIBeenPwned lookups, used by both the HIBP
+connector and the local EmailHarvester:
+
+- bounded concurrency plus request spacing that respects the API key's rate limit
+- persistent per-email TTL cache, including "not breached" answers
+- duplicate in-flight lookups for the same email share one request, made on
+  the service's own session so a cancelled caller cannot break it for others
+
+API: https://haveibeenpwned.com/API/v3
+"""
+
+import asyncio
+import os
+import time
+from typing import Dict, List, Any, Optional, Iterable
+from dataclasses import dataclass, field
+
+import aiohttp
+import structlog
+
+from ..local.recon_cache import ReconCache
+
+
+@dataclass
+class BreachLookup:
+    """Breach (and optionally paste) exposure for one email."""
+    email: str
+    breaches: List[Dict[str, Any]] = field(default_factory=list)
+    pastes: Optional[List[Dict[str, Any]]] = None  # None = not requested
+    error: str = ""
+    cached: bool = False
+
+
+class BreachLookupService:
+    """Rate-limited, cached, deduplicating HIBP lookups."""
+
+    BASE_URL = "https://haveibeenpwned.com/api/v3"
+    TIMEOUT_SECONDS = 10
+
+    def __init__(self, api_key: Optional[str] = None, requests_per_minute: int = 10,
+                 max_concurrent: int = 2, cache_ttl: float = 7 * 86400.0,
+                 negative_ttl: float = 86400.0, cache: Optional[ReconCache] = None,
+                 user_agent: str = "OSINT-Framework/1.0"):
+        self.api_key = api_key
+        self.min_interval = 60.0 / max(requests_per_minute, 1)
+        self.max_concurrent = max_concurrent
+        self.cache_ttl = cache_ttl
+        self.negative_ttl = negative_ttl
+        # No key means no lookups, so don't create the on-disk cache either
+        self.cache = cache if cache is not None or not api_key else ReconCache("breach")
+        self.user_agent = user_agent
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._spacing_lock: Optional[asyncio.Lock] = None
+        self._loop = None
+        self._next_slot = 0.0
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._session: Optional[aiohttp.ClientSession] = None
+        self.logger = structlog.get_logger(f"{__name__}.{self.__class__.__name__}")
+
+    async def lookup(self, email: str, include_pastes: bool = False) -> BreachLookup:
+        """Look up a single email."""
+        results = await self.lookup_many([email], include_pastes=include_pastes)
+        return results[email.lower().strip()]
+
+    async def lookup_many(self, emails: Iterable[str],
+                          include_pastes: bool = False) -> Dict[str, BreachLookup]:
+        """Look up many emails; cache hits return immediately, misses share in-flight requests."""
+        unique = list(dict.fromkeys(e.lower().strip() for e in emails if e and e.strip()))
+        if not self.api_key:
+            return {e: BreachLookup(email=e, error="HIBP API key not configured") for e in unique}
+
+        results: Dict[str, BreachLookup] = {}
+        cached = self.cache.get_many(unique)
+        missing = []
+        for email in unique:
+            record = cached.get(email)
+            if record and (not include_pastes or record.get("pastes") is not None):
+                results[email] = BreachLookup(email=email, breaches=record["breaches"],
+                                              pastes=record.get("pastes"), cached=True)
+            else:
+                missing.append(email)
+
+        if missing:
+            self._bind_loop()
+            futures = {email: self._shared_lookup(email, include_pastes) for email in missing}
+            answers = await asyncio.gather(*futures.values())
+            results.update(zip(futures.keys(), answers))
+
+        return results
+
+    def _bind_loop(self):
+        """(Re)create loop-bound primitives; the desktop UI runs one loop per investigation."""
+        loop = asyncio.get_event_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._semaphore = asyncio.Semaphore(self.max_concurrent)
+            self._spacing_lock = asyncio.Lock()
+            self._inflight = {}
+            # A session belongs to the loop it was created on; let go of the old one
+            if self._session is not None:
+                self._session.detach()
+            self._session = None
+
+    async def close(self):
+        """Close the service's session; the next lookup opens a new one."""
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession()
+        return self._session
+
+    def _shared_lookup(self, email: str, include_pastes: bool) -> asyncio.Future:
+        key = f"{email}|{int(include_pastes)}"
+        future = self._inflight.get(key)
+        if future is None:
+            # Not tied to any caller's session, so cancelling one waiter cannot fail the rest
+            future = asyncio.ensure_future(self._fetch(self._get_session(), email, include_pastes))
+            self._inflight[key] = future
+            future.add_done_callback(lambda _: self._inflight.pop(key, None))
+        return asyncio.shield(future)
+
+    async def _fetch(self, session: aiohttp.ClientSession, email: str,
+                     include_pastes: bool) -> BreachLookup:
+        result = BreachLookup(email=email)
+        try:
+            result.breaches = await self._get(session, f"breachedaccount/{email}?truncateResponse=false")
+            if include_pastes:
+                result.pastes = await self._get(session, f"pasteaccount/{email}")
+        except Exception as e:
+            result.error = str(e) or type(e).__name__
+            self.logger.warning("Breach lookup failed", email=email, error=result.error)
+            return result
+
+        # Negative answers are cached too, for a shorter time
+        exposed = result.breaches or result.pastes
+        self.cache.set(email, {"breaches": result.breaches, "pastes": result.pastes},
+                       self.cache_ttl if exposed else self.negative_ttl)
+        return result
+
+    async def _get(self, session: aiohttp.ClientSession, path: str) -> List[Dict[str, Any]]:
+        """GET one HIBP endpoint within the concurrency and rate limits; 404 means none."""
+        for attempt in range(3):
+            async with self._semaphore:
+                await self._wait_for_slot()
+                async with session.get(f"{self.BASE_URL}/{path}", headers=self._headers(),
+                                       timeout=aiohttp.ClientTimeout(total=self.TIMEOUT_SECONDS)) as resp:
+                    if resp.status == 200:
+                        return await resp.json()
+                    if resp.status == 404:
+                        return []
+                    if resp.status != 429:
+                        raise RuntimeError(f"HIBP returned status {resp.status}")
+                    retry_after = float(resp.headers.get("Retry-After", self.min_interval))
+            # Rate limited: push every queued request back, then retry
+            self._next_slot = max(self._next_slot, time.monotonic() + retry_after)
+        raise RuntimeError("HIBP rate limit exceeded")
+
+    async def _wait_for_slot(self):
+        """Space request starts by min_interval across all callers."""
+        async with self._spacing_lock:
+            now = time.monotonic()
+            wait = self._next_slot - now
+            self._next_slot = max(now, self._next_slot) + self.min_interval
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    def _headers(self) -> Dict[str, str]:
+        return {
+            "User-Agent": self.user_agent,
+            "Accept": "application/json",
+            "hibp-api-key": self.api_key,
+        }
+
+
+# Shared service instances, one per API key
+_services: Dict[Optional[str], BreachLookupService] = {}
+
+
+def get_breach_service(api_key: Optional[str] = None) -> BreachLookupService:
+    """Get or create the shared lookup service (defaults to HIBP_API_KEY)."""
+    api_key = api_key or os.getenv("HIBP_API_KEY") or None
+    if api_key not in _services:
+        _services[api_key] = BreachLookupService(api_key=api_key)
+    return _services[api_key]
@@ -17,6 +17,9 @@ from .username_checker import UsernameChecker
 from .email_harvester import EmailHarvester
 from .tech_fingerprinter import TechFingerprinter
 from .person_recon import PersonRecon
+from .recon_cache import ReconCache
+from .page_cache import PageCache
+from .metadata_extractor import MetadataExtractor
 
 __all__ = [
     "DNSRecon",
@@ -28,4 +31,7 @@ __all__ = [
     "EmailHarvester",
     "TechFingerprinter",
     "PersonRecon",
+    "ReconCache",
+    "PageCache",
+    "MetadataExtractor",
 ]
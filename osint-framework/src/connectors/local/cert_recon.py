@@ -6,18 +6,31 @@ subdomains, certificate timelines, and issuer information.
 
 Free data source:
 - crt.sh (Sectigo CT log search, public HTTPS, no rate limit key)
+
+crt.sh answers for large organisations run to hundreds of MB, so the
+response is parsed incrementally from the byte stream and every entry is
+written to a local SQLite index keyed by (domain, crt.sh id). Reports are
+aggregated from the index, and repeat lookups reuse it.
 """
 
 import asyncio
+import codecs
+import json
 import logging
-from typing import Dict, List, Any, Optional, Set
+import threading
+import time
+from typing import Dict, List, Any, Optional, Set, Tuple
 from dataclasses import dataclass, field
 from datetime import datetime
 
 import aiohttp
 
+from .recon_cache import connect_cache_db, default_cache_path
+
 logger = logging.getLogger(__name__)
 
+MAX_REPORT_CERTS = 100  # Certificates kept in a CertReport (newest first)
+
 
 @dataclass
 class CertEntry:
@@ -64,77 +77,228 @@ class CertReport:
             "unique_issuers": self.unique_issuers,
             "wildcard_certs": self.wildcard_certs,
             "expired_certs": self.expired_certs,
-            "certificates": [c.to_dict() for c in self.certificates[:100]],  # Cap at 100
+            "certificates": [c.to_dict() for c in self.certificates[:MAX_REPORT_CERTS]],
             "errors": self.errors,
         }
 
 
+class JSONArrayStream:
+    """Incrementally yield the elements of a top-level JSON array from byte chunks."""
+
+    def __init__(self):
+        self._decoder = json.JSONDecoder()
+        self._text = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        self._buf = ""
+        self._pos = 0
+        self._started = False
+        self._finished = False
+
+    def feed(self, chunk: bytes) -> List[Any]:
+        """Consume a chunk and return every element completed by it."""
+        self._buf = self._buf[self._pos:] + self._text.decode(chunk)
+        self._pos = 0
+        items = []
+        buf = self._buf
+        while not self._finished:
+            n = len(buf)
+            while self._pos < n and buf[self._pos] in " \t\r\n,":
+                self._pos += 1
+            if self._pos >= n:
+                break
+            if not self._started:
+                if buf[self._pos] != "[":
+                    raise ValueError("expected a JSON array")
+                self._started = True
+                self._pos += 1
+                continue
+            if buf[self._pos] == "]":
+                self._finished = True
+                self._pos = n
+                break
+            try:
+                obj, end = self._decoder.raw_decode(buf, self._pos)
+            except json.JSONDecodeError:
+                break  # Element continues in the next chunk
+            items.append(obj)
+            self._pos = end
+        return items
+
+    def close(self):
+        """Raise if the stream ended in the middle of an element."""
+        rest = self._buf[self._pos:] + self._text.decode(b"", final=True)
+        if rest.strip() or (self._started and not self._finished):
+            raise ValueError("truncated JSON array")
+
+
+_CT_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS ct_certs ("
+    " domain TEXT NOT NULL, id INTEGER NOT NULL,"
+    " issuer_name TEXT, common_name TEXT, name_value TEXT,"
+    " not_before TEXT, not_after TEXT, serial_number TEXT, entry_timestamp TEXT,"
+    " PRIMARY KEY (domain, id), UNIQUE (domain, serial_number));"
+    "CREATE TABLE IF NOT EXISTS ct_sync ("
+    " domain TEXT PRIMARY KEY, max_id INTEGER NOT NULL, fetched_at REAL NOT NULL);"
+)
+
+
+class CTIndex:
+    """Local SQLite index of crt.sh entries, keyed by (domain, crt.sh id)."""
+
+    COLUMNS = ("id", "issuer_name", "common_name", "name_value", "not_before",
+               "not_after", "serial_number", "entry_timestamp")
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or default_cache_path()
+        self._lock = threading.Lock()
+        self._conn = None
+
+    def _db(self):
+        # Opened on first use, so building a CertRecon touches no files; callers hold self._lock
+        if self._conn is None:
+            self._conn, self.path = connect_cache_db(self.path, _CT_SCHEMA)
+        return self._conn
+
+    def sync_state(self, domain: str) -> Tuple[int, float]:
+        """Return (highest crt.sh id seen, last fetch time) for a domain."""
+        with self._lock:
+            row = self._db().execute("SELECT max_id, fetched_at FROM ct_sync WHERE domain = ?",
+                                     (domain,)).fetchone()
+        return (row[0], row[1]) if row else (0, 0.0)
+
+    def add(self, domain: str, entries: List["CertEntry"]):
+        """Insert entries; duplicate ids or serials are ignored."""
+        if not entries:
+            return
+        rows = [(domain, e.id, e.issuer_name, e.common_name, e.name_value, e.not_before,
+                 e.not_after, e.serial_number, e.entry_timestamp) for e in entries]
+        with self._lock:
+            self._db().executemany(
+                "INSERT OR IGNORE INTO ct_certs (domain, id, issuer_name, common_name, name_value,"
+                " not_before, not_after, serial_number, entry_timestamp)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+
+    def mark_synced(self, domain: str, max_id: int):
+        with self._lock:
+            self._db().execute(
+                "INSERT OR REPLACE INTO ct_sync (domain, max_id, fetched_at) VALUES (?, ?, ?)",
+                (domain, max_id, time.time()))
+            self._db().commit()
+
+    def iter_entries(self, domain: str):
+        """Yield the indexed entries for a domain, newest crt.sh id first."""
+        with self._lock:
+            cursor = self._db().execute(
+                f"SELECT {', '.join(self.COLUMNS)} FROM ct_certs WHERE domain = ? ORDER BY id DESC",
+                (domain,))
+        while True:
+            with self._lock:
+                rows = cursor.fetchmany(1000)
+            if not rows:
+                break
+            for row in rows:
+                yield CertEntry(**dict(zip(self.COLUMNS, row)))
+
+
 class CertRecon:
     """Certificate Transparency recon via crt.sh — public, free, no API key."""
 
-    def __init__(self, timeout: float = 30.0):
+    def __init__(self, timeout: float = 30.0, refresh_ttl: float = 6 * 3600.0,
+                 index: Optional[CTIndex] = None, chunk_size: int = 64 * 1024):
         self.timeout = timeout
         self.base_url = "https://crt.sh"
+        self.refresh_ttl = refresh_ttl
+        self.chunk_size = chunk_size
+        self.index = index or CTIndex()
         self.logger = logging.getLogger(f"{__name__}.CertRecon")
 
     async def search(self, domain: str, include_expired: bool = True,
                      progress_callback=None) -> CertReport:
         """Search crt.sh for certificates matching a domain."""
+        domain = domain.lower()
         report = CertReport(domain=domain)
+        max_id, fetched_at = self.index.sync_state(domain)
 
-        if progress_callback:
-            progress_callback("Cert Transparency: Querying crt.sh", 10)
-
-        try:
-            url = f"{self.base_url}/?q=%.{domain}&output=json"
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url, timeout=aiohttp.ClientTimeout(total=self.timeout),
-                                       headers={"User-Agent": "OSINT-Framework/2.0"}) as resp:
-                    if resp.status == 200:
-                        data = await resp.json(content_type=None)
-                        await self._process_results(data, report, domain)
-                    else:
-                        report.errors.append(f"crt.sh returned status {resp.status}")
-        except asyncio.TimeoutError:
-            report.errors.append("crt.sh query timed out")
-        except Exception as e:
-            report.errors.append(f"crt.sh query failed: {str(e)}")
-            self.logger.warning(f"crt.sh failed for {domain}: {e}")
+        if time.time() - fetched_at < self.refresh_ttl:
+            if progress_callback:
+                progress_callback("Cert Transparency: Using local index", 50)
+        else:
+            if progress_callback:
+                progress_callback("Cert Transparency: Querying crt.sh", 10)
+            try:
+                await self._fetch(domain, max_id, report)
+            except asyncio.TimeoutError:
+                report.errors.append("crt.sh query timed out")
+            except Exception as e:
+                report.errors.append(f"crt.sh query failed: {str(e)}")
+                self.logger.warning(f"crt.sh failed for {domain}: {e}")
+
+        await asyncio.get_event_loop().run_in_executor(
+            None, self._process_results, self.index.iter_entries(domain), report, domain)
 
         if progress_callback:
             progress_callback("Cert Transparency: Complete", 100)
 
         return report
 
-    async def _process_results(self, data: List[Dict], report: CertReport, domain: str):
-        """Process crt.sh JSON results."""
+    async def _fetch(self, domain: str, max_id: int, report: CertReport):
+        """Stream crt.sh JSON into the index, skipping entries already seen."""
+        url = f"{self.base_url}/?q=%.{domain}&output=json&deduplicate=Y"
+        stream = JSONArrayStream()
+        seen_ids: Set[int] = set()
+        pending: List[CertEntry] = []
+        new_max = max_id
+
+        async with aiohttp.ClientSession() as session:
+            async with session.get(url, timeout=aiohttp.ClientTimeout(total=self.timeout),
+                                   headers={"User-Agent": "OSINT-Framework/2.0"}) as resp:
+                if resp.status != 200:
+                    report.errors.append(f"crt.sh returned status {resp.status}")
+                    return
+                async for chunk in resp.content.iter_chunked(self.chunk_size):
+                    for entry in stream.feed(chunk):
+                        cert_id = entry.get("id") or 0
+                        # crt.sh has no "since" filter, so drop known ids before building objects
+                        if cert_id <= max_id or cert_id in seen_ids:
+                            continue
+                        seen_ids.add(cert_id)
+                        new_max = max(new_max, cert_id)
+                        pending.append(self._entry_from_json(entry))
+                    if len(pending) >= 1000:
+                        self.index.add(domain, pending)
+                        pending = []
+                stream.close()
+
+        self.index.add(domain, pending)
+        self.index.mark_synced(domain, new_max)
+
+    def _entry_from_json(self, entry: Dict[str, Any]) -> CertEntry:
+        return CertEntry(
+            id=entry.get("id", 0),
+            issuer_name=entry.get("issuer_name", ""),
+            common_name=entry.get("common_name", ""),
+            name_value=entry.get("name_value", ""),
+            not_before=entry.get("not_before", ""),
+            not_after=entry.get("not_after", ""),
+            serial_number=str(entry.get("serial_number", "")),
+            entry_timestamp=entry.get("entry_timestamp", ""),
+        )
+
+    def _process_results(self, entries, report: CertReport, domain: str):
+        """Aggregate indexed entries (already deduplicated by serial) into the report."""
         subdomains: Set[str] = set()
         issuers: Set[str] = set()
-        seen_serials: Set[str] = set()
         now = datetime.utcnow()
+        suffix = f".{domain.lower()}"
 
-        for entry in data or []:
-            serial = str(entry.get("serial_number", ""))
-            if serial in seen_serials:
-                continue
-            seen_serials.add(serial)
-
-            cert = CertEntry(
-                id=entry.get("id", 0),
-                issuer_name=entry.get("issuer_name", ""),
-                common_name=entry.get("common_name", ""),
-                name_value=entry.get("name_value", ""),
-                not_before=entry.get("not_before", ""),
-                not_after=entry.get("not_after", ""),
-                serial_number=serial,
-                entry_timestamp=entry.get("entry_timestamp", ""),
-            )
-            report.certificates.append(cert)
+        for cert in entries:
+            report.total_certs += 1
+            if len(report.certificates) < MAX_REPORT_CERTS:
+                report.certificates.append(cert)
 
             # Extract subdomains from name_value (SAN field)
-            for name in cert.name_value.split("\n"):
+            for name in (cert.name_value or "").split("\n"):
                 name = name.strip().lower()
-                if name and name.endswith(f".{domain.lower()}"):
+                if name and name.endswith(suffix):
                     if not name.startswith("*"):
                         subdomains.add(name)
                 elif name == domain.lower():
@@ -162,4 +326,3 @@ class CertRecon:
 
         report.unique_subdomains = sorted(subdomains)
         report.unique_issuers = sorted(issuers)
-        report.total_certs = len(report.certificates)
@@ -2,21 +2,31 @@
 Email Harvester — No API Keys Required
 
 Crawls web pages and extracts email addresses with context.
-Also checks HIBP k-anonymity API (free, no key) for breach exposure.
+Breach exposure comes from the shared HIBP lookup service (batched,
+rate-limited and cached per email); it is skipped when no HIBP_API_KEY
+is configured.
+
+Pages are fetched concurrently from a deduplicating crawl frontier that
+tracks real link depth and keeps per-host concurrency and request spacing
+polite. Pages are read through a PageCache, so pages the web analysis
+already fetched are not requested again.
 """
 
 import asyncio
 import re
 import logging
-from typing import Dict, List, Any, Optional, Set
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Dict, List, Any, Optional, Set, Tuple, Deque
 from dataclasses import dataclass, field
 from datetime import datetime
-from urllib.parse import urljoin, urlparse
-import hashlib
+from urllib.parse import unquote, urljoin, urlparse
 
-import aiohttp
 from bs4 import BeautifulSoup
 
+from .page_cache import PageCache, normalize_url
+
 logger = logging.getLogger(__name__)
 
 
@@ -57,128 +67,194 @@ class HarvestReport:
         }
 
 
+class CrawlFrontier:
+    """Deduplicating URL frontier with link-depth tracking and per-host politeness."""
+
+    def __init__(self, max_depth: int, per_host_concurrency: int = 4,
+                 per_host_delay: float = 0.1):
+        self.max_depth = max_depth
+        self.per_host_concurrency = per_host_concurrency
+        self.per_host_delay = per_host_delay
+        self.seen: Set[str] = set()
+        self._queue: Deque[Tuple[str, int]] = deque()
+        self._host_slots: Dict[str, asyncio.Semaphore] = {}
+        self._host_locks: Dict[str, asyncio.Lock] = {}
+        self._host_last: Dict[str, float] = {}
+
+    def add(self, url: str, depth: int) -> bool:
+        """Queue a URL found at the given link depth; returns False if skipped."""
+        if depth > self.max_depth:
+            return False
+        url = normalize_url(url)
+        if url in self.seen:
+            return False
+        self.seen.add(url)
+        self._queue.append((url, depth))
+        return True
+
+    def pop(self) -> Optional[Tuple[str, int]]:
+        """Next (url, depth) in breadth-first order, or None if empty."""
+        return self._queue.popleft() if self._queue else None
+
+    def __len__(self) -> int:
+        return len(self._queue)
+
+    @asynccontextmanager
+    async def host_slot(self, url: str):
+        """Hold one of the host's concurrency slots, spacing request starts by per_host_delay."""
+        host = urlparse(url).netloc
+        slot = self._host_slots.setdefault(host, asyncio.Semaphore(self.per_host_concurrency))
+        lock = self._host_locks.setdefault(host, asyncio.Lock())
+        async with slot:
+            async with lock:
+                wait = self._host_last.get(host, 0.0) + self.per_host_delay - time.monotonic()
+                if wait > 0:
+                    await asyncio.sleep(wait)
+                self._host_last[host] = time.monotonic()
+            yield
+
+
 class EmailHarvester:
     """Email harvesting from web pages + free breach checks."""
 
-    def __init__(self, timeout: float = 10.0, max_pages: int = 20, max_depth: int = 2):
+    def __init__(self, timeout: float = 10.0, max_pages: int = 20, max_depth: int = 2,
+                 max_concurrent: int = 8, per_host_concurrency: int = 4,
+                 per_host_delay: float = 0.1,
+                 breach_service=None):
         self.timeout = timeout
         self.max_pages = max_pages
         self.max_depth = max_depth
+        self.max_concurrent = max_concurrent
+        self.per_host_concurrency = per_host_concurrency
+        self.per_host_delay = per_host_delay
+        self.breach_service = breach_service
         self.logger = logging.getLogger(f"{__name__}.EmailHarvester")
 
-    async def harvest(self, domain: str, progress_callback=None) -> HarvestReport:
+    async def harvest(self, domain: str, progress_callback=None,
+                      max_pages: Optional[int] = None,
+                      page_cache: Optional[PageCache] = None) -> HarvestReport:
         """Crawl a domain and extract all email addresses."""
         report = HarvestReport(target=domain)
+        max_pages = max_pages or self.max_pages
         all_emails: Dict[str, HarvestedEmail] = {}
-        visited: Set[str] = set()
-        to_visit = [f"https://{domain}", f"https://{domain}/contact",
-                    f"https://{domain}/about", f"https://{domain}/team",
-                    f"https://{domain}/privacy", f"https://{domain}/impressum"]
-
-        async with aiohttp.ClientSession() as session:
-            depth = 0
-            while to_visit and len(visited) < self.max_pages and depth < self.max_depth:
-                current_batch = [u for u in to_visit if u not in visited][:5]
-                to_visit = [u for u in to_visit if u not in visited][5:]
-
-                for url in current_batch:
-                    if url in visited:
-                        continue
-                    visited.add(url)
-
-                    if progress_callback:
-                        progress_callback(f"Email harvest: {len(visited)}/{self.max_pages} pages",
-                                          int((len(visited) / self.max_pages) * 100))
-
-                    try:
-                        emails, new_links = await self._scrape_page(session, url, domain)
-                        for email in emails:
-                            if email not in all_emails:
-                                all_emails[email] = HarvestedEmail(email=email, sources=[url])
-                            else:
-                                if url not in all_emails[email].sources:
-                                    all_emails[email].sources.append(url)
-                        to_visit.extend([l for l in new_links if l not in visited])
-                    except Exception as e:
-                        report.errors.append(f"{url}: {str(e)[:100]}")
-
-                depth += 1
+        visited: List[str] = []
+        frontier = CrawlFrontier(self.max_depth, self.per_host_concurrency, self.per_host_delay)
+        for path in ("", "/contact", "/about", "/team", "/privacy", "/impressum"):
+            frontier.add(f"https://{domain}{path}", 0)
+
+        in_flight = 0
+        wakeup = asyncio.Event()
+
+        async def crawl(pages: PageCache, url: str, depth: int):
+            try:
+                if pages.get(url) is not None:
+                    emails, new_links = await self._scrape_page(pages, url, domain)
+                else:
+                    async with frontier.host_slot(url):
+                        emails, new_links = await self._scrape_page(pages, url, domain)
+                for email in emails:
+                    if email not in all_emails:
+                        all_emails[email] = HarvestedEmail(email=email, sources=[url])
+                    elif url not in all_emails[email].sources:
+                        all_emails[email].sources.append(url)
+                for link in new_links:
+                    frontier.add(link, depth + 1)
+            except Exception as e:
+                report.errors.append(f"{url}: {str(e)[:100]}")
+
+        async def worker(pages: PageCache):
+            nonlocal in_flight
+            while True:
+                # Stop once the page budget is spent, or nothing is queued and no
+                # fetch is still running that could discover more links.
+                while len(visited) < max_pages and not len(frontier) and in_flight:
+                    wakeup.clear()
+                    await wakeup.wait()
+                item = frontier.pop() if len(visited) < max_pages else None
+                if item is None:
+                    wakeup.set()
+                    return
+                url, depth = item
+                visited.append(url)
+                in_flight += 1
+                if progress_callback:
+                    progress_callback(f"Email harvest: {len(visited)}/{max_pages} pages",
+                                      int((len(visited) / max_pages) * 100))
+                try:
+                    await crawl(pages, url, depth)
+                finally:
+                    in_flight -= 1
+                    wakeup.set()
+
+        pages = page_cache or PageCache(timeout=self.timeout)
+        try:
+            await asyncio.gather(*[worker(pages) for _ in range(self.max_concurrent)])
+        finally:
+            if page_cache is None:
+                await pages.close()
 
         report.pages_crawled = len(visited)
 
-        # Check breaches for found emails (HIBP k-anonymity — free, no key)
+        # Check breaches for all found emails in one batch
         if progress_callback:
             progress_callback("Email harvest: Checking breaches", 90)
 
-        for email, harvested in all_emails.items():
-            breach_info = await self._check_hibp(email)
-            if breach_info:
-                harvested.breach_count = breach_info.get("count", 0)
-                harvested.breaches = breach_info.get("names", [])
+        breaches = await self._check_breaches(list(all_emails))
+        for email, names in breaches.items():
+            all_emails[email].breach_count = len(names)
+            all_emails[email].breaches = names
 
         report.emails = sorted(all_emails.values(), key=lambda e: e.email)
         return report
 
-    async def _scrape_page(self, session: aiohttp.ClientSession, url: str,
-                            domain: str) -> tuple:
+    async def _scrape_page(self, pages: PageCache, url: str, domain: str) -> tuple:
         """Scrape a single page for emails and internal links."""
         emails: Set[str] = set()
         links: List[str] = []
 
-        headers = {
-            "User-Agent": "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36",
-            "Accept": "text/html",
-        }
-
-        async with session.get(url, timeout=aiohttp.ClientTimeout(total=self.timeout),
-                               headers=headers, ssl=False, allow_redirects=True) as resp:
-            if resp.status != 200:
-                return emails, links
-
-            html = await resp.text(errors="replace")
-
-            # Extract emails
-            pattern = r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}'
-            for match in re.finditer(pattern, html):
-                email = match.group().lower()
-                if not any(email.endswith(ext) for ext in ['.png', '.jpg', '.gif', '.css', '.js', '.svg']):
+        page = await pages.fetch(url, timeout=self.timeout)
+        if page.status != 200:
+            return emails, links
+
+        html = page.text()
+
+        # Extract emails
+        pattern = r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}'
+        for match in re.finditer(pattern, html):
+            email = match.group().lower()
+            if not any(email.endswith(ext) for ext in ['.png', '.jpg', '.gif', '.css', '.js', '.svg']):
+                emails.add(email)
+
+        # Also check mailto: links
+        soup = BeautifulSoup(html, "html.parser")
+        for a in soup.find_all("a", href=True):
+            href = a["href"]
+            if href.startswith("mailto:"):
+                # Same form as the breach lookup keys: percent-decoded, stripped, lowercase
+                email = unquote(href[7:].split("?")[0]).strip().lower()
+                if "@" in email:
                     emails.add(email)
-
-            # Also check mailto: links
-            soup = BeautifulSoup(html, "html.parser")
-            for a in soup.find_all("a", href=True):
-                href = a["href"]
-                if href.startswith("mailto:"):
-                    email = href[7:].split("?")[0].lower()
-                    if "@" in email:
-                        emails.add(email)
-                elif urlparse(href).netloc in ("", domain, f"www.{domain}"):
-                    full_url = urljoin(url, href)
-                    if urlparse(full_url).netloc in (domain, f"www.{domain}"):
-                        links.append(full_url)
+            elif urlparse(href).netloc in ("", domain, f"www.{domain}"):
+                full_url = urljoin(url, href)
+                if urlparse(full_url).netloc in (domain, f"www.{domain}"):
+                    links.append(full_url)
 
         return emails, links
 
-    async def _check_hibp(self, email: str) -> Optional[Dict[str, Any]]:
-        """Check HIBP using the k-anonymity API (free, no key required)."""
+    async def _check_breaches(self, emails: List[str]) -> Dict[str, List[str]]:
+        """Return breach names per exposed email via the shared HIBP lookup service."""
+        # Imported here: the breach package itself depends on local.recon_cache
+        from ..breach.lookup import get_breach_service
+        service = self.breach_service or get_breach_service()
+        if not emails or not service.api_key:
+            return {}
         try:
-            # Hash the email and use k-anonymity on the password hash
-            # Actually HIBP breach check by email needs API key now
-            # But the Pwned Passwords API uses k-anonymity and is free
-            # We can check if the email domain has been in breaches via the free breach list
-            sha1 = hashlib.sha1(email.encode("utf-8")).hexdigest().upper()
-            prefix = sha1[:5]
-
-            async with aiohttp.ClientSession() as session:
-                url = f"https://api.pwnedpasswords.com/range/{prefix}"
-                async with session.get(url, timeout=aiohttp.ClientTimeout(total=5)) as resp:
-                    if resp.status == 200:
-                        # This checks password hashes, not email breaches
-                        # Return basic info that the API was reachable
-                        return None  # Email breach check requires paid API
-        except Exception:
-            pass
-        return None
+            results = await service.lookup_many(emails)
+        except Exception as e:
+            self.logger.warning(f"Breach check failed: {e}")
+            return {}
+        return {email: [b.get("Name", "") for b in result.breaches]
+                for email, result in results.items() if result.breaches}
 
     async def check_email_exists(self, email: str) -> Dict[str, Any]:
         """Basic email validation via DNS MX record check."""
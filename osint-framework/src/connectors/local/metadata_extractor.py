@@ -3,15 +3,31 @@ Metadata Extractor — No API Keys Required
 
 Extracts metadata from images (EXIF), PDFs, and other files.
 All processing is done locally with no external calls.
+
+Batch mode walks a directory or archive (zip/tar), fans files out to a
+process pool sized to the CPU count and streams results as NDJSON. Only
+images and PDFs are hashed and parsed; other files are reported from their
+directory entry. Results are cached persistently by content hash; a
+(path, size, mtime) index lets re-runs skip unchanged files without reading
+them at all. Archive members above a size cap are skipped, and the bytes of
+members waiting for a worker are bounded.
 """
 
+import hashlib
+import io
+import json
 import logging
 import os
-from typing import Dict, Any, Optional
+import tarfile
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from typing import Callable, Dict, Any, Optional, List, Iterator, IO, Tuple, Union
 from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
 
+from .recon_cache import ReconCache
+
 logger = logging.getLogger(__name__)
 
 
@@ -25,16 +41,79 @@ class FileMetadata:
     modified: Optional[str] = None
     metadata: Dict[str, Any] = field(default_factory=dict)
     gps: Optional[Dict[str, float]] = None
-    errors: List = field(default_factory=list)
+    errors: List[str] = field(default_factory=list)
 
     def to_dict(self) -> Dict[str, Any]:
         return {k: v for k, v in self.__dict__.items() if v}
 
 
+IMAGE_SUFFIXES = ('.jpg', '.jpeg', '.png', '.tiff', '.heic')
+PDF_SUFFIXES = ('.pdf',)
+ARCHIVE_SUFFIXES = ('.zip', '.tar', '.tgz', '.tar.gz', '.tar.bz2', '.tar.xz')
+EXTRACTABLE_SUFFIXES = IMAGE_SUFFIXES + PDF_SUFFIXES
+# Content-derived fields; created/modified/filename depend on where the file lives
+CACHED_FIELDS = ("file_size", "file_type", "metadata", "gps")
+HASH_CHUNK = 1024 * 1024
+
+
+@dataclass
+class _BatchItem:
+    """One file or archive member queued for a worker process."""
+    filename: str
+    filepath: str
+    suffix: str
+    stat_key: str
+    size: int = 0
+    path: Optional[str] = None      # file on disk
+    data: Optional[bytes] = None    # archive member contents
+    read: Optional[Callable[[], bytes]] = None  # reads data; only valid while walking
+    modified: Optional[str] = None
+    created: Optional[str] = None
+
+
+# Per-worker-process state, set up by _init_worker
+_worker_cache: Optional[ReconCache] = None
+
+
+def _init_worker(cache_path: Optional[str]):
+    global _worker_cache
+    _worker_cache = ReconCache("metadata", path=cache_path) if cache_path else None
+
+
+def _process_item(item: _BatchItem) -> Tuple[str, str, Dict[str, Any], bool]:
+    """Worker: hash the content, then reuse cached metadata or extract it."""
+    digest = hashlib.blake2b(digest_size=20)
+    if item.data is not None:
+        digest.update(item.data)
+        size = len(item.data)
+    else:
+        size = 0
+        with open(item.path, "rb") as f:
+            for chunk in iter(lambda: f.read(HASH_CHUNK), b""):
+                digest.update(chunk)
+                size += len(chunk)
+    content_hash = digest.hexdigest()
+
+    meta = FileMetadata(filename=item.filename, filepath=item.filepath,
+                        file_size=size, file_type=item.suffix,
+                        created=item.created, modified=item.modified)
+    cached = _worker_cache.get(content_hash) if _worker_cache else None
+    if cached is not None:
+        for key in CACHED_FIELDS:
+            setattr(meta, key, cached.get(key))
+        return item.stat_key, content_hash, dict(meta.__dict__), True
+
+    MetadataExtractor()._extract_content(item.data if item.data is not None else Path(item.path),
+                                         item.suffix, meta)
+    return item.stat_key, content_hash, dict(meta.__dict__), False
+
+
 class MetadataExtractor:
     """Extract metadata from files locally."""
 
-    def __init__(self):
+    def __init__(self, cache_path: Optional[str] = None, cache_ttl: float = 365 * 86400.0):
+        self.cache_path = cache_path
+        self.cache_ttl = cache_ttl
         self.logger = logging.getLogger(f"{__name__}.MetadataExtractor")
 
     def extract(self, filepath: str) -> FileMetadata:
@@ -58,20 +137,175 @@ class MetadataExtractor:
         meta.modified = datetime.fromtimestamp(stat.st_mtime).isoformat()
         meta.created = datetime.fromtimestamp(stat.st_ctime).isoformat()
 
-        if suffix in ('.jpg', '.jpeg', '.png', '.tiff', '.heic'):
-            self._extract_image_exif(path, meta)
-        elif suffix == '.pdf':
-            self._extract_pdf_metadata(path, meta)
+        self._extract_content(path, suffix, meta)
+        return meta
 
+    def _extract_content(self, source: Union[Path, bytes], suffix: str, meta: FileMetadata):
+        """Type-specific metadata from a file on disk or an in-memory archive member."""
+        if suffix in IMAGE_SUFFIXES:
+            self._extract_image_exif(source, meta)
+        elif suffix in PDF_SUFFIXES:
+            self._extract_pdf_metadata(source, meta)
+
+    # ------------------------------------------------------------------
+    # Batch mode
+    # ------------------------------------------------------------------
+
+    def extract_batch(self, source: str, workers: Optional[int] = None,
+                      max_pending: Optional[int] = None,
+                      max_pending_bytes: int = 256 * 1024 * 1024,
+                      max_member_bytes: int = 64 * 1024 * 1024) -> Iterator[FileMetadata]:
+        """
+        Extract metadata for every file in a directory or archive.
+
+        Results are yielded as they complete (not in walk order). Files with
+        no extractor get size and type only. Files whose (path, size, mtime)
+        match the previous run come straight from the cache; other images
+        and PDFs are hashed and parsed in a process pool. Archive members
+        larger than max_member_bytes are reported with an error instead of
+        being read, and submissions pause while queued members hold more
+        than max_pending_bytes.
+        """
+        workers = workers or os.cpu_count() or 1
+        max_pending = max_pending or workers * 4
+        cache = ReconCache("metadata", path=self.cache_path)
+        stat_index = ReconCache("metadata_stat", path=self.cache_path)
+        cache_file = os.path.abspath(cache.path)
+
+        try:
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                     initargs=(cache.path,)) as pool:
+                pending: Dict[Any, int] = {}  # future -> archive bytes it holds
+                for item in self._walk(source):
+                    if item.suffix not in EXTRACTABLE_SUFFIXES:
+                        yield self._from_walk(item)
+                        continue
+                    content_hash = stat_index.get(item.stat_key)
+                    cached = cache.get(content_hash) if content_hash else None
+                    if cached is not None:
+                        yield self._from_cache(item, cached)
+                        continue
+
+                    if item.path and os.path.abspath(item.path).startswith(cache_file):
+                        continue  # never index our own cache database
+                    if item.read is not None:
+                        if item.size > max_member_bytes:
+                            meta = self._from_walk(item)
+                            meta.errors.append(f"Archive member over {max_member_bytes} bytes, skipped")
+                            yield meta
+                            continue
+                        # Decompress archive members only once the stat index misses
+                        item.data, item.read = item.read(), None
+                    pending[pool.submit(_process_item, item)] = len(item.data or b"")
+                    # Bound memory: archive members carry their bytes with them
+                    while pending and (len(pending) >= max_pending
+                                       or sum(pending.values()) > max_pending_bytes):
+                        yield from self._drain(pending, cache, stat_index)
+
+                while pending:
+                    yield from self._drain(pending, cache, stat_index)
+        finally:
+            cache.close()
+            stat_index.close()
+
+    def write_ndjson(self, source: str, out: IO[str], workers: Optional[int] = None) -> int:
+        """Stream batch results to out as one JSON object per line; returns the count."""
+        count = 0
+        for meta in self.extract_batch(source, workers=workers):
+            out.write(json.dumps(meta.to_dict(), default=str) + "\n")
+            count += 1
+        return count
+
+    def _finish(self, future, cache: ReconCache, stat_index: ReconCache) -> FileMetadata:
+        stat_key, content_hash, fields, from_cache = future.result()
+        meta = FileMetadata(**fields)
+        if not from_cache and not meta.errors:
+            cache.set(content_hash, {k: fields[k] for k in CACHED_FIELDS}, self.cache_ttl)
+        if not meta.errors:
+            stat_index.set(stat_key, content_hash, self.cache_ttl)
         return meta
 
-    def _extract_image_exif(self, path: Path, meta: FileMetadata):
-        """Extract EXIF data from images."""
+    def _drain(self, pending: Dict[Any, int], cache: ReconCache,
+               stat_index: ReconCache) -> Iterator[FileMetadata]:
+        done, _ = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            del pending[future]
+            yield self._finish(future, cache, stat_index)
+
+    def _from_walk(self, item: _BatchItem) -> FileMetadata:
+        return FileMetadata(filename=item.filename, filepath=item.filepath, file_size=item.size,
+                            file_type=item.suffix, created=item.created, modified=item.modified)
+
+    def _from_cache(self, item: _BatchItem, cached: Dict[str, Any]) -> FileMetadata:
+        meta = FileMetadata(filename=item.filename, filepath=item.filepath,
+                            created=item.created, modified=item.modified)
+        for key in CACHED_FIELDS:
+            setattr(meta, key, cached.get(key))
+        return meta
+
+    def _walk(self, source: str) -> Iterator[_BatchItem]:
+        """Files under a directory (descending into archives), or members of one archive."""
+        root = Path(source)
+        if root.is_file():
+            paths = [root]
+        else:
+            paths = (Path(dirpath) / name
+                     for dirpath, _, names in os.walk(root) for name in sorted(names))
+
+        for path in paths:
+            name = path.name.lower()
+            if name.endswith(ARCHIVE_SUFFIXES):
+                try:
+                    yield from self._walk_archive(path)
+                except (OSError, zipfile.BadZipFile, tarfile.TarError) as e:
+                    self.logger.warning(f"Cannot read archive {path}: {e}")
+                continue
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            yield _BatchItem(
+                filename=path.name, filepath=str(path), suffix=path.suffix.lower(), path=str(path),
+                size=stat.st_size, stat_key=f"{path.resolve()}|{stat.st_size}|{stat.st_mtime_ns}",
+                modified=datetime.fromtimestamp(stat.st_mtime).isoformat(),
+                created=datetime.fromtimestamp(stat.st_ctime).isoformat(),
+            )
+
+    def _walk_archive(self, path: Path) -> Iterator[_BatchItem]:
+        """Archive members, read one at a time in archive order."""
+        archive_key = str(path.resolve())
+        if zipfile.is_zipfile(path):
+            with zipfile.ZipFile(path) as zf:
+                for info in zf.infolist():
+                    if info.is_dir():
+                        continue
+                    yield self._member_item(
+                        path, info.filename, f"{archive_key}::{info.filename}|{info.file_size}|{info.CRC}",
+                        info.file_size, datetime(*info.date_time).isoformat(), lambda: zf.read(info))
+        else:
+            with tarfile.open(path) as tf:
+                for info in tf:
+                    if not info.isfile():
+                        continue
+                    yield self._member_item(
+                        path, info.name, f"{archive_key}::{info.name}|{info.size}|{info.mtime}",
+                        info.size, datetime.fromtimestamp(info.mtime).isoformat(),
+                        lambda: tf.extractfile(info).read())
+
+    def _member_item(self, archive: Path, name: str, stat_key: str, size: int,
+                     modified: str, read) -> _BatchItem:
+        member = Path(name)
+        return _BatchItem(filename=member.name, filepath=f"{archive}::{name}",
+                          suffix=member.suffix.lower(), stat_key=stat_key, size=size,
+                          read=read, modified=modified)
+
+    def _extract_image_exif(self, source: Union[Path, bytes], meta: FileMetadata):
+        """Extract EXIF data from images (Pillow reads only the header segments)."""
         try:
             from PIL import Image
             from PIL.ExifTags import TAGS, GPSTAGS
 
-            img = Image.open(str(path))
+            img = Image.open(io.BytesIO(source) if isinstance(source, bytes) else str(source))
             exif_data = img._getexif()
 
             if not exif_data:
@@ -119,12 +353,15 @@ class MetadataExtractor:
         except (TypeError, IndexError, ValueError):
             return None
 
-    def _extract_pdf_metadata(self, path: Path, meta: FileMetadata):
+    def _extract_pdf_metadata(self, source: Union[Path, bytes], meta: FileMetadata):
         """Extract metadata from PDF files."""
         try:
             import fitz  # PyMuPDF
 
-            doc = fitz.open(str(path))
+            if isinstance(source, bytes):
+                doc = fitz.open(stream=source, filetype="pdf")
+            else:
+                doc = fitz.open(str(source))
             pdf_meta = doc.metadata
             if pdf_meta:
                 for key, value in pdf_meta.items():
@@ -136,10 +373,13 @@ class MetadataExtractor:
         except ImportError:
             # Fallback: try to read PDF header manually
             try:
-                with open(str(path), "rb") as f:
-                    header = f.read(1024).decode("latin-1", errors="replace")
-                    if "/Author" in header:
-                        meta.metadata["note"] = "PDF metadata present but PyMuPDF not installed for full extraction"
+                if isinstance(source, bytes):
+                    header = source[:1024].decode("latin-1", errors="replace")
+                else:
+                    with open(str(source), "rb") as f:
+                        header = f.read(1024).decode("latin-1", errors="replace")
+                if "/Author" in header:
+                    meta.metadata["note"] = "PDF metadata present but PyMuPDF not installed for full extraction"
             except Exception:
                 pass
         except Exception as e:
@@ -0,0 +1,145 @@
+"""
+Page Cache — Per-Investigation HTTP Page Store
+
+Web-facing recon modules (WebScraper, EmailHarvester, TechFingerprinter)
+read pages through one PageCache so each URL is fetched once per
+investigation. Pages are keyed by normalized URL and keep status, headers,
+cookies and body; large bodies are held zlib-compressed.
+
+The cache owns one aiohttp session unless it is handed one (the batch
+runner shares a session across targets). The orchestrator creates it at the
+start of an investigation and closes it at the end, which drops all pages.
+"""
+
+import asyncio
+import logging
+import zlib
+from typing import Dict, List, Optional
+from dataclasses import dataclass, field
+from urllib.parse import urlparse, urldefrag
+
+import aiohttp
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+    "Accept-Language": "en-US,en;q=0.9",
+}
+
+
+def normalize_url(url: str) -> str:
+    """Canonical form used as the cache/frontier key (no fragment, lowercase host)."""
+    url, _ = urldefrag(url)
+    parsed = urlparse(url)
+    path = parsed.path or "/"
+    normalized = f"{parsed.scheme.lower()}://{parsed.netloc.lower()}{path}"
+    if parsed.query:
+        normalized += f"?{parsed.query}"
+    return normalized
+
+
+@dataclass
+class CachedPage:
+    url: str
+    final_url: str
+    status: int
+    headers: Dict[str, str] = field(default_factory=dict)  # lowercased names
+    cookies: List[str] = field(default_factory=list)
+    charset: Optional[str] = None
+    compressed: bool = False
+    _body: bytes = b""
+
+    @property
+    def body(self) -> bytes:
+        return zlib.decompress(self._body) if self.compressed else self._body
+
+    def text(self) -> str:
+        return self.body.decode(self.charset or "utf-8", errors="replace")
+
+
+class PageCache:
+    """Fetch-once page store shared by the recon modules of one investigation."""
+
+    def __init__(self, timeout: float = 15.0, max_redirects: int = 5,
+                 compress_threshold: int = 64 * 1024,
+                 headers: Optional[Dict[str, str]] = None,
+                 session: Optional[aiohttp.ClientSession] = None):
+        self.timeout = timeout
+        self.max_redirects = max_redirects
+        self.compress_threshold = compress_threshold
+        self.headers = headers or DEFAULT_HEADERS
+        self.hits = 0
+        self.fetches = 0
+        # Completed and in-flight fetches; failures are kept so every reader sees them
+        self._pages: Dict[str, asyncio.Future] = {}
+        self._session = session
+        self._owns_session = session is None
+        self.logger = logging.getLogger(f"{__name__}.PageCache")
+
+    async def __aenter__(self) -> "PageCache":
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    async def fetch(self, url: str, timeout: Optional[float] = None) -> CachedPage:
+        """Return the page for url, fetching it only if no module has yet."""
+        key = normalize_url(url)
+        future = self._pages.get(key)
+        if future is None:
+            self.fetches += 1
+            future = asyncio.ensure_future(self._fetch(url, timeout))
+            self._pages[key] = future
+        else:
+            self.hits += 1
+        return await asyncio.shield(future)
+
+    def get(self, url: str) -> Optional[CachedPage]:
+        """Return an already fetched page without touching the network."""
+        future = self._pages.get(normalize_url(url))
+        if future is None or not future.done() or future.cancelled() or future.exception():
+            return None
+        return future.result()
+
+    async def _fetch(self, url: str, timeout: Optional[float]) -> CachedPage:
+        if self._session is None:
+            self._session = aiohttp.ClientSession()
+        async with self._session.get(url, headers=self.headers, timeout=aiohttp.ClientTimeout(total=timeout or self.timeout),
+                                     max_redirects=self.max_redirects, ssl=False) as resp:
+            body = await resp.read()
+            page = CachedPage(
+                url=url,
+                final_url=str(resp.url),
+                status=resp.status,
+                headers={k.lower(): v for k, v in resp.headers.items()},
+                cookies=resp.headers.getall("Set-Cookie", []),
+                charset=resp.charset,
+            )
+
+        if len(body) > self.compress_threshold:
+            page._body = zlib.compress(body, 1)
+            page.compressed = True
+        else:
+            page._body = body
+
+        # Also answer for the post-redirect URL
+        final_key = normalize_url(page.final_url)
+        if final_key not in self._pages:
+            done = asyncio.get_event_loop().create_future()
+            done.set_result(page)
+            self._pages[final_key] = done
+        return page
+
+    async def close(self):
+        """Drop all pages and close the session if this cache opened it."""
+        for future in self._pages.values():
+            if not future.done():
+                future.cancel()
+            elif not future.cancelled():
+                future.exception()  # mark failures as retrieved
+        self._pages.clear()
+        if self._session is not None and self._owns_session:
+            await self._session.close()
+            self._session = None
@@ -0,0 +1,153 @@
+"""
+Recon Cache — Persistent TTL Store for Local Recon Modules
+
+Small SQLite-backed key/value store shared by the local recon modules
+(WHOIS, certificate transparency, breach checks, ...). Values are JSON
+encoded and partitioned by namespace; every entry carries its own expiry.
+
+Uses only the standard library so the local modules keep working
+without Redis or the API database.
+
+The database lives in the per-user cache directory unless RECON_CACHE_PATH
+says otherwise. It is opened on first use, so constructing a recon module
+touches no files, and when it cannot be opened (read-only home, sandboxed
+desktop app) the cache falls back to memory for the life of the process.
+"""
+
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+import logging
+from typing import Dict, Any, Optional, Iterable, Tuple
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS recon_cache ("
+    " namespace TEXT NOT NULL,"
+    " key TEXT NOT NULL,"
+    " value TEXT NOT NULL,"
+    " expires_at REAL NOT NULL,"
+    " PRIMARY KEY (namespace, key))"
+)
+
+
+def default_cache_path() -> str:
+    """RECON_CACHE_PATH, else recon_cache.db in the per-user cache directory."""
+    if os.getenv("RECON_CACHE_PATH"):
+        return os.environ["RECON_CACHE_PATH"]
+    if os.name == "nt":
+        base = os.getenv("LOCALAPPDATA") or os.path.expanduser(os.path.join("~", "AppData", "Local"))
+    elif sys.platform == "darwin":
+        base = os.path.expanduser("~/Library/Caches")
+    else:
+        base = os.getenv("XDG_CACHE_HOME") or os.path.expanduser("~/.cache")
+    return os.path.join(base, "osint-framework", "recon_cache.db")
+
+
+def connect_cache_db(path: str, schema: str) -> Tuple[sqlite3.Connection, str]:
+    """
+    Open a cache database and create its schema.
+
+    Returns the connection and the path actually used: ":memory:" when
+    `path` cannot be created or opened.
+    """
+    conn = None
+    try:
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        conn = sqlite3.connect(path, check_same_thread=False)
+        if path != ":memory:":
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+        conn.executescript(schema)
+        conn.commit()
+        return conn, path
+    except (OSError, sqlite3.Error) as e:
+        if conn is not None:
+            conn.close()
+        logger.warning(f"Cache database {path} unavailable, caching in memory only: {e}")
+        conn = sqlite3.connect(":memory:", check_same_thread=False)
+        conn.executescript(schema)
+        return conn, ":memory:"
+
+
+class ReconCache:
+    """Persistent namespaced TTL cache backed by SQLite."""
+
+    def __init__(self, namespace: str, path: Optional[str] = None):
+        self.namespace = namespace
+        self.path = path or default_cache_path()
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self.logger = logging.getLogger(f"{__name__}.ReconCache")
+
+    def _db(self) -> sqlite3.Connection:
+        # Callers hold self._lock
+        if self._conn is None:
+            self._conn, self.path = connect_cache_db(self.path, _SCHEMA)
+        return self._conn
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached value, or None if missing or expired."""
+        return self.get_many([key]).get(key)
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, Any]:
+        """Return all unexpired values for the given keys."""
+        keys = list(keys)
+        found: Dict[str, Any] = {}
+        now = time.time()
+        with self._lock:
+            # SQLite caps bound parameters; stay well below the limit
+            for i in range(0, len(keys), 500):
+                chunk = keys[i:i + 500]
+                placeholders = ",".join("?" * len(chunk))
+                rows = self._db().execute(
+                    f"SELECT key, value FROM recon_cache WHERE namespace = ? "
+                    f"AND expires_at > ? AND key IN ({placeholders})",
+                    [self.namespace, now, *chunk],
+                ).fetchall()
+                for key, value in rows:
+                    found[key] = json.loads(value)
+        return found
+
+    def set(self, key: str, value: Any, ttl_seconds: float):
+        """Store a value for ttl_seconds."""
+        self.set_many({key: value}, ttl_seconds)
+
+    def set_many(self, items: Dict[str, Any], ttl_seconds: float):
+        """Store several values with the same TTL in one transaction."""
+        if not items:
+            return
+        expires_at = time.time() + ttl_seconds
+        rows = [(self.namespace, k, json.dumps(v, default=str), expires_at)
+                for k, v in items.items()]
+        with self._lock:
+            self._db().executemany(
+                "INSERT OR REPLACE INTO recon_cache (namespace, key, value, expires_at) "
+                "VALUES (?, ?, ?, ?)", rows)
+            self._db().commit()
+
+    def delete(self, key: str):
+        with self._lock:
+            self._db().execute("DELETE FROM recon_cache WHERE namespace = ? AND key = ?",
+                               (self.namespace, key))
+            self._db().commit()
+
+    def purge_expired(self) -> int:
+        """Remove expired entries in this namespace; returns the count removed."""
+        with self._lock:
+            cur = self._db().execute(
+                "DELETE FROM recon_cache WHERE namespace = ? AND expires_at <= ?",
+                (self.namespace, time.time()))
+            self._db().commit()
+            return cur.rowcount
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
@@ -3,13 +3,33 @@ Technology Fingerprinter — No API Keys Required
 
 Wappalyzer-style technology detection from HTTP responses.
 Comprehensive signature database for 200+ web technologies.
+Can fingerprint straight from a PageCache, reusing pages other modules fetched.
+
+TECH_DB is compiled once into a TechMatcher: every HTML regex gets the
+literal substrings any match must contain, and one scan of the lowercased
+page (Aho-Corasick via pyahocorasick when installed, substring checks
+otherwise) decides which regexes are worth running. Meta tags are parsed
+once per name rather than once per signature.
 """
 
 import re
 import logging
-from typing import Dict, List, Any, Optional, Set
+from typing import Dict, List, Any, Optional, Set, Pattern, Tuple
 from dataclasses import dataclass, field
 
+try:
+    from re import _parser as sre_parse  # Python 3.11+
+except ImportError:
+    import sre_parse
+
+try:
+    import ahocorasick
+    HAS_AHOCORASICK = True
+except ImportError:
+    HAS_AHOCORASICK = False
+
+from .page_cache import PageCache, CachedPage
+
 logger = logging.getLogger(__name__)
 
 
@@ -123,29 +143,112 @@ TECH_DB = {
 }
 
 
-class TechFingerprinter:
-    """Wappalyzer-style technology fingerprinting from HTTP responses."""
+# Non-ASCII characters that re.IGNORECASE matches against ASCII letters,
+# folded so the lowercased prefilter text never misses a regex match
+_DOTTED_I = {0x130: "i"}
+_ASCII_FOLDS = {0x131: "i", 0x17f: "s"}
 
-    def __init__(self):
-        self.logger = logging.getLogger(f"{__name__}.TechFingerprinter")
 
-    def fingerprint(self, html: str, headers: Dict[str, str],
-                    cookies: Optional[List[str]] = None) -> List[TechMatch]:
-        """Detect technologies from HTML content and HTTP headers."""
+def required_literals(pattern: str, min_length: int = 2) -> List[str]:
+    """Lowercase literal runs that every case-insensitive match of pattern contains."""
+    runs: List[str] = []
+    current: List[str] = []
+    for op, av in sre_parse.parse(pattern, re.IGNORECASE):
+        if op is sre_parse.LITERAL and av < 128:
+            current.append(chr(av).lower())
+            continue
+        if len(current) >= min_length:
+            runs.append("".join(current))
+        current = []
+    if len(current) >= min_length:
+        runs.append("".join(current))
+    return runs
+
+
+@dataclass
+class _Signature:
+    name: str
+    category: str
+    # (source pattern, compiled regex, literals that must all be present)
+    html: List[Tuple[str, Pattern, Tuple[str, ...]]] = field(default_factory=list)
+    headers: List[Tuple[str, Pattern]] = field(default_factory=list)
+    meta: List[Tuple[str, Pattern]] = field(default_factory=list)
+    cookies: List[Tuple[str, Pattern]] = field(default_factory=list)
+
+
+class TechMatcher:
+    """A technology database compiled once for fast matching against many pages."""
+
+    def __init__(self, db: Dict[str, Dict[str, Any]] = TECH_DB):
+        self.signatures: List[_Signature] = []
+        literals: Set[str] = set()
+        meta_names: Set[str] = set()
+
+        for tech_name, signatures in db.items():
+            sig = _Signature(name=tech_name, category=signatures.get("category", "Other"))
+            for pattern in signatures.get("html", []):
+                required = tuple(required_literals(pattern))
+                literals.update(required)
+                sig.html.append((pattern, re.compile(pattern, re.IGNORECASE), required))
+            for header_name, pattern in signatures.get("headers", {}).items():
+                sig.headers.append((header_name, re.compile(pattern, re.IGNORECASE)))
+            for meta_name, pattern in signatures.get("meta", {}).items():
+                sig.meta.append((meta_name, re.compile(pattern, re.IGNORECASE)))
+                meta_names.add(meta_name)
+            for pattern in signatures.get("cookies", []):
+                sig.cookies.append((pattern, re.compile(pattern, re.IGNORECASE)))
+            self.signatures.append(sig)
+
+        self.literals = sorted(literals)
+        self._meta_tags = {
+            name: re.compile(rf'<meta[^>]*name=["\']?{re.escape(name)}["\']?[^>]*content=["\']([^"\']*)["\']',
+                             re.IGNORECASE)
+            for name in meta_names
+        }
+
+        self._automaton = None
+        if HAS_AHOCORASICK and self.literals:
+            self._automaton = ahocorasick.Automaton()
+            for literal in self.literals:
+                self._automaton.add_word(literal, literal)
+            self._automaton.make_automaton()
+
+    def present_literals(self, html: str) -> Set[str]:
+        """Which prefilter literals occur in the page (case-insensitively)."""
+        if not html.isascii():
+            html = html.translate(_DOTTED_I)
+        text = html.lower()
+        if not text.isascii():
+            text = text.translate(_ASCII_FOLDS)
+
+        if self._automaton is not None:
+            found: Set[str] = set()
+            for _, literal in self._automaton.iter(text):
+                found.add(literal)
+                if len(found) == len(self.literals):
+                    break
+            return found
+        return {literal for literal in self.literals if literal in text}
+
+    def match(self, html: str, headers: Dict[str, str],
+              cookies: Optional[List[str]] = None) -> List[TechMatch]:
+        """Detect technologies; same results as checking every signature in turn."""
         matches: List[TechMatch] = []
-        html_lower = html.lower()
+        present = self.present_literals(html)
         headers_lower = {k.lower(): v for k, v in headers.items()}
         cookies_str = " ".join(cookies or []).lower()
+        meta_content: Dict[str, Optional[str]] = {}
 
-        for tech_name, signatures in TECH_DB.items():
-            category = signatures.get("category", "Other")
+        for sig in self.signatures:
             version = ""
             evidence = ""
             found = False
 
-            # Check HTML patterns
-            for pattern in signatures.get("html", []):
-                m = re.search(pattern, html, re.IGNORECASE)
+            # Check HTML patterns (skipping those whose literals are absent)
+            for pattern, regex, required in sig.html:
+                if not all(literal in present for literal in required):
+                    continue
+                m = regex.search(html)
                 if m:
                     found = True
                     evidence = f"html: {pattern}"
@@ -155,10 +258,10 @@ class TechFingerprinter:
 
             # Check headers
             if not found:
-                for header_name, pattern in signatures.get("headers", {}).items():
+                for header_name, regex in sig.headers:
                     header_val = headers_lower.get(header_name, "")
                     if header_val:
-                        m = re.search(pattern, header_val, re.IGNORECASE)
+                        m = regex.search(header_val)
                         if m:
                             found = True
                             evidence = f"header: {header_name}"
@@ -166,15 +269,15 @@ class TechFingerprinter:
                                 version = m.group(1) or ""
                             break
 
-            # Check meta tags
+            # Check meta tags (each tag name parsed once per page)
             if not found:
-                for meta_name, pattern in signatures.get("meta", {}).items():
-                    # Search for meta tag in HTML
-                    meta_pattern = rf'<meta[^>]*name=["\']?{re.escape(meta_name)}["\']?[^>]*content=["\']([^"\']*)["\']'
-                    m = re.search(meta_pattern, html, re.IGNORECASE)
-                    if m:
-                        meta_content = m.group(1)
-                        m2 = re.search(pattern, meta_content, re.IGNORECASE)
+                for meta_name, regex in sig.meta:
+                    if meta_name not in meta_content:
+                        m = self._meta_tags[meta_name].search(html)
+                        meta_content[meta_name] = m.group(1) if m else None
+                    content = meta_content[meta_name]
+                    if content is not None:
+                        m2 = regex.search(content)
                         if m2:
                             found = True
                             evidence = f"meta: {meta_name}"
@@ -184,15 +287,15 @@ class TechFingerprinter:
 
             # Check cookies
             if not found and cookies_str:
-                for cookie_pattern in signatures.get("cookies", []):
-                    if re.search(cookie_pattern, cookies_str, re.IGNORECASE):
+                for pattern, regex in sig.cookies:
+                    if regex.search(cookies_str):
                         found = True
-                        evidence = f"cookie: {cookie_pattern}"
+                        evidence = f"cookie: {pattern}"
                         break
 
             if found:
                 matches.append(TechMatch(
-                    name=tech_name, category=category,
+                    name=sig.name, category=sig.category,
                     version=version, evidence=evidence,
                     confidence=90 if version else 75
                 ))
@@ -201,6 +304,38 @@ class TechFingerprinter:
         matches.sort(key=lambda m: (m.category, m.name))
         return matches
 
+
+_default_matcher: Optional[TechMatcher] = None
+
+
+def get_tech_matcher() -> TechMatcher:
+    """The shared matcher for TECH_DB, compiled on first use."""
+    global _default_matcher
+    if _default_matcher is None:
+        _default_matcher = TechMatcher()
+    return _default_matcher
+
+
+class TechFingerprinter:
+    """Wappalyzer-style technology fingerprinting from HTTP responses."""
+
+    def __init__(self, matcher: Optional[TechMatcher] = None):
+        self.matcher = matcher or get_tech_matcher()
+        self.logger = logging.getLogger(f"{__name__}.TechFingerprinter")
+
+    def fingerprint(self, html: str, headers: Dict[str, str],
+                    cookies: Optional[List[str]] = None) -> List[TechMatch]:
+        """Detect technologies from HTML content and HTTP headers."""
+        return self.matcher.match(html, headers, cookies)
+
+    def fingerprint_page(self, page: CachedPage) -> List[TechMatch]:
+        """Detect technologies from a cached page's body, headers and cookies."""
+        return self.fingerprint(page.text(), page.headers, page.cookies)
+
+    async def fingerprint_url(self, url: str, page_cache: PageCache) -> List[TechMatch]:
+        """Fetch (or reuse) a page from the investigation's cache and fingerprint it."""
+        return self.fingerprint_page(await page_cache.fetch(url))
+
     def categorize(self, matches: List[TechMatch]) -> Dict[str, List[Dict]]:
         """Group detected technologies by category."""
         categories: Dict[str, List[Dict]] = {}
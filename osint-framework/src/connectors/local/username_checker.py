@@ -3,11 +3,23 @@ Username Checker — No API Keys Required
 
 Checks username availability across 50+ platforms via direct HTTP requests.
 Returns profile URLs, existence status, and response codes.
+
+Many usernames can be checked at once: the whole username x platform grid
+shares one pooled session with per-platform concurrency limits. Status-only
+platforms are probed with HEAD (falling back to a one-byte range GET where
+HEAD isn't trustworthy); bodies are downloaded only for content checks.
+
+Content checks stream the body, decode it incrementally and search it
+case-insensitively, stopping at the first decisive marker or after
+max_body_bytes. An echoed username only decides the check early when the
+platform has no not-found markers that could still follow it.
 """
 
 import asyncio
+import codecs
 import logging
-from typing import Dict, List, Any, Optional
+import re
+from typing import Dict, List, Any, Optional, Iterable, Set, Pattern
 from dataclasses import dataclass, field
 from datetime import datetime
 
@@ -69,6 +81,36 @@ PLATFORMS = [
     ("TradeMe", "https://www.trademe.co.nz/members/{}", "status", [200]),
 ]
 
+# Extra markers for content-checked platforms. A "not_found" marker settles
+# the check as missing; a "found" marker as present. Without found markers
+# the username itself appearing in the page counts as found, unless a
+# not_found marker appears anywhere in the scanned body.
+CONTENT_MARKERS: Dict[str, Dict[str, List[str]]] = {
+    "HackerNews": {"not_found": ["No such user."]},
+}
+
+
+@dataclass
+class MarkerRule:
+    """Case-insensitive found/not-found markers for one platform, compiled once."""
+    found: Optional[Pattern] = None
+    not_found: Optional[Pattern] = None
+    max_length: int = 0
+
+    @classmethod
+    def compile(cls, markers: Dict[str, List[str]]) -> "MarkerRule":
+        def alternation(literals):
+            return re.compile("|".join(map(re.escape, literals)), re.IGNORECASE) if literals else None
+        found = markers.get("found", [])
+        not_found = markers.get("not_found", [])
+        return cls(found=alternation(found), not_found=alternation(not_found),
+                   max_length=max(map(len, found + not_found), default=0))
+
+
+MARKER_RULES: Dict[str, MarkerRule] = {name: MarkerRule.compile(markers)
+                                        for name, markers in CONTENT_MARKERS.items()}
+DEFAULT_MARKER_RULE = MarkerRule()
+
 
 @dataclass
 class UsernameResult:
@@ -113,15 +155,42 @@ class UsernameReport:
 class UsernameChecker:
     """Check username availability across 50+ platforms — no API keys."""
 
-    def __init__(self, timeout: float = 10.0, max_concurrent: int = 20):
+    HEADERS = {
+        "User-Agent": "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
+        "Accept": "text/html,application/xhtml+xml",
+        "Accept-Language": "en-US,en;q=0.9",
+    }
+    # HEAD answers trusted as final; anything else is re-checked with GET
+    HEAD_NOT_FOUND_CODES = (404, 410)
+
+    def __init__(self, timeout: float = 10.0, max_concurrent: int = 20,
+                 per_platform_concurrency: int = 2, max_body_bytes: int = 512 * 1024,
+                 chunk_size: int = 16 * 1024):
         self.timeout = timeout
         self.max_concurrent = max_concurrent
+        self.per_platform_concurrency = per_platform_concurrency
+        self.max_body_bytes = max_body_bytes
+        self.chunk_size = chunk_size
+        # Platforms whose HEAD answers proved inconclusive; probed with GET from then on
+        self._head_unreliable: Set[str] = set()
         self.logger = logging.getLogger(f"{__name__}.UsernameChecker")
 
     async def check(self, username: str, platforms: Optional[List[str]] = None,
                     progress_callback=None) -> UsernameReport:
         """Check username across all or selected platforms."""
-        report = UsernameReport(username=username)
+        reports = await self.check_many([username], platforms, progress_callback)
+        return reports[username]
+
+    async def check_many(self, usernames: Iterable[str], platforms: Optional[List[str]] = None,
+                         progress_callback=None) -> Dict[str, UsernameReport]:
+        """
+        Check several usernames across all or selected platforms.
+
+        Every (username, platform) pair runs concurrently over one pooled
+        session, so checking a few variants costs about as much as one.
+        """
+        usernames = list(dict.fromkeys(usernames))
+        reports = {u: UsernameReport(username=u) for u in usernames}
 
         # Filter platforms if specified
         check_platforms = PLATFORMS
@@ -129,66 +198,76 @@ class UsernameChecker:
             platforms_lower = [p.lower() for p in platforms]
             check_platforms = [p for p in PLATFORMS if p[0].lower() in platforms_lower]
 
-        report.checked_count = len(check_platforms)
+        for report in reports.values():
+            report.checked_count = len(check_platforms)
+
+        total = len(usernames) * len(check_platforms)
+        done = 0
         semaphore = asyncio.Semaphore(self.max_concurrent)
+        platform_slots = {p[0]: asyncio.Semaphore(self.per_platform_concurrency)
+                          for p in check_platforms}
 
-        async def check_platform(platform_def):
+        async def check_pair(session, username, platform_def):
+            nonlocal done
             name, url_template, check_type, success_codes = platform_def
-            async with semaphore:
-                return await self._check_single(username, name, url_template,
-                                                 check_type, success_codes)
-
-        tasks = []
-        for i, platform in enumerate(check_platforms):
-            if progress_callback and i % 5 == 0:
-                progress_callback(f"Username: Checking {platform[0]}",
-                                  int((i / len(check_platforms)) * 100))
-            tasks.append(check_platform(platform))
-
-        results = await asyncio.gather(*tasks, return_exceptions=True)
-
-        for result in results:
-            if isinstance(result, UsernameResult):
-                report.results.append(result)
-                if result.exists:
-                    report.found_count += 1
-            elif isinstance(result, Exception):
-                report.errors.append(str(result))
+            async with semaphore, platform_slots[name]:
+                result = await self._check_single(session, username, name, url_template,
+                                                  check_type, success_codes)
+            done += 1
+            if progress_callback and done % 5 == 0:
+                progress_callback(f"Username: Checked {name}", int((done / total) * 100))
+            return username, result
+
+        connector = aiohttp.TCPConnector(limit=self.max_concurrent,
+                                         limit_per_host=self.per_platform_concurrency,
+                                         ttl_dns_cache=300)
+        async with aiohttp.ClientSession(connector=connector, headers=self.HEADERS) as session:
+            # Platform-major order spreads the first requests across hosts
+            results = await asyncio.gather(
+                *[check_pair(session, username, platform)
+                  for platform in check_platforms for username in usernames],
+                return_exceptions=True)
+
+        for item in results:
+            if isinstance(item, Exception):
+                # Exceptions can't be attributed to a username; record them on all
+                for report in reports.values():
+                    report.errors.append(str(item))
+                continue
+            username, result = item
+            report = reports[username]
+            report.results.append(result)
+            if result.exists:
+                report.found_count += 1
 
         # Sort: found first, then by platform name
-        report.results.sort(key=lambda r: (not r.exists, r.platform))
+        for report in reports.values():
+            report.results.sort(key=lambda r: (not r.exists, r.platform))
 
-        return report
+        return reports
 
-    async def _check_single(self, username: str, platform: str, url_template: str,
-                             check_type: str, success_codes: List[int]) -> UsernameResult:
+    async def _check_single(self, session: aiohttp.ClientSession, username: str, platform: str,
+                            url_template: str, check_type: str,
+                            success_codes: List[int]) -> UsernameResult:
         """Check a single platform for the username."""
         url = url_template.format(username)
         result = UsernameResult(platform=platform, url=url)
+        timeout = aiohttp.ClientTimeout(total=self.timeout)
 
         try:
             start = asyncio.get_event_loop().time()
-            async with aiohttp.ClientSession() as session:
-                headers = {
-                    "User-Agent": "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
-                    "Accept": "text/html,application/xhtml+xml",
-                    "Accept-Language": "en-US,en;q=0.9",
-                }
-                async with session.get(url, timeout=aiohttp.ClientTimeout(total=self.timeout),
-                                       headers=headers, allow_redirects=True, ssl=False) as resp:
-                    elapsed = (asyncio.get_event_loop().time() - start) * 1000
+            if check_type == "content":
+                async with session.get(url, timeout=timeout, allow_redirects=True, ssl=False) as resp:
                     result.status_code = resp.status
-                    result.response_time_ms = elapsed
-
                     if resp.status in success_codes:
-                        if check_type == "content":
-                            # For content-based checks, verify username appears in response
-                            text = await resp.text(errors="replace")
-                            result.exists = username.lower() in text.lower()
-                        else:
-                            result.exists = True
-                    else:
-                        result.exists = False
+                        # For content-based checks, verify username appears in response
+                        rule = MARKER_RULES.get(platform, DEFAULT_MARKER_RULE)
+                        result.exists = await self._scan_body(resp, username, rule)
+            else:
+                result.status_code = await self._probe_status(session, platform, url,
+                                                              success_codes, timeout)
+                result.exists = result.status_code in success_codes
+            result.response_time_ms = (asyncio.get_event_loop().time() - start) * 1000
 
         except asyncio.TimeoutError:
             result.error = "timeout"
@@ -198,3 +277,55 @@ class UsernameChecker:
             result.error = str(e)[:100]
 
         return result
+
+    async def _scan_body(self, resp: aiohttp.ClientResponse, username: str,
+                         rule: MarkerRule) -> bool:
+        """Stream the body until a marker decides the check or max_body_bytes is read."""
+        try:
+            decoder = codecs.getincrementaldecoder(resp.charset or "utf-8")(errors="replace")
+        except LookupError:
+            decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        needle = username.lower()
+        # Keep enough of the previous chunk to catch markers split across chunks
+        overlap = max(len(needle), rule.max_length) - 1
+        tail = ""
+        received = 0
+        # Not-found pages often echo the name, so with not_found markers it only
+        # counts once the whole window has been read without one
+        seen = False
+
+        async for chunk in resp.content.iter_chunked(self.chunk_size):
+            received += len(chunk)
+            final = received >= self.max_body_bytes
+            if final:
+                chunk = chunk[:len(chunk) - (received - self.max_body_bytes)]
+            window = tail + decoder.decode(chunk, final=final)
+            if rule.not_found and rule.not_found.search(window):
+                return False
+            if rule.found:
+                if rule.found.search(window):
+                    return True
+            elif needle in window.lower():
+                if not rule.not_found:
+                    return True
+                seen = True
+            if final:
+                return seen
+            tail = window[-overlap:] if overlap > 0 else ""
+        return seen
+
+    async def _probe_status(self, session: aiohttp.ClientSession, platform: str, url: str,
+                            success_codes: List[int], timeout: aiohttp.ClientTimeout) -> int:
+        """Final status code for url without downloading the page body."""
+        if platform not in self._head_unreliable:
+            async with session.head(url, timeout=timeout, allow_redirects=True, ssl=False) as resp:
+                if resp.status in success_codes or resp.status in self.HEAD_NOT_FOUND_CODES:
+                    return resp.status
+            # 405, 403, 5xx, ...: HEAD isn't telling us, so stop asking this platform
+            self._head_unreliable.add(platform)
+
+        async with session.get(url, timeout=timeout, allow_redirects=True, ssl=False,
+                               headers={"Range": "bytes=0-0"}) as resp:
+            # A honoured range means the page exists just like a 200 would.
+            # Leaving the body unread makes aiohttp drop rather than drain it.
+            return 200 if resp.status == 206 else resp.status
@@ -3,6 +3,15 @@ Web Scraper & Technology Fingerprinter — No API Keys Required
 
 Scrapes websites via direct HTTP requests, extracts metadata, emails,
 social links, and detects technologies from HTML/headers.
+
+Pages are read through a PageCache, so an orchestrated investigation
+shares fetched pages with the other web modules.
+
+HTML is parsed once by lxml in a single streaming pass that feeds every
+element to all extractors (title, meta, language, favicon, social links,
+scripts, Open Graph) without building a tree; BeautifulSoup is the
+fallback when lxml is missing, gives up on a document, or would read it
+differently (markup inside <textarea>).
 """
 
 import asyncio
@@ -13,11 +22,47 @@ from dataclasses import dataclass, field
 from datetime import datetime
 from urllib.parse import urljoin, urlparse
 
-import aiohttp
 from bs4 import BeautifulSoup
 
+try:
+    from lxml import etree
+    HAS_LXML = True
+except ImportError:
+    HAS_LXML = False
+
+from .page_cache import PageCache
+
 logger = logging.getLogger(__name__)
 
+EMAIL_PATTERN = re.compile(r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}')
+EMAIL_FALSE_POSITIVES = ('.png', '.jpg', '.gif', '.css', '.js', '.svg', '.woff')
+PHONE_PATTERNS = [
+    re.compile(r'\+?\d{1,3}[-.\s]?\(?\d{1,4}\)?[-.\s]?\d{1,4}[-.\s]?\d{1,9}'),
+    re.compile(r'tel:([+\d\-\s().]+)'),
+]
+NON_DIGITS = re.compile(r'\D')
+HTML_TAG = re.compile(r'<html[\s/>]', re.IGNORECASE)
+TITLE_ELEMENT = re.compile(r'<title[\s>].*?</title\s*>', re.IGNORECASE | re.DOTALL)
+
+SOCIAL_PATTERNS = {
+    "twitter": [r"twitter\.com/", r"x\.com/"],
+    "facebook": [r"facebook\.com/"],
+    "instagram": [r"instagram\.com/"],
+    "linkedin": [r"linkedin\.com/"],
+    "youtube": [r"youtube\.com/", r"youtu\.be/"],
+    "github": [r"github\.com/"],
+    "tiktok": [r"tiktok\.com/"],
+    "reddit": [r"reddit\.com/"],
+    "discord": [r"discord\.gg/", r"discord\.com/"],
+    "telegram": [r"t\.me/"],
+    "mastodon": [r"mastodon\.", r"fosstodon\.org", r"hachyderm\.io"],
+    "bluesky": [r"bsky\.app/"],
+    "pinterest": [r"pinterest\.com/"],
+    "medium": [r"medium\.com/"],
+}
+SOCIAL_REGEXES = {platform: [re.compile(p) for p in patterns]
+                  for platform, patterns in SOCIAL_PATTERNS.items()}
+
 
 # Technology signatures: (category, name, detection_patterns)
 TECH_SIGNATURES = {
@@ -90,6 +135,114 @@ class WebPage:
         return {k: v for k, v in self.__dict__.items() if v}
 
 
+class ElementExtractor:
+    """
+    lxml parser target that feeds each element to all extractors as it streams by.
+
+    Mirrors the BeautifulSoup extractors: first <title>, every <meta>, the
+    first icon <link>, social <a href> links, <script src> and og: properties.
+
+    Where lxml and html.parser disagree:
+    - markup inside <textarea> is text to lxml but elements to html.parser;
+      the extractor flags it (markup_in_textarea) and the caller re-parses
+      the page with BeautifulSoup
+    - a repeated attribute keeps its first value here and its last one in
+      BeautifulSoup; such (invalid) tags are rare and detecting them would
+      cost more than the parse, so this difference is accepted
+    """
+
+    def __init__(self, page: WebPage, base_url: str, source: str = ""):
+        self.page = page
+        self.base_url = base_url
+        self.source = source
+        self._html_attrs: Optional[Dict[str, str]] = None
+        self._favicon_seen = False
+        self._title_seen = False
+        self._title_chunks: Optional[List[str]] = None
+        self._in_textarea = False
+        self.markup_in_textarea = False
+
+    def start(self, tag: str, attrib):
+        page = self.page
+        if tag == "meta":
+            name = attrib.get("name", attrib.get("property", "")).lower()
+            content = attrib.get("content", "")
+            if name and content:
+                page.meta_tags[name] = content
+                if name == "description":
+                    page.description = content
+                elif name == "generator":
+                    page.generator = content
+            prop = attrib.get("property")
+            if prop and prop.startswith("og:") and content:
+                page.open_graph[prop[3:]] = content
+        elif tag == "a":
+            href = attrib.get("href")
+            if href is not None:
+                href_lower = href.lower()
+                for platform, patterns in SOCIAL_REGEXES.items():
+                    for pattern in patterns:
+                        if pattern.search(href_lower):
+                            page.social_links[platform] = href
+                            break
+        elif tag == "script":
+            src = attrib.get("src")
+            if src is not None:
+                page.scripts.append(urljoin(self.base_url, src))
+        elif tag == "link":
+            if not self._favicon_seen and "icon" in attrib.get("rel", "").lower():
+                self._favicon_seen = True
+                if attrib.get("href"):
+                    page.favicon_url = urljoin(self.base_url, attrib["href"])
+        elif tag == "title":
+            if not self._title_seen:
+                self._title_seen = True
+                self._title_chunks = []
+        elif tag == "html":
+            if self._html_attrs is None:
+                self._html_attrs = dict(attrib)
+        elif tag == "textarea":
+            self._in_textarea = True
+
+    def end(self, tag: str):
+        if tag == "title" and self._title_chunks is not None:
+            text = "".join(self._title_chunks)
+            # lxml keeps markup inside <title> as text where html.parser parses
+            # it, so titles with a "<" are re-read from the source element
+            match = TITLE_ELEMENT.search(self.source) if "<" in text else None
+            if match:
+                self.page.title = BeautifulSoup(match.group(), "html.parser").get_text(strip=True)
+            else:
+                self.page.title = text.strip()
+            self._title_chunks = None
+        elif tag == "textarea":
+            self._in_textarea = False
+
+    def data(self, data: str):
+        if self._title_chunks is not None:
+            self._title_chunks.append(data)
+        elif self._in_textarea and "<" in data:
+            self.markup_in_textarea = True
+
+    def close(self) -> WebPage:
+        return self.page
+
+    def finish(self, page: WebPage, has_html_tag: bool):
+        """Copy extracted fields onto page (only after a successful parse)."""
+        extracted = self.page
+        page.title = extracted.title
+        page.description = extracted.description
+        page.meta_tags.update(extracted.meta_tags)
+        page.generator = extracted.generator
+        page.favicon_url = extracted.favicon_url
+        page.social_links.update(extracted.social_links)
+        page.scripts.extend(extracted.scripts)
+        page.open_graph.update(extracted.open_graph)
+        # lxml always reports an <html> element, even when the source has none
+        if self._html_attrs is not None and (self._html_attrs or has_html_tag):
+            page.language = self._html_attrs.get("lang", "")
+
+
 class WebScraper:
     """Web intelligence via direct HTTP requests + HTML parsing."""
 
@@ -98,67 +251,86 @@ class WebScraper:
         self.max_redirects = max_redirects
         self.logger = logging.getLogger(f"{__name__}.WebScraper")
 
-    async def analyze(self, url: str, progress_callback=None) -> WebPage:
+    async def analyze(self, url: str, progress_callback=None,
+                      page_cache: Optional[PageCache] = None) -> WebPage:
         """Full web analysis: fetch page, extract metadata, detect technologies."""
         if not url.startswith(("http://", "https://")):
             url = f"https://{url}"
 
         page = WebPage(url=url)
+        pages = page_cache or PageCache(timeout=self.timeout, max_redirects=self.max_redirects)
 
         try:
             if progress_callback:
                 progress_callback("Web: Fetching page", 10)
 
-            async with aiohttp.ClientSession() as session:
-                headers = {
-                    "User-Agent": "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
-                    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
-                    "Accept-Language": "en-US,en;q=0.9",
-                }
-                async with session.get(url, timeout=aiohttp.ClientTimeout(total=self.timeout),
-                                       headers=headers, max_redirects=self.max_redirects,
-                                       ssl=False) as resp:
-                    page.status_code = resp.status
-                    page.headers = {k.lower(): v for k, v in resp.headers.items()}
-                    html = await resp.text(errors="replace")
+            fetched = await pages.fetch(url)
+            page.status_code = fetched.status
+            page.headers = dict(fetched.headers)
+            html = fetched.text()
 
-                # Parse HTML
-                if progress_callback:
-                    progress_callback("Web: Analyzing content", 40)
+            # Parse HTML
+            if progress_callback:
+                progress_callback("Web: Analyzing content", 40)
 
-                soup = BeautifulSoup(html, "html.parser")
-                self._extract_metadata(soup, page, url)
-                self._extract_emails(html, page)
-                self._extract_phones(html, page)
-                self._extract_social_links(soup, page, url)
-                self._extract_scripts(soup, page, url)
-                self._extract_open_graph(soup, page)
+            # Parsing is CPU-bound; keep it off the event loop
+            await asyncio.get_event_loop().run_in_executor(
+                None, self._extract_content, html, page, url)
 
-                if progress_callback:
-                    progress_callback("Web: Detecting technologies", 60)
+            if progress_callback:
+                progress_callback("Web: Detecting technologies", 60)
 
-                self._detect_technologies(html, page, resp)
+            self._detect_technologies(html, page, fetched)
 
-                if progress_callback:
-                    progress_callback("Web: Checking security headers", 75)
+            if progress_callback:
+                progress_callback("Web: Checking security headers", 75)
 
-                self._analyze_security_headers(page)
+            self._analyze_security_headers(page)
 
-                # Fetch robots.txt
-                if progress_callback:
-                    progress_callback("Web: Fetching robots.txt", 85)
+            # Fetch robots.txt
+            if progress_callback:
+                progress_callback("Web: Fetching robots.txt", 85)
 
-                await self._fetch_robots(session, url, page)
+            await self._fetch_robots(pages, url, page)
 
         except Exception as e:
             page.errors.append(f"Web analysis failed: {str(e)}")
             self.logger.warning(f"Web analysis failed for {url}: {e}")
 
+        finally:
+            if page_cache is None:
+                await pages.close()
+
         if progress_callback:
             progress_callback("Web: Complete", 100)
 
         return page
 
+    def _extract_content(self, html: str, page: WebPage, base_url: str):
+        """Run every extractor over the page: one parse, one traversal."""
+        parsed = False
+        if HAS_LXML and html.strip():
+            extractor = ElementExtractor(WebPage(url=page.url), base_url, source=html)
+            try:
+                parser = etree.HTMLParser(target=extractor)
+                parser.feed(html)
+                parser.close()
+                parsed = not extractor.markup_in_textarea
+            except Exception as e:
+                self.logger.debug(f"lxml extraction failed for {base_url}, using BeautifulSoup: {e}")
+            if parsed:
+                extractor.finish(page, has_html_tag=bool(HTML_TAG.search(html)))
+
+        if not parsed:
+            soup = BeautifulSoup(html, "html.parser")
+            self._extract_metadata(soup, page, base_url)
+            self._extract_social_links(soup, page, base_url)
+            self._extract_scripts(soup, page, base_url)
+            self._extract_open_graph(soup, page)
+
+        self._extract_emails(html, page)
+        self._extract_phones(html, page)
+
     def _extract_metadata(self, soup: BeautifulSoup, page: WebPage, base_url: str):
         # Title
         title_tag = soup.find("title")
@@ -189,51 +361,29 @@ class WebScraper:
 
     def _extract_emails(self, html: str, page: WebPage):
         emails = set()
-        # Standard email pattern
-        pattern = r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}'
-        for match in re.finditer(pattern, html):
+        for match in EMAIL_PATTERN.finditer(html):
             email = match.group().lower()
             # Filter out common false positives
-            if not any(email.endswith(ext) for ext in ['.png', '.jpg', '.gif', '.css', '.js', '.svg', '.woff']):
+            if not email.endswith(EMAIL_FALSE_POSITIVES):
                 emails.add(email)
         page.emails = sorted(emails)
 
     def _extract_phones(self, html: str, page: WebPage):
         phones = set()
-        patterns = [
-            r'\+?\d{1,3}[-.\s]?\(?\d{1,4}\)?[-.\s]?\d{1,4}[-.\s]?\d{1,9}',
-            r'tel:([+\d\-\s().]+)',
-        ]
-        for pattern in patterns:
-            for match in re.finditer(pattern, html):
+        for pattern in PHONE_PATTERNS:
+            for match in pattern.finditer(html):
                 phone = match.group().strip()
-                digits = re.sub(r'\D', '', phone)
+                digits = NON_DIGITS.sub('', phone)
                 if 7 <= len(digits) <= 15:
                     phones.add(phone)
         page.phones = sorted(phones)[:20]  # Cap at 20
 
     def _extract_social_links(self, soup: BeautifulSoup, page: WebPage, base_url: str):
-        social_patterns = {
-            "twitter": [r"twitter\.com/", r"x\.com/"],
-            "facebook": [r"facebook\.com/"],
-            "instagram": [r"instagram\.com/"],
-            "linkedin": [r"linkedin\.com/"],
-            "youtube": [r"youtube\.com/", r"youtu\.be/"],
-            "github": [r"github\.com/"],
-            "tiktok": [r"tiktok\.com/"],
-            "reddit": [r"reddit\.com/"],
-            "discord": [r"discord\.gg/", r"discord\.com/"],
-            "telegram": [r"t\.me/"],
-            "mastodon": [r"mastodon\.", r"fosstodon\.org", r"hachyderm\.io"],
-            "bluesky": [r"bsky\.app/"],
-            "pinterest": [r"pinterest\.com/"],
-            "medium": [r"medium\.com/"],
-        }
         for link in soup.find_all("a", href=True):
             href = link["href"].lower()
-            for platform, patterns in social_patterns.items():
+            for platform, patterns in SOCIAL_REGEXES.items():
                 for pattern in patterns:
-                    if re.search(pattern, href):
+                    if pattern.search(href):
                         page.social_links[platform] = link["href"]
                         break
 
@@ -316,16 +466,16 @@ class WebScraper:
             "checks": security_checks,
         }
 
-    async def _fetch_robots(self, session: aiohttp.ClientSession, url: str, page: WebPage):
+    async def _fetch_robots(self, pages: PageCache, url: str, page: WebPage):
         parsed = urlparse(url)
         robots_url = f"{parsed.scheme}://{parsed.netloc}/robots.txt"
         try:
-            async with session.get(robots_url, timeout=aiohttp.ClientTimeout(total=5), ssl=False) as resp:
-                if resp.status == 200:
-                    page.robots_txt = await resp.text(errors="replace")
-                    # Extract sitemaps
-                    for line in page.robots_txt.split("\n"):
-                        if line.lower().startswith("sitemap:"):
-                            page.sitemap_urls.append(line.split(":", 1)[1].strip())
+            robots = await pages.fetch(robots_url, timeout=5)
+            if robots.status == 200:
+                page.robots_txt = robots.text()
+                # Extract sitemaps
+                for line in page.robots_txt.split("\n"):
+                    if line.lower().startswith("sitemap:"):
+                        page.sitemap_urls.append(line.split(":", 1)[1].strip())
         except Exception:
             pass
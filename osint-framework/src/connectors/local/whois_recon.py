@@ -6,16 +6,23 @@ Extracts registration data, contacts, and network ownership.
 
 Free data sources:
 - Direct WHOIS protocol (port 43)
-- ip-api.com (free, 45 req/min) for IP geolocation
+- ip-api.com (free, 45 req/min; /batch takes 100 IPs per request) for IP geolocation
 - ipinfo.io/widget (free, no key for basic data)
+
+python-whois is blocking, so lookups run on a small dedicated thread pool
+(never the loop's default executor that DNS relies on) and are cached
+persistently per registrable domain.
 """
 
 import asyncio
+import copy
 import socket
 import logging
 import re
-from typing import Dict, List, Any, Optional
-from dataclasses import dataclass, field
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Any, Optional, Iterable, Tuple
+from dataclasses import dataclass, field, asdict
 from datetime import datetime
 
 try:
@@ -24,10 +31,41 @@ try:
 except ImportError:
     HAS_WHOIS = False
 
+try:
+    import tldextract
+    HAS_TLDEXTRACT = True
+except ImportError:
+    HAS_TLDEXTRACT = False
+
 import aiohttp
 
+from .recon_cache import ReconCache
+
 logger = logging.getLogger(__name__)
 
+IP_API_URL = "http://ip-api.com"
+IP_API_FIELDS = "status,message,country,regionName,city,lat,lon,timezone,isp,org,as,reverse,query"
+IP_API_BATCH_SIZE = 100  # ip-api.com /batch limit
+
+# Second-level labels that act as public suffixes (fallback when tldextract is missing)
+MULTI_LABEL_SUFFIXES = {"co", "com", "net", "org", "gov", "edu", "ac", "govt", "geek", "school", "ltd", "plc"}
+
+
+def registrable_domain(domain: str) -> str:
+    """Reduce a host name to its registrable domain (eTLD+1)."""
+    domain = domain.strip().lower().rstrip(".")
+    domain = domain.replace("https://", "").replace("http://", "").split("/")[0]
+    if HAS_TLDEXTRACT:
+        ext = tldextract.extract(domain)
+        if ext.domain and ext.suffix:
+            return f"{ext.domain}.{ext.suffix}"
+    labels = domain.split(".")
+    if len(labels) <= 2:
+        return domain
+    if len(labels[-1]) == 2 and labels[-2] in MULTI_LABEL_SUFFIXES:
+        return ".".join(labels[-3:])
+    return ".".join(labels[-2:])
+
 
 @dataclass
 class WhoisData:
@@ -85,17 +123,55 @@ class IPInfo:
 class WhoisRecon:
     """WHOIS and IP intelligence — free, no API keys required."""
 
-    def __init__(self, timeout: float = 10.0):
+    def __init__(self, timeout: float = 10.0, ip_cache_ttl: float = 86400.0,
+                 max_concurrent_batches: int = 2, whois_workers: int = 4,
+                 whois_cache_ttl: float = 7 * 86400.0,
+                 whois_cache: Optional[ReconCache] = None):
         self.timeout = timeout
+        self.ip_cache_ttl = ip_cache_ttl
+        self.max_concurrent_batches = max_concurrent_batches
+        # ip -> (expires_at monotonic, IPInfo)
+        self._ip_cache: Dict[str, Tuple[float, IPInfo]] = {}
+        # WHOIS: bounded pool, persistent cache, merged in-flight lookups
+        self.whois_cache_ttl = whois_cache_ttl
+        self._whois_executor = ThreadPoolExecutor(max_workers=whois_workers,
+                                                  thread_name_prefix="whois")
+        self._whois_cache = whois_cache
+        if self._whois_cache is None and whois_cache_ttl > 0:
+            self._whois_cache = ReconCache("whois")
+        self._whois_inflight: Dict[str, asyncio.Future] = {}
         self.logger = logging.getLogger(f"{__name__}.WhoisRecon")
 
     async def domain_whois(self, domain: str) -> WhoisData:
-        """Perform WHOIS lookup on a domain."""
+        """
+        Perform WHOIS lookup on a domain.
+
+        Results are cached per registrable domain for whois_cache_ttl, and
+        concurrent lookups of the same registrable domain share one query.
+        """
+        key = registrable_domain(domain)
+
+        cached = self._whois_cache.get(key) if self._whois_cache else None
+        if cached is not None:
+            return WhoisData(**{**cached, "domain": domain})
+
+        future = self._whois_inflight.get(key)
+        if future is None:
+            future = asyncio.ensure_future(self._lookup_whois(key))
+            self._whois_inflight[key] = future
+            future.add_done_callback(lambda _: self._whois_inflight.pop(key, None))
+
+        # Shield so one cancelled caller doesn't cancel the shared lookup
+        data = await asyncio.shield(future)
+        return WhoisData(**{**copy.deepcopy(data), "domain": domain})
+
+    async def _lookup_whois(self, domain: str) -> Dict[str, Any]:
+        """Run python-whois on the WHOIS pool and cache successful answers."""
         data = WhoisData(domain=domain)
 
         try:
             result = await asyncio.get_event_loop().run_in_executor(
-                None, self._sync_whois, domain
+                self._whois_executor, self._sync_whois, domain
             )
             if result:
                 data.registrar = self._safe_str(result.get("registrar"))
@@ -134,7 +210,10 @@ class WhoisRecon:
             data.errors.append(f"WHOIS lookup failed: {str(e)}")
             self.logger.warning(f"WHOIS failed for {domain}: {e}")
 
-        return data
+        record = asdict(data)
+        if self._whois_cache and not data.errors:
+            self._whois_cache.set(domain, record, self.whois_cache_ttl)
+        return record
 
     def _sync_whois(self, domain: str):
         if not HAS_WHOIS:
@@ -143,32 +222,90 @@ class WhoisRecon:
 
     async def ip_lookup(self, ip: str) -> IPInfo:
         """Free IP geolocation via ip-api.com (no API key, 45 req/min)."""
-        info = IPInfo(ip=ip)
+        results = await self.lookup_ips([ip])
+        return results[ip.strip()]
+
+    async def lookup_ips(self, ips: Iterable[str]) -> Dict[str, IPInfo]:
+        """
+        Enrich many IPs at once via the ip-api.com batch endpoint.
+
+        IPs are deduplicated and served from the per-IP TTL cache where
+        possible; the rest are sent in chunks of 100 over one session, so
+        enriching a whole attack surface costs a couple of requests.
+        """
+        unique = list(dict.fromkeys(ip.strip() for ip in ips if ip and ip.strip()))
+        results: Dict[str, IPInfo] = {}
+        now = time.monotonic()
+
+        missing = []
+        for ip in unique:
+            cached = self._ip_cache.get(ip)
+            if cached and cached[0] > now:
+                results[ip] = cached[1]
+            else:
+                missing.append(ip)
+
+        if missing:
+            chunks = [missing[i:i + IP_API_BATCH_SIZE]
+                      for i in range(0, len(missing), IP_API_BATCH_SIZE)]
+            semaphore = asyncio.Semaphore(self.max_concurrent_batches)
+
+            async def run_chunk(session, chunk):
+                async with semaphore:
+                    return await self._fetch_ip_batch(session, chunk)
 
-        try:
             async with aiohttp.ClientSession() as session:
-                url = f"http://ip-api.com/json/{ip}?fields=status,message,country,regionName,city,lat,lon,timezone,isp,org,as,reverse,query"
-                async with session.get(url, timeout=aiohttp.ClientTimeout(total=self.timeout)) as resp:
-                    if resp.status == 200:
-                        data = await resp.json()
-                        if data.get("status") == "success":
-                            info.city = data.get("city")
-                            info.region = data.get("regionName")
-                            info.country = data.get("country")
-                            info.org = data.get("org")
-                            info.isp = data.get("isp")
-                            info.asn = data.get("as")
-                            info.lat = data.get("lat")
-                            info.lon = data.get("lon")
-                            info.timezone = data.get("timezone")
-                            info.reverse_dns = data.get("reverse")
-                        else:
-                            info.errors.append(data.get("message", "Unknown error"))
+                batches = await asyncio.gather(*[run_chunk(session, c) for c in chunks])
+
+            expires_at = time.monotonic() + self.ip_cache_ttl
+            for batch in batches:
+                for ip, info in batch.items():
+                    results[ip] = info
+                    # Transport failures are retried next time; upstream
+                    # answers (including "private range") are cached.
+                    if not any(e.startswith("IP lookup failed") for e in info.errors):
+                        self._ip_cache[ip] = (expires_at, info)
+
+        return results
+
+    async def _fetch_ip_batch(self, session: aiohttp.ClientSession,
+                              ips: List[str]) -> Dict[str, IPInfo]:
+        """POST up to 100 IPs to ip-api.com/batch and parse the answers."""
+        infos = {ip: IPInfo(ip=ip) for ip in ips}
+
+        try:
+            url = f"{IP_API_URL}/batch?fields={IP_API_FIELDS}"
+            async with session.post(url, json=ips,
+                                    timeout=aiohttp.ClientTimeout(total=self.timeout)) as resp:
+                if resp.status == 200:
+                    # Answers come back in request order
+                    answers = await resp.json()
+                    for ip, data in zip(ips, answers or []):
+                        self._apply_ip_api(infos[ip], data)
+                else:
+                    for info in infos.values():
+                        info.errors.append(f"IP lookup failed: ip-api.com returned status {resp.status}")
         except Exception as e:
-            info.errors.append(f"IP lookup failed: {str(e)}")
-            self.logger.warning(f"IP lookup failed for {ip}: {e}")
+            for info in infos.values():
+                info.errors.append(f"IP lookup failed: {str(e)}")
+            self.logger.warning(f"IP batch lookup failed for {len(ips)} IPs: {e}")
+
+        return infos
 
-        return info
+    def _apply_ip_api(self, info: IPInfo, data: Dict[str, Any]):
+        if data.get("status") == "success":
+            info.city = data.get("city")
+            info.region = data.get("regionName")
+            info.country = data.get("country")
+            info.org = data.get("org")
+            info.isp = data.get("isp")
+            info.asn = data.get("as")
+            info.lat = data.get("lat")
+            info.lon = data.get("lon")
+            info.timezone = data.get("timezone")
+            info.reverse_dns = data.get("reverse")
+        else:
+            info.errors.append(data.get("message", "Unknown error"))
 
     def _safe_str(self, value) -> Optional[str]:
         if value is None:
@@ -0,0 +1,270 @@
+"""
+Batch Runner — Portfolio Investigations
+
+Runs the orchestrator over many targets with one shared set of modules:
+
+- a fixed pool of workers pulls configs from a queue, so memory and open
+  sockets scale with max_concurrent rather than with the number of targets
+- per-stage limits apply across all in-flight investigations
+- the DNS resolver cache, WHOIS/IP caches and one pooled HTTP session are
+  shared by every target; each investigation still gets its own page cache
+- each InvestigationResult is written to disk as soon as it finishes, with
+  one summary line per target appended to an NDJSON index
+- with incremental=True, a target's previous result file seeds its next run
+  and only stale stages are repeated (daily monitoring of a fixed list)
+
+CLI:
+    python -m src.core.batch domains.txt -o reports/batch -c 8 --limit port_scan=2
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import re
+import time
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Callable, Iterable
+from dataclasses import dataclass, field
+
+import aiohttp
+
+from src.core.orchestrator import (
+    InvestigationOrchestrator, InvestigationConfig, InvestigationResult, EntityType
+)
+
+try:
+    import dns.resolver
+    HAS_DNSPYTHON = True
+except ImportError:
+    HAS_DNSPYTHON = False
+
+logger = logging.getLogger(__name__)
+
+# Cross-target caps for the heaviest stages (override with stage_limits)
+DEFAULT_STAGE_LIMITS = {
+    "port_scan": 4,
+    "cert_transparency": 4,
+    "whois_lookup": 8,
+}
+
+
+@dataclass
+class BatchStats:
+    """Running totals for one batch."""
+    total: int = 0
+    completed: int = 0
+    failed: int = 0
+    started: float = field(default_factory=time.monotonic)
+    finished: Optional[float] = None
+
+    @property
+    def elapsed_seconds(self) -> float:
+        return (self.finished or time.monotonic()) - self.started
+
+    @property
+    def targets_per_minute(self) -> float:
+        elapsed = self.elapsed_seconds
+        return self.completed * 60.0 / elapsed if elapsed > 0 else 0.0
+
+    @property
+    def eta_seconds(self) -> Optional[float]:
+        if not self.completed:
+            return None
+        return (self.total - self.completed) * self.elapsed_seconds / self.completed
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "total": self.total,
+            "completed": self.completed,
+            "failed": self.failed,
+            "elapsed_seconds": round(self.elapsed_seconds, 2),
+            "targets_per_minute": round(self.targets_per_minute, 2),
+        }
+
+
+def result_filename(target: str) -> str:
+    """Filesystem-safe report name for a target."""
+    return re.sub(r"[^A-Za-z0-9._-]+", "_", target).strip("._")[:120] or "target"
+
+
+class BatchRunner:
+    """Run many investigations through one orchestrator with shared caches."""
+
+    def __init__(self, output_dir: str, max_concurrent: int = 8,
+                 stage_limits: Optional[Dict[str, int]] = None,
+                 connection_limit: int = 100, dns_cache_size: int = 50000,
+                 incremental: bool = False,
+                 orchestrator: Optional[InvestigationOrchestrator] = None):
+        self.output_dir = Path(output_dir)
+        self.max_concurrent = max(max_concurrent, 1)
+        self.stage_limits = {**DEFAULT_STAGE_LIMITS, **(stage_limits or {})}
+        self.connection_limit = connection_limit
+        self.dns_cache_size = dns_cache_size
+        self.incremental = incremental
+        self.orchestrator = orchestrator
+        self._cancelled = False
+        self.logger = logging.getLogger(f"{__name__}.BatchRunner")
+
+    def cancel(self):
+        """Stop starting new targets and cancel the running ones."""
+        self._cancelled = True
+        if self.orchestrator:
+            self.orchestrator.cancel()
+
+    async def run(self, configs: Iterable[InvestigationConfig],
+                  progress_callback: Optional[Callable] = None) -> BatchStats:
+        """
+        Investigate every config and write its result under output_dir.
+
+        Args:
+            configs: One InvestigationConfig per target
+            progress_callback: Called with (stats: BatchStats, result: InvestigationResult)
+                after each target finishes
+        """
+        configs = list(configs)
+        self._cancelled = False
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        index_path = self.output_dir / "index.ndjson"
+        stats = BatchStats(total=len(configs))
+
+        queue: asyncio.Queue = asyncio.Queue()
+        for config in configs:
+            queue.put_nowait(config)
+
+        connector = aiohttp.TCPConnector(limit=self.connection_limit, ttl_dns_cache=300)
+        async with aiohttp.ClientSession(connector=connector) as session:
+            orchestrator = self._prepare_orchestrator(session)
+            with open(index_path, "a", encoding="utf-8") as index:
+
+                async def worker():
+                    while not self._cancelled:
+                        try:
+                            config = queue.get_nowait()
+                        except asyncio.QueueEmpty:
+                            return
+                        previous = self._result_path(config.target) if self.incremental else None
+                        result = await orchestrator.run_investigation(
+                            config, previous=str(previous) if previous and previous.exists() else None)
+                        stats.completed += 1
+                        if any(e.startswith("Investigation failed") for e in result.errors):
+                            stats.failed += 1
+                        try:
+                            await self._write_result(result, index)
+                        except OSError as e:
+                            stats.failed += 1
+                            self.logger.error(f"Could not write result for {config.target}: {e}")
+                        self.logger.info(
+                            f"[{stats.completed}/{stats.total}] {config.target} "
+                            f"in {result.duration_seconds:.1f}s "
+                            f"({stats.targets_per_minute:.1f} targets/min)")
+                        if progress_callback:
+                            progress_callback(stats, result)
+
+                workers = min(self.max_concurrent, len(configs))
+                try:
+                    await asyncio.gather(*(worker() for _ in range(workers)))
+                finally:
+                    orchestrator.session = None
+
+        stats.finished = time.monotonic()
+        summary = stats.to_dict()
+        (self.output_dir / "batch_summary.json").write_text(json.dumps(summary, indent=2))
+        self.logger.info(f"Batch complete: {summary}")
+        return stats
+
+    def _prepare_orchestrator(self, session: aiohttp.ClientSession) -> InvestigationOrchestrator:
+        """Point the (shared) orchestrator at this batch's session, limits and caches."""
+        if self.orchestrator is None:
+            self.orchestrator = InvestigationOrchestrator()
+        orchestrator = self.orchestrator
+        orchestrator.set_stage_limits(self.stage_limits)
+        orchestrator.session = session
+        resolver = getattr(orchestrator.dns, "resolver", None)
+        if HAS_DNSPYTHON and resolver is not None and resolver.cache is None:
+            resolver.cache = dns.resolver.LRUCache(self.dns_cache_size)
+        return orchestrator
+
+    def _result_path(self, target: str) -> Path:
+        return self.output_dir / f"{result_filename(target)}.json"
+
+    async def _write_result(self, result: InvestigationResult, index):
+        """Write one result file and its index line without blocking the loop."""
+        path = self._result_path(result.target)
+        line = json.dumps({
+            "target": result.target,
+            "file": path.name,
+            "duration_seconds": round(result.duration_seconds, 2),
+            "risk_score": result.risk_score,
+            "entities": len(result.entities),
+            "errors": len(result.errors),
+            "refreshed": result.refreshed_sections,
+            "reused": result.reused_sections,
+        })
+
+        def write():
+            path.write_text(result.to_json(), encoding="utf-8")
+            index.write(line + "\n")
+            index.flush()
+
+        await asyncio.get_event_loop().run_in_executor(None, write)
+
+
+def read_targets(path: str) -> List[str]:
+    """Targets from a file, one per line; blank lines and # comments are skipped."""
+    targets = []
+    for line in Path(path).read_text(encoding="utf-8").splitlines():
+        line = line.split("#", 1)[0].strip()
+        if line:
+            targets.append(line)
+    return list(dict.fromkeys(targets))
+
+
+def _parse_limits(values: List[str]) -> Dict[str, int]:
+    limits = {}
+    for value in values:
+        stage, _, limit = value.partition("=")
+        if not limit.isdigit():
+            raise argparse.ArgumentTypeError(f"expected STAGE=N, got {value!r}")
+        limits[stage.strip()] = int(limit)
+    return limits
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Run investigations over a list of targets.")
+    parser.add_argument("targets", help="file with one target per line")
+    parser.add_argument("-o", "--output-dir", default="reports/batch")
+    parser.add_argument("-t", "--type", default=EntityType.DOMAIN.value,
+                        choices=[t.value for t in EntityType], help="entity type of every target")
+    parser.add_argument("-c", "--concurrency", type=int, default=8,
+                        help="investigations in flight at once")
+    parser.add_argument("--limit", action="append", default=[], metavar="STAGE=N",
+                        help="cap a stage across all investigations, e.g. port_scan=2")
+    parser.add_argument("--full-ports", action="store_true", help="scan the full port list")
+    parser.add_argument("--no-ports", action="store_true")
+    parser.add_argument("--no-subdomains", action="store_true")
+    parser.add_argument("--no-emails", action="store_true")
+    parser.add_argument("--incremental", action="store_true",
+                        help="reuse fresh stages from the previous result in the output dir")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(name)s: %(message)s")
+    configs = [
+        InvestigationConfig(
+            target=target,
+            entity_type=EntityType(args.type),
+            run_ports=not args.no_ports,
+            port_scan_quick=not args.full_ports,
+            subdomain_scan=not args.no_subdomains,
+            run_emails=not args.no_emails,
+        )
+        for target in read_targets(args.targets)
+    ]
+    runner = BatchRunner(args.output_dir, max_concurrent=args.concurrency,
+                         stage_limits=_parse_limits(args.limit), incremental=args.incremental)
+    stats = asyncio.run(runner.run(configs))
+    print(json.dumps(stats.to_dict(), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -2,18 +2,27 @@
 Investigation Orchestrator — Central Pipeline Controller
 
 Chains all recon modules and pipeline stages into a complete investigation.
+Recon stages are declared as a dependency graph and run concurrently, each
+within a time budget, so an investigation takes about as long as its
+longest chain of dependent stages. Given a previous result, only stages
+whose data is older than their freshness TTL are run again.
 Designed to be driven by the desktop UI via signals/callbacks.
 Runs asynchronously so the UI thread stays responsive.
 """
 
 import asyncio
+import contextlib
+import copy
+import ipaddress
 import logging
 import json
-from typing import Dict, List, Any, Optional, Callable
+from typing import Dict, List, Any, Optional, Callable, Awaitable, Tuple, Union
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
 
+import aiohttp
+
 from src.connectors.local.dns_recon import DNSRecon
 from src.connectors.local.whois_recon import WhoisRecon
 from src.connectors.local.port_scanner import PortScanner
@@ -23,6 +32,7 @@ from src.connectors.local.username_checker import UsernameChecker
 from src.connectors.local.email_harvester import EmailHarvester
 from src.connectors.local.tech_fingerprinter import TechFingerprinter
 from src.connectors.local.person_recon import PersonRecon
+from src.connectors.local.page_cache import PageCache
 
 logger = logging.getLogger(__name__)
 
@@ -52,6 +62,50 @@ class EntityType(Enum):
     ORGANIZATION = "organization"
 
 
+# Default time budget per stage node, in seconds (override via InvestigationConfig.stage_budgets)
+DEFAULT_STAGE_BUDGETS = {
+    "dns_recon": 300.0,
+    "whois_lookup": 60.0,
+    "ip_enrichment": 60.0,
+    "port_scan": 600.0,
+    "cert_transparency": 120.0,
+    "web_analysis": 120.0,
+    "email_harvest": 300.0,
+    "email_validation": 60.0,
+    "username_check": 300.0,
+}
+
+# How long each stage's data stays fresh for incremental re-runs, in seconds
+# (override via InvestigationConfig.freshness_ttls; 0 always reruns the stage)
+DEFAULT_FRESHNESS_TTLS = {
+    "dns_recon": 6 * 3600.0,
+    "whois_lookup": 7 * 86400.0,
+    "ip_enrichment": 86400.0,
+    "port_scan": 86400.0,
+    "cert_transparency": 86400.0,
+    "web_analysis": 86400.0,
+    "email_harvest": 3 * 86400.0,
+    "email_validation": 86400.0,
+    "username_check": 3 * 86400.0,
+    "person_search": 7 * 86400.0,
+}
+
+# InvestigationResult fields written by the recon stages
+MODULE_SECTIONS = ("dns", "whois", "ip_info", "ip_enrichment", "ports", "certificates",
+                   "web", "emails", "usernames", "person_data")
+
+
+@dataclass
+class StageNode:
+    """One stage of an investigation's dependency graph."""
+    name: str
+    run: Callable[[], Awaitable[None]]
+    message: str
+    stage: Optional[InvestigationStage] = None  # None = no stage_callback updates
+    depends_on: Tuple[str, ...] = ()
+    error_label: str = ""  # prefix for "<label> failed: ..." errors
+
+
 @dataclass
 class InvestigationConfig:
     """Configuration for an investigation."""
@@ -74,6 +128,10 @@ class InvestigationConfig:
     person_name: str = ""
     date_of_birth: str = ""
     location: str = ""
+    # Stage scheduling
+    max_parallel_stages: int = 4
+    stage_budgets: Dict[str, float] = field(default_factory=dict)  # stage name -> seconds
+    freshness_ttls: Dict[str, float] = field(default_factory=dict)  # stage name -> seconds
     # Output
     case_name: str = ""
     output_dir: str = ""
@@ -92,6 +150,7 @@ class InvestigationResult:
     dns: Dict[str, Any] = field(default_factory=dict)
     whois: Dict[str, Any] = field(default_factory=dict)
     ip_info: Dict[str, Any] = field(default_factory=dict)
+    ip_enrichment: Dict[str, Dict[str, Any]] = field(default_factory=dict)
     ports: Dict[str, Any] = field(default_factory=dict)
     certificates: Dict[str, Any] = field(default_factory=dict)
     web: Dict[str, Any] = field(default_factory=dict)
@@ -106,6 +165,10 @@ class InvestigationResult:
     risk_factors: List[Dict[str, Any]] = field(default_factory=list)
     summary: str = ""
     errors: List[str] = field(default_factory=list)
+    # Incremental runs: when each stage's data was collected, and what this run did
+    section_times: Dict[str, str] = field(default_factory=dict)
+    refreshed_sections: List[str] = field(default_factory=list)
+    reused_sections: List[str] = field(default_factory=list)
 
     def to_dict(self) -> Dict[str, Any]:
         return {k: v for k, v in self.__dict__.items() if v}
@@ -113,6 +176,107 @@ class InvestigationResult:
     def to_json(self, indent: int = 2) -> str:
         return json.dumps(self.to_dict(), indent=indent, default=str)
 
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "InvestigationResult":
+        return cls(**{k: v for k, v in data.items() if k in cls.__dataclass_fields__})
+
+    @classmethod
+    def load(cls, path: str) -> "InvestigationResult":
+        """Read a result saved with to_json (batch output, .osint case files)."""
+        with open(path, "r", encoding="utf-8") as f:
+            return cls.from_dict(json.load(f))
+
+
+# Entity types whose values compare case-insensitively and without a trailing dot
+DOMAIN_LIKE_TYPES = {"domain", "subdomain", "nameserver", "mail_server", "email"}
+
+
+def normalize_entity_value(entity_type: str, value: Any) -> str:
+    """Canonical form of an entity value for deduplication."""
+    value = " ".join(str(value).split())
+    if entity_type == "ip":
+        try:
+            return ipaddress.ip_address(value).compressed
+        except ValueError:
+            return value.lower()
+    if entity_type in DOMAIN_LIKE_TYPES:
+        return value.lower().rstrip(".")
+    if entity_type == "social_profile":
+        return value.rstrip("/").lower()
+    return value.casefold()
+
+
+@dataclass(frozen=True)
+class Relationship:
+    """A typed edge between two entity IDs."""
+    source: int
+    target: int
+    type: str
+    label: str = ""
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = {"source": self.source, "target": self.target, "type": self.type}
+        if self.label:
+            data["label"] = self.label
+        return data
+
+
+class EntityTable:
+    """
+    Entities indexed by (type, normalized value), plus their relationships.
+
+    IDs are assigned in insertion order and adding a value again returns its
+    existing ID, so every lookup and duplicate check is a hash probe.
+    """
+
+    def __init__(self):
+        self.entities: List[Dict[str, Any]] = []
+        self.relationships: List[Relationship] = []
+        self._index: Dict[Tuple[str, str], int] = {}
+        self._values: set = set()  # normalized values of any type
+        self._first: Dict[str, int] = {}  # type -> first ID of that type
+        self._edges: set = set()
+
+    def add(self, entity_type: str, value: Any, label: Optional[str] = None,
+            is_target: bool = False) -> int:
+        """Return the ID for (type, value), creating the entity if needed."""
+        key = (entity_type, normalize_entity_value(entity_type, value))
+        entity_id = self._index.get(key)
+        if entity_id is not None:
+            return entity_id
+
+        entity_id = len(self.entities)
+        entity = {"id": entity_id, "type": entity_type, "value": value,
+                  "label": value if label is None else label}
+        if is_target:
+            entity["is_target"] = True
+        self.entities.append(entity)
+        self._index[key] = entity_id
+        self._values.add(normalize_entity_value("", value))
+        self._first.setdefault(entity_type, entity_id)
+        return entity_id
+
+    def find(self, entity_type: str, value: Any) -> Optional[int]:
+        return self._index.get((entity_type, normalize_entity_value(entity_type, value)))
+
+    def has_value(self, value: Any) -> bool:
+        """Whether any entity, of any type, already has this value."""
+        return normalize_entity_value("", value) in self._values
+
+    def first(self, entity_type: str) -> Optional[int]:
+        """ID of the first entity added with this type."""
+        return self._first.get(entity_type)
+
+    def link(self, source: int, target: int, rel_type: str, label: str = ""):
+        """Add a relationship once; self-links are dropped."""
+        key = (source, target, rel_type)
+        if source != target and key not in self._edges:
+            self._edges.add(key)
+            self.relationships.append(Relationship(source, target, rel_type, label))
+
+    def relationship_dicts(self) -> List[Dict[str, Any]]:
+        return [rel.to_dict() for rel in self.relationships]
+
 
 class InvestigationOrchestrator:
     """
@@ -120,11 +284,20 @@ class InvestigationOrchestrator:
     
     Chains recon modules and assembles results into a unified report.
     Provides progress callbacks for UI integration.
+
+    One orchestrator may run several investigations at once (see BatchRunner);
+    stage_limits then caps how many of each stage run across all of them, and
+    session, if given, is the HTTP session their page caches share.
     """
 
-    def __init__(self):
+    def __init__(self, stage_limits: Optional[Dict[str, int]] = None,
+                 session: Optional[aiohttp.ClientSession] = None):
         self.logger = logging.getLogger(f"{__name__}.Orchestrator")
         self._cancelled = False
+        self.stage_limits = dict(stage_limits or {})
+        self.session = session
+        self._stage_slots: Dict[str, asyncio.Semaphore] = {}
+        self._slots_loop = None
 
         # Initialize recon modules
         self.dns = DNSRecon()
@@ -139,7 +312,9 @@ class InvestigationOrchestrator:
 
     async def run_investigation(self, config: InvestigationConfig,
                                  progress_callback: Optional[Callable] = None,
-                                 stage_callback: Optional[Callable] = None) -> InvestigationResult:
+                                 stage_callback: Optional[Callable] = None,
+                                 previous: Optional[Union["InvestigationResult", str]] = None
+                                 ) -> InvestigationResult:
         """
         Execute a full investigation pipeline.
         
@@ -147,6 +322,9 @@ class InvestigationOrchestrator:
             config: Investigation configuration
             progress_callback: Called with (message: str, percent: int)
             stage_callback: Called with (stage: InvestigationStage, status: str)
+            previous: An earlier result for the same target (or the path of a saved
+                one); stages whose data is still within config.freshness_ttls are
+                reused from it instead of being run again
         """
         self._cancelled = False
         result = InvestigationResult(
@@ -165,6 +343,9 @@ class InvestigationOrchestrator:
                 stage_callback(stage, status)
 
         try:
+            if previous is not None:
+                self._reuse_previous(config, result, previous)
+
             # Determine what to run based on entity type
             if config.entity_type == EntityType.DOMAIN:
                 await self._investigate_domain(config, result, _progress, _stage)
@@ -215,113 +396,227 @@ class InvestigationOrchestrator:
         """Cancel the running investigation."""
         self._cancelled = True
 
+    def _reuse_previous(self, config: InvestigationConfig, result: InvestigationResult,
+                        previous: Union["InvestigationResult", str]):
+        """
+        Seed result with an earlier run's module data and mark fresh stages as reused.
+
+        Every module section is carried over so stages that fail this time still
+        leave their last known data; stale stages overwrite their sections when
+        they succeed. Results saved without section_times give no per-stage
+        ages, so all of their stages are run again.
+        """
+        if isinstance(previous, str):
+            try:
+                previous = InvestigationResult.load(previous)
+            except (OSError, ValueError) as e:
+                result.errors.append(f"Previous result unavailable: {str(e)}")
+                return
+        if previous.target != config.target or previous.entity_type != config.entity_type.value:
+            return
+
+        for section in MODULE_SECTIONS:
+            setattr(result, section, copy.deepcopy(getattr(previous, section)))
+
+        now = datetime.utcnow()
+        ttls = {**DEFAULT_FRESHNESS_TTLS, **config.freshness_ttls}
+        for name, collected_at in previous.section_times.items():
+            try:
+                age = (now - datetime.fromisoformat(collected_at)).total_seconds()
+            except (TypeError, ValueError):
+                continue
+            result.section_times[name] = collected_at
+            if 0 <= age < ttls.get(name, 0):
+                result.reused_sections.append(name)
+
     async def _investigate_domain(self, config: InvestigationConfig,
                                    result: InvestigationResult,
                                    progress, stage):
         """Run domain-focused investigation."""
         domain = config.target.replace("https://", "").replace("http://", "").strip("/")
 
-        # 1. DNS Recon
-        if config.run_dns and not self._cancelled:
-            stage(InvestigationStage.DNS_RECON, "running")
-            progress("Running DNS reconnaissance", 5)
-            try:
-                dns_report = await self.dns.full_recon(domain, subdomain_scan=config.subdomain_scan)
-                result.dns = dns_report.to_dict()
-                result.errors.extend([f"DNS: {e}" for e in dns_report.errors])
-            except Exception as e:
-                result.errors.append(f"DNS recon failed: {str(e)}")
-            stage(InvestigationStage.DNS_RECON, "complete")
-
-        # 2. WHOIS Lookup
-        if config.run_whois and not self._cancelled:
-            stage(InvestigationStage.WHOIS_LOOKUP, "running")
-            progress("Running WHOIS lookup", 15)
-            try:
-                whois_data = await self.whois.domain_whois(domain)
-                result.whois = whois_data.to_dict()
-                # IP geolocation for resolved IPs
-                if result.dns.get("ip_addresses"):
-                    ip = result.dns["ip_addresses"][0]
-                    ip_info = await self.whois.ip_lookup(ip)
-                    result.ip_info = ip_info.to_dict()
-            except Exception as e:
-                result.errors.append(f"WHOIS failed: {str(e)}")
-            stage(InvestigationStage.WHOIS_LOOKUP, "complete")
-
-        # 3. Port Scan
-        if config.run_ports and not self._cancelled:
-            stage(InvestigationStage.PORT_SCAN, "running")
-            progress("Scanning ports", 25)
-            try:
-                scan = await self.port_scanner.scan(domain, quick=config.port_scan_quick)
-                result.ports = scan.to_dict()
-            except Exception as e:
-                result.errors.append(f"Port scan failed: {str(e)}")
-            stage(InvestigationStage.PORT_SCAN, "complete")
-
-        # 4. Cert Transparency
-        if config.run_certs and not self._cancelled:
-            stage(InvestigationStage.CERT_TRANSPARENCY, "running")
-            progress("Querying certificate transparency", 40)
-            try:
-                certs = await self.cert_recon.search(domain)
-                result.certificates = certs.to_dict()
-            except Exception as e:
-                result.errors.append(f"Cert recon failed: {str(e)}")
-            stage(InvestigationStage.CERT_TRANSPARENCY, "complete")
-
-        # 5. Web Analysis
-        if config.run_web and not self._cancelled:
-            stage(InvestigationStage.WEB_ANALYSIS, "running")
-            progress("Analyzing website", 55)
-            try:
-                page = await self.web_scraper.analyze(domain)
-                result.web = page.to_dict()
-            except Exception as e:
-                result.errors.append(f"Web analysis failed: {str(e)}")
-            stage(InvestigationStage.WEB_ANALYSIS, "complete")
-
-        # 6. Email Harvesting
-        if config.run_emails and not self._cancelled:
-            stage(InvestigationStage.EMAIL_HARVEST, "running")
-            progress("Harvesting email addresses", 70)
+        async def dns_recon():
+            dns_report = await self.dns.full_recon(domain, subdomain_scan=config.subdomain_scan)
+            result.dns = dns_report.to_dict()
+            result.errors.extend([f"DNS: {e}" for e in dns_report.errors])
+
+        async def whois_lookup():
+            whois_data = await self.whois.domain_whois(domain)
+            result.whois = whois_data.to_dict()
+
+        async def ip_enrichment():
+            # IP geolocation for every resolved address (one batched lookup)
+            ips = self._collect_ips(result.dns)
+            if ips:
+                ip_infos = await self.whois.lookup_ips(ips)
+                result.ip_enrichment = {ip: info.to_dict() for ip, info in ip_infos.items()}
+                result.ip_info = result.ip_enrichment.get(ips[0], {})
+
+        async def port_scan():
+            scan = await self.port_scanner.scan(domain, quick=config.port_scan_quick)
+            result.ports = scan.to_dict()
+
+        async def cert_transparency():
+            certs = await self.cert_recon.search(domain)
+            result.certificates = certs.to_dict()
+
+        async def web_analysis():
+            page = await self.web_scraper.analyze(domain, page_cache=pages)
+            result.web = page.to_dict()
+            if page.status_code:
+                matches = await self.tech_fingerprinter.fingerprint_url(page.url, pages)
+                result.web["tech_stack"] = self.tech_fingerprinter.categorize(matches)
+
+        async def email_harvest():
+            harvest = await self.email_harvester.harvest(domain, max_pages=config.max_email_pages,
+                                                         page_cache=pages)
+            result.emails = harvest.to_dict()
+
+        nodes = []
+        if config.run_dns:
+            nodes.append(StageNode("dns_recon", dns_recon, "Running DNS reconnaissance",
+                                   InvestigationStage.DNS_RECON, error_label="DNS recon"))
+        if config.run_whois:
+            nodes.append(StageNode("whois_lookup", whois_lookup, "Running WHOIS lookup",
+                                   InvestigationStage.WHOIS_LOOKUP, error_label="WHOIS"))
+            nodes.append(StageNode("ip_enrichment", ip_enrichment, "Enriching resolved IPs",
+                                   depends_on=("dns_recon",), error_label="IP enrichment"))
+        if config.run_ports:
+            nodes.append(StageNode("port_scan", port_scan, "Scanning ports",
+                                   InvestigationStage.PORT_SCAN, error_label="Port scan"))
+        if config.run_certs:
+            nodes.append(StageNode("cert_transparency", cert_transparency,
+                                   "Querying certificate transparency",
+                                   InvestigationStage.CERT_TRANSPARENCY, error_label="Cert recon"))
+        if config.run_web:
+            nodes.append(StageNode("web_analysis", web_analysis, "Analyzing website",
+                                   InvestigationStage.WEB_ANALYSIS, error_label="Web analysis"))
+        if config.run_emails:
+            # Runs alongside web analysis; the shared PageCache merges their fetches
+            nodes.append(StageNode("email_harvest", email_harvest, "Harvesting email addresses",
+                                   InvestigationStage.EMAIL_HARVEST, error_label="Email harvest"))
+
+        # Web modules share fetched pages for the rest of this investigation
+        async with PageCache(session=self.session) as pages:
+            await self._run_stage_graph(nodes, config, result, progress, stage)
+
+    async def _run_stage_graph(self, nodes: List[StageNode], config: InvestigationConfig,
+                               result: InvestigationResult, progress, stage,
+                               start_pct: int = 5, end_pct: int = 80):
+        """
+        Run stage nodes concurrently, each as soon as its dependencies finish.
+
+        At most config.max_parallel_stages nodes run at once, stage_limits
+        applies across concurrent investigations, and each node is bounded by
+        its time budget. Nodes listed in result.reused_sections are skipped
+        unless a dependency is being refreshed; the rest are stamped in
+        result.section_times when they succeed.
+        Progress is reported as the share of finished nodes, so it only moves
+        forward while stages overlap. Dependencies on nodes that are not in
+        the graph are ignored; a failed or timed-out dependency still releases
+        its dependents.
+        """
+        done = {node.name: asyncio.Event() for node in nodes}
+        slots = asyncio.Semaphore(max(config.max_parallel_stages, 1))
+        completed = 0
+
+        # Nodes are declared after their dependencies
+        reused = set()
+        for node in nodes:
+            if node.name in result.reused_sections and all(
+                    dep not in done or dep in reused for dep in node.depends_on):
+                reused.add(node.name)
+        result.reused_sections = [node.name for node in nodes if node.name in reused]
+
+        def percent() -> int:
+            return start_pct + int((end_pct - start_pct) * completed / max(len(nodes), 1))
+
+        async def run(node: StageNode):
+            nonlocal completed
             try:
-                harvest = await self.email_harvester.harvest(domain)
-                result.emails = harvest.to_dict()
-            except Exception as e:
-                result.errors.append(f"Email harvest failed: {str(e)}")
-            stage(InvestigationStage.EMAIL_HARVEST, "complete")
+                if node.name in reused:
+                    completed += 1
+                    if node.stage:
+                        stage(node.stage, "cached")
+                    return
+                for dep in node.depends_on:
+                    if dep in done:
+                        await done[dep].wait()
+                async with slots, self._stage_slot(node.name):
+                    if self._cancelled:
+                        return
+                    budget = config.stage_budgets.get(node.name, DEFAULT_STAGE_BUDGETS.get(node.name))
+                    if node.stage:
+                        stage(node.stage, "running")
+                    progress(node.message, percent())
+                    status = "complete"
+                    try:
+                        await asyncio.wait_for(node.run(), budget)
+                        result.section_times[node.name] = datetime.utcnow().isoformat()
+                        result.refreshed_sections.append(node.name)
+                    except asyncio.TimeoutError:
+                        status = "timeout"
+                        result.errors.append(f"{node.message} timed out after {budget:.0f}s")
+                        self.logger.warning(f"Stage {node.name} exceeded its {budget:.0f}s budget")
+                    except Exception as e:
+                        status = "failed"
+                        result.errors.append(f"{node.error_label or node.name} failed: {str(e)}")
+                    completed += 1
+                    if node.stage:
+                        stage(node.stage, status)
+            finally:
+                done[node.name].set()
+
+        await asyncio.gather(*(run(node) for node in nodes))
+
+    def set_stage_limits(self, limits: Dict[str, int]):
+        """Replace the cross-investigation stage limits."""
+        self.stage_limits = dict(limits)
+        self._slots_loop = None
+
+    def _stage_slot(self, name: str):
+        """Shared limiter for a stage, recreated when a new event loop is in use."""
+        loop = asyncio.get_event_loop()
+        if self._slots_loop is not loop:
+            self._slots_loop = loop
+            self._stage_slots = {stage: asyncio.Semaphore(max(limit, 1))
+                                 for stage, limit in self.stage_limits.items()}
+        return self._stage_slots.get(name) or contextlib.nullcontext()
+
+    @staticmethod
+    def _collect_ips(dns: Dict[str, Any]) -> List[str]:
+        """All A/AAAA addresses for the domain and its subdomains, apex first."""
+        ips = list(dns.get("ip_addresses", [])) + list(dns.get("ipv6_addresses", []))
+        for record in dns.get("records", []):
+            if record.get("type") in ("A", "AAAA"):
+                ips.append(record.get("value", ""))
+        return [ip for ip in dict.fromkeys(ips) if ip]
 
     async def _investigate_ip(self, config, result, progress, stage):
         """Run IP-focused investigation."""
         ip = config.target
 
         # WHOIS + Geolocation
+        async def ip_lookup():
+            ip_info = await self.whois.ip_lookup(ip)
+            result.ip_info = ip_info.to_dict()
+            # Reverse DNS
+            reverse = await self.dns.reverse_lookup(ip)
+            if reverse:
+                result.dns["reverse_dns"] = reverse
+
+        async def port_scan():
+            scan = await self.port_scanner.scan(ip, quick=config.port_scan_quick)
+            result.ports = scan.to_dict()
+
+        nodes = []
         if config.run_whois:
-            stage(InvestigationStage.WHOIS_LOOKUP, "running")
-            progress("Running IP lookup", 10)
-            try:
-                ip_info = await self.whois.ip_lookup(ip)
-                result.ip_info = ip_info.to_dict()
-                # Reverse DNS
-                reverse = await self.dns.reverse_lookup(ip)
-                if reverse:
-                    result.dns["reverse_dns"] = reverse
-            except Exception as e:
-                result.errors.append(f"IP lookup failed: {str(e)}")
-            stage(InvestigationStage.WHOIS_LOOKUP, "complete")
-
-        # Port Scan
+            nodes.append(StageNode("whois_lookup", ip_lookup, "Running IP lookup",
+                                   InvestigationStage.WHOIS_LOOKUP, error_label="IP lookup"))
         if config.run_ports:
-            stage(InvestigationStage.PORT_SCAN, "running")
-            progress("Scanning ports", 30)
-            try:
-                scan = await self.port_scanner.scan(ip, quick=config.port_scan_quick)
-                result.ports = scan.to_dict()
-            except Exception as e:
-                result.errors.append(f"Port scan failed: {str(e)}")
-            stage(InvestigationStage.PORT_SCAN, "complete")
+            nodes.append(StageNode("port_scan", port_scan, "Scanning ports",
+                                   InvestigationStage.PORT_SCAN, error_label="Port scan"))
+        await self._run_stage_graph(nodes, config, result, progress, stage)
 
     async def _investigate_email(self, config, result, progress, stage):
         """Run email-focused investigation."""
@@ -329,214 +624,167 @@ class InvestigationOrchestrator:
         domain = email.split("@")[1] if "@" in email else email
 
         # DNS for the email domain
-        if config.run_dns:
-            stage(InvestigationStage.DNS_RECON, "running")
-            progress("Checking email domain DNS", 10)
-            try:
-                dns_report = await self.dns.full_recon(domain, subdomain_scan=False)
-                result.dns = dns_report.to_dict()
-            except Exception as e:
-                result.errors.append(f"DNS failed: {str(e)}")
-            stage(InvestigationStage.DNS_RECON, "complete")
-
-        # Email validation
-        progress("Validating email", 30)
-        try:
+        async def dns_recon():
+            dns_report = await self.dns.full_recon(domain, subdomain_scan=False)
+            result.dns = dns_report.to_dict()
+
+        async def email_validation():
             validation = await self.email_harvester.check_email_exists(email)
             result.emails = {"target_email": email, "validation": validation}
-        except Exception as e:
-            result.errors.append(f"Email validation failed: {str(e)}")
 
         # Username check (the part before @)
+        username = email.split("@")[0]
+
+        async def username_check():
+            username_report = await self.username_checker.check(username)
+            result.usernames = username_report.to_dict()
+
+        nodes = []
+        if config.run_dns:
+            nodes.append(StageNode("dns_recon", dns_recon, "Checking email domain DNS",
+                                   InvestigationStage.DNS_RECON, error_label="DNS"))
+        nodes.append(StageNode("email_validation", email_validation, "Validating email",
+                               error_label="Email validation"))
         if config.run_usernames:
-            username = email.split("@")[0]
-            stage(InvestigationStage.USERNAME_CHECK, "running")
-            progress(f"Checking username '{username}' across platforms", 50)
-            try:
-                username_report = await self.username_checker.check(username)
-                result.usernames = username_report.to_dict()
-            except Exception as e:
-                result.errors.append(f"Username check failed: {str(e)}")
-            stage(InvestigationStage.USERNAME_CHECK, "complete")
+            nodes.append(StageNode("username_check", username_check,
+                                   f"Checking username '{username}' across platforms",
+                                   InvestigationStage.USERNAME_CHECK, error_label="Username check"))
+        await self._run_stage_graph(nodes, config, result, progress, stage)
 
     async def _investigate_username(self, config, result, progress, stage):
         """Run username-focused investigation."""
-        stage(InvestigationStage.USERNAME_CHECK, "running")
-        progress("Checking username across platforms", 20)
-        try:
+        async def username_check():
             report = await self.username_checker.check(config.target)
             result.usernames = report.to_dict()
-        except Exception as e:
-            result.errors.append(f"Username check failed: {str(e)}")
-        stage(InvestigationStage.USERNAME_CHECK, "complete")
+
+        nodes = [StageNode("username_check", username_check, "Checking username across platforms",
+                           InvestigationStage.USERNAME_CHECK, error_label="Username check")]
+        await self._run_stage_graph(nodes, config, result, progress, stage)
 
     async def _investigate_entity(self, config, result, progress, stage):
         """Run person/organization investigation with full person search."""
         name = config.person_name or config.target
 
         # 1. Person Search (people-finder sites, social, web mentions)
-        if config.run_person_search and not self._cancelled:
-            stage(InvestigationStage.PERSON_SEARCH, "running")
-            progress(f"Searching for '{name}'", 10)
-            try:
-                person_report = await self.person_recon.search(
-                    full_name=name,
-                    date_of_birth=config.date_of_birth,
-                    location=config.location,
-                    progress_callback=lambda msg, pct: progress(msg, 10 + int(pct * 0.5)),
-                )
-                result.person_data = person_report.to_dict()
-                result.errors.extend([f"Person: {e}" for e in person_report.errors])
-            except Exception as e:
-                result.errors.append(f"Person search failed: {str(e)}")
-            stage(InvestigationStage.PERSON_SEARCH, "complete")
+        async def person_search():
+            person_report = await self.person_recon.search(
+                full_name=name,
+                date_of_birth=config.date_of_birth,
+                location=config.location,
+                progress_callback=lambda msg, pct: progress(msg, 5 + int(pct * 0.35)),
+            )
+            result.person_data = person_report.to_dict()
+            result.errors.extend([f"Person: {e}" for e in person_report.errors])
 
         # 2. Username check (generated usernames from person search)
-        if config.run_usernames and not self._cancelled:
-            stage(InvestigationStage.USERNAME_CHECK, "running")
-            progress("Checking generated usernames across platforms", 65)
-            try:
-                # Use first generated username, or derive from name
-                usernames_to_check = result.person_data.get("possible_usernames", [])
-                if not usernames_to_check:
-                    usernames_to_check = [name.replace(" ", "").lower()]
-                # Check the top 3 username candidates
-                all_found = []
-                for uname in usernames_to_check[:3]:
-                    report = await self.username_checker.check(uname)
-                    data = report.to_dict()
-                    for found in data.get("found_on", []):
-                        found["username_variant"] = uname
-                        all_found.append(found)
-                result.usernames = {"found_on": all_found, "checked_usernames": usernames_to_check[:3]}
-            except Exception as e:
-                result.errors.append(f"Username check failed: {str(e)}")
-            stage(InvestigationStage.USERNAME_CHECK, "complete")
+        async def username_check():
+            # Use first generated username, or derive from name
+            usernames_to_check = result.person_data.get("possible_usernames", [])
+            if not usernames_to_check:
+                usernames_to_check = [name.replace(" ", "").lower()]
+            # Check the top 3 username candidates in one batch
+            all_found = []
+            reports = await self.username_checker.check_many(usernames_to_check[:3])
+            for uname, report in reports.items():
+                data = report.to_dict()
+                for found in data.get("found_on", []):
+                    found["username_variant"] = uname
+                    all_found.append(found)
+            result.usernames = {"found_on": all_found, "checked_usernames": usernames_to_check[:3]}
+
+        nodes = []
+        if config.run_person_search:
+            nodes.append(StageNode("person_search", person_search, f"Searching for '{name}'",
+                                   InvestigationStage.PERSON_SEARCH, error_label="Person search"))
+        if config.run_usernames:
+            nodes.append(StageNode("username_check", username_check,
+                                   "Checking generated usernames across platforms",
+                                   InvestigationStage.USERNAME_CHECK, error_label="Username check",
+                                   depends_on=("person_search",)))
+        await self._run_stage_graph(nodes, config, result, progress, stage)
 
     def _resolve_entities(self, result: InvestigationResult):
         """Build entity list and relationships from all collected data."""
-        entities = []
-        relationships = []
-        entity_id = 0
+        table = EntityTable()
 
         # Target entity
-        target_entity = {
-            "id": entity_id, "type": result.entity_type,
-            "value": result.target, "label": result.target,
-            "is_target": True
-        }
-        entities.append(target_entity)
+        target = table.add(result.entity_type, result.target, is_target=True)
 
         # DNS-derived entities
         for ip in result.dns.get("ip_addresses", []):
-            entity_id += 1
-            entities.append({"id": entity_id, "type": "ip", "value": ip, "label": ip})
-            relationships.append({"source": 0, "target": entity_id, "type": "resolves_to", "label": "A record"})
+            table.link(target, table.add("ip", ip), "resolves_to", label="A record")
 
         for ns in result.dns.get("nameservers", []):
-            entity_id += 1
-            entities.append({"id": entity_id, "type": "nameserver", "value": ns, "label": ns})
-            relationships.append({"source": 0, "target": entity_id, "type": "uses_nameserver"})
+            table.link(target, table.add("nameserver", ns), "uses_nameserver")
 
         for mx in result.dns.get("mail_servers", []):
-            entity_id += 1
-            entities.append({"id": entity_id, "type": "mail_server", "value": mx, "label": mx})
-            relationships.append({"source": 0, "target": entity_id, "type": "uses_mail_server"})
+            table.link(target, table.add("mail_server", mx), "uses_mail_server")
 
         for sub in result.dns.get("subdomains", []):
-            entity_id += 1
-            entities.append({"id": entity_id, "type": "subdomain", "value": sub, "label": sub})
-            relationships.append({"source": 0, "target": entity_id, "type": "has_subdomain"})
+            table.link(target, table.add("subdomain", sub), "has_subdomain")
 
         # CT-derived subdomains
         for sub in result.certificates.get("unique_subdomains", []):
-            if not any(e["value"] == sub for e in entities):
-                entity_id += 1
-                entities.append({"id": entity_id, "type": "subdomain", "value": sub, "label": sub})
-                relationships.append({"source": 0, "target": entity_id, "type": "cert_subdomain"})
+            if not table.has_value(sub):
+                table.link(target, table.add("subdomain", sub), "cert_subdomain")
 
         # WHOIS-derived entities
         registrar = result.whois.get("registrar")
         if registrar:
-            entity_id += 1
-            entities.append({"id": entity_id, "type": "registrar", "value": registrar, "label": registrar})
-            relationships.append({"source": 0, "target": entity_id, "type": "registered_with"})
+            table.link(target, table.add("registrar", registrar), "registered_with")
 
         # IP geolocation
+        first_ip = table.first("ip")
         if result.ip_info.get("org"):
-            entity_id += 1
-            entities.append({"id": entity_id, "type": "organization", "value": result.ip_info["org"], "label": result.ip_info["org"]})
+            org = table.add("organization", result.ip_info["org"])
             # Link to the IP
-            ip_entity = next((e for e in entities if e["type"] == "ip"), None)
-            if ip_entity:
-                relationships.append({"source": ip_entity["id"], "target": entity_id, "type": "owned_by"})
+            if first_ip is not None:
+                table.link(first_ip, org, "owned_by")
 
         # Email entities
         for email_data in result.emails.get("emails", []):
             email = email_data if isinstance(email_data, str) else email_data.get("email", "")
             if email:
-                entity_id += 1
-                entities.append({"id": entity_id, "type": "email", "value": email, "label": email})
-                relationships.append({"source": 0, "target": entity_id, "type": "found_email"})
+                table.link(target, table.add("email", email), "found_email")
 
         # Web-derived entities
         for platform, url in result.web.get("social_links", {}).items():
-            entity_id += 1
-            entities.append({"id": entity_id, "type": "social_profile", "value": url, "label": f"{platform}"})
-            relationships.append({"source": 0, "target": entity_id, "type": "has_social_profile"})
+            table.link(target, table.add("social_profile", url, label=f"{platform}"), "has_social_profile")
 
         # Port-derived entities (services)
         for port_data in result.ports.get("open_ports", []):
-            entity_id += 1
             label = f"{port_data.get('service', 'unknown')}:{port_data['port']}"
-            entities.append({"id": entity_id, "type": "service", "value": label, "label": label})
-            ip_entity = next((e for e in entities if e["type"] == "ip"), None)
-            if ip_entity:
-                relationships.append({"source": ip_entity["id"], "target": entity_id, "type": "runs_service"})
+            service = table.add("service", label)
+            if first_ip is not None:
+                table.link(first_ip, service, "runs_service")
 
         # Username matches
         for found in result.usernames.get("found_on", []):
-            entity_id += 1
-            entities.append({
-                "id": entity_id, "type": "social_profile",
-                "value": found.get("url", ""), "label": found.get("platform", "")
-            })
-            relationships.append({"source": 0, "target": entity_id, "type": "username_match"})
+            profile = table.add("social_profile", found.get("url", ""), label=found.get("platform", ""))
+            table.link(target, profile, "username_match")
 
         # Person search derived entities
         for profile in result.person_data.get("social_profiles", []):
-            if not any(e["value"] == profile.get("url", "") for e in entities):
-                entity_id += 1
-                entities.append({
-                    "id": entity_id, "type": "social_profile",
-                    "value": profile.get("url", ""),
-                    "label": profile.get("platform", "Unknown")
-                })
-                relationships.append({"source": 0, "target": entity_id, "type": "person_social_profile"})
+            url = profile.get("url", "")
+            if not table.has_value(url):
+                entity = table.add("social_profile", url, label=profile.get("platform", "Unknown"))
+                table.link(target, entity, "person_social_profile")
 
         for email in result.person_data.get("possible_emails", []):
-            if not any(e["value"] == email for e in entities):
-                entity_id += 1
-                entities.append({"id": entity_id, "type": "email", "value": email, "label": email})
-                relationships.append({"source": 0, "target": entity_id, "type": "possible_email"})
+            if not table.has_value(email):
+                table.link(target, table.add("email", email), "possible_email")
 
         for phone in result.person_data.get("phone_numbers", []):
-            entity_id += 1
-            entities.append({"id": entity_id, "type": "phone", "value": phone, "label": phone})
-            relationships.append({"source": 0, "target": entity_id, "type": "phone_number"})
+            table.link(target, table.add("phone", phone), "phone_number")
 
         for addr in result.person_data.get("addresses", []):
-            entity_id += 1
-            entities.append({"id": entity_id, "type": "address", "value": addr, "label": addr[:40]})
-            relationships.append({"source": 0, "target": entity_id, "type": "known_address"})
+            table.link(target, table.add("address", addr, label=addr[:40]), "known_address")
 
         for employer in result.person_data.get("employers", []):
-            entity_id += 1
-            entities.append({"id": entity_id, "type": "organization", "value": employer, "label": employer[:40]})
-            relationships.append({"source": 0, "target": entity_id, "type": "employed_by"})
+            table.link(target, table.add("organization", employer, label=employer[:40]), "employed_by")
 
-        result.entities = entities
-        result.relationships = relationships
+        result.entities = table.entities
+        result.relationships = table.relationship_dicts()
 
         # Build timeline
         self._build_timeline(result)
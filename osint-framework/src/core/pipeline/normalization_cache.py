@@ -0,0 +1,117 @@
+"""
+Normalization Cache
+
+Read-through cache for NormalizationEngine results, shared across
+investigations so recurring emails, phones, domains and names are
+normalized once:
+
+- keyed by entity type plus a SHA-256 of the entity's raw attributes, so
+  any change to the input is a different key; NORMALIZATION_VERSION is part
+  of the hash, so bumping it when normalization rules change retires every
+  earlier result
+- an in-process LRU answers repeat lookups without I/O
+- misses for a whole batch go to the backing store (the entity_cache table
+  when wired up by the API) in one bulk lookup, and new results are
+  written back in one bulk upsert
+- entries expire after ttl_seconds in both layers
+- store failures are logged and treated as misses; normalization never
+  depends on the cache being available
+"""
+
+import hashlib
+import json
+import logging
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional, Tuple
+
+
+# load(hashes) -> {hash: (payload, expires_at)}
+LoadFn = Callable[[Iterable[str]], Awaitable[Dict[str, Tuple[Dict[str, Any], datetime]]]]
+# save({hash: (entity_type, entity_value, payload)}, expires_at)
+SaveFn = Callable[[Dict[str, Tuple[str, str, Dict[str, Any]]], datetime], Awaitable[Any]]
+
+# Bump whenever NormalizationEngine output changes for the same input
+NORMALIZATION_VERSION = 1
+
+
+def normalization_key(entity_type: str, attributes: Dict[str, Any]) -> str:
+    """Cache key for an entity: normalization version, type and a hash of its raw attributes."""
+    raw = json.dumps(attributes, sort_keys=True, default=str, separators=(",", ":"))
+    return hashlib.sha256(
+        f"{NORMALIZATION_VERSION}\x00{entity_type}\x00{raw}".encode("utf-8")).hexdigest()
+
+
+class NormalizationCache:
+    """In-process LRU in front of an optional persistent store."""
+
+    def __init__(self, max_entries: int = 50000, ttl_seconds: float = 7 * 24 * 3600,
+                 load: Optional[LoadFn] = None, save: Optional[SaveFn] = None):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._load = load
+        self._save = save
+        self._entries: "OrderedDict[str, Tuple[Dict[str, Any], datetime]]" = OrderedDict()
+        self.hits = 0
+        self.store_hits = 0
+        self.misses = 0
+        self.logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
+
+    async def get_many(self, keys: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        """Cached payloads for the keys that have one (LRU first, then one store query)."""
+        now = datetime.utcnow()
+        found: Dict[str, Dict[str, Any]] = {}
+        missing = []
+        for key in dict.fromkeys(keys):
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] > now:
+                self._entries.move_to_end(key)
+                found[key] = entry[0]
+            else:
+                if entry is not None:
+                    del self._entries[key]
+                missing.append(key)
+        self.hits += len(found)
+
+        from_store = 0
+        if missing and self._load is not None:
+            try:
+                stored = await self._load(missing)
+            except Exception as e:
+                self.logger.warning(f"Normalization cache lookup failed: {e}")
+                stored = {}
+            for key, (payload, expires_at) in stored.items():
+                if expires_at > now:
+                    self._remember(key, payload, expires_at)
+                    found[key] = payload
+                    from_store += 1
+        self.store_hits += from_store
+        self.misses += len(missing) - from_store
+        return found
+
+    async def put_many(self, items: Dict[str, Tuple[str, str, Dict[str, Any]]]):
+        """Cache new results: {key: (entity_type, entity_value, payload)}."""
+        if not items:
+            return
+        expires_at = datetime.utcnow() + timedelta(seconds=self.ttl_seconds)
+        for key, (_, _, payload) in items.items():
+            self._remember(key, payload, expires_at)
+        if self._save is not None:
+            try:
+                await self._save(items, expires_at)
+            except Exception as e:
+                self.logger.warning(f"Normalization cache write failed: {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "store_hits": self.store_hits,
+            "misses": self.misses,
+        }
+
+    def _remember(self, key: str, payload: Dict[str, Any], expires_at: datetime):
+        self._entries[key] = (payload, expires_at)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
@@ -42,7 +42,8 @@ from datetime import datetime, timezone
 from typing import Dict, List, Any, Optional, Set, Tuple, Union
 from dataclasses import dataclass, field
 from enum import Enum
-import uuid
+import json
+from uuid import uuid4
 from urllib.parse import urlparse
 
 from ..models.entities import (
@@ -50,6 +51,7 @@ from ..models.entities import (
     validate_email, validate_phone, validate_domain,
     redact_sensitive_data
 )
+from .normalization_cache import NormalizationCache, normalization_key
 
 
 class NormalizationStatus(Enum):
@@ -223,10 +225,11 @@ class NormalizationEngine:
     - Review trigger: If normalization success rate drops below 85%, relax validation rules
     """
 
-    def __init__(self):
-        """Initialize normalization engine."""
+    def __init__(self, cache: Optional[NormalizationCache] = None):
+        """Initialize normalization engine (in-process result cache unless one is given)."""
         self.logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
         self.metrics = NormalizationMetrics()
+        self.cache = cache if cache is not None else NormalizationCache()
         
         # Normalization rules and patterns
         self._name_patterns = {
@@ -283,7 +286,7 @@ class NormalizationEngine:
         if not correlation_id:
             correlation_id = str(uuid4())
         
-        logger = self.logger.child({
+        logger = logging.LoggerAdapter(self.logger, {
             "correlation_id": correlation_id,
             "op": "normalization.normalize_entities",
             "entity_count": len(entities)
@@ -292,13 +295,23 @@ class NormalizationEngine:
         logger.info("starting batch normalization operation")
 
         try:
+            # Entities seen before (in any investigation) come from the cache in
+            # one batched lookup; only the misses are normalized
+            cache_keys = [normalization_key(entity.entity_type.value, entity.attributes)
+                          for entity in entities]
+            cached = await self.cache.get_many(cache_keys)
+
             # Process entities in parallel
             normalization_tasks = []
-            for entity in entities:
-                task = self._normalize_single_entity(entity, correlation_id)
+            for entity, key in zip(entities, cache_keys):
+                if key in cached:
+                    task = self._result_from_cache(entity, cached[key], correlation_id)
+                else:
+                    task = self._normalize_single_entity(entity, correlation_id)
                 normalization_tasks.append(task)
 
             normalization_results = await asyncio.gather(*normalization_tasks, return_exceptions=True)
+            await self._cache_results(entities, cache_keys, cached, normalization_results)
 
             # Handle exceptions and update metrics
             final_results = []
@@ -364,7 +377,7 @@ class NormalizationEngine:
         """Normalize a single entity."""
         start_time = datetime.utcnow()
         
-        logger = self.logger.child({
+        logger = logging.LoggerAdapter(self.logger, {
             "correlation_id": correlation_id,
             "op": "normalization.normalize_single_entity",
             "entity_id": entity.id,
@@ -446,6 +459,56 @@ class NormalizationEngine:
 
             return result
 
+    async def _result_from_cache(self, entity: Entity, payload: Dict[str, Any],
+                                 correlation_id: str) -> NormalizationResult:
+        """Build a completed result for an entity from a cached normalization."""
+        result = NormalizationResult(
+            correlation_id=correlation_id,
+            source_entity_id=entity.id
+        )
+        normalized_entity = Entity(
+            id=entity.id,
+            investigation_id=entity.investigation_id,
+            entity_type=entity.entity_type,
+            attributes=json.loads(json.dumps(payload["attributes"])),
+            confidence_score=entity.confidence_score,
+            verification_status=entity.verification_status,
+            sources=entity.sources.copy(),
+            created_at=entity.created_at,
+            updated_at=datetime.utcnow()
+        )
+        for flag in payload["quality_flags"]:
+            result.add_quality_flag(flag)
+        result.mark_completed(normalized_entity, payload["quality_score"],
+                              DataQualityLevel(payload["quality_level"]),
+                              list(payload["transformations"]))
+        return result
+
+    async def _cache_results(self, entities: List[Entity], cache_keys: List[str],
+                             cached: Dict[str, Dict[str, Any]], results: List[Any]):
+        """Write newly completed normalizations back to the cache."""
+        fresh = {}
+        for entity, key, result in zip(entities, cache_keys, results):
+            if (key in cached or key in fresh or isinstance(result, Exception)
+                    or result.normalization_status != NormalizationStatus.COMPLETED):
+                continue
+            payload = {
+                "attributes": result.normalized_entity.attributes,
+                "transformations": result.transformations_applied,
+                "quality_score": result.quality_score,
+                "quality_level": result.quality_level.value,
+                "quality_flags": result.quality_flags,
+            }
+            try:
+                # Cached payloads are stored as JSON; skip values that aren't
+                # (e.g. parsed timestamps) rather than changing their type
+                payload = json.loads(json.dumps(payload))
+            except (TypeError, ValueError):
+                continue
+            value = json.dumps(entity.attributes, sort_keys=True, default=str)[:500]
+            fresh[key] = (entity.entity_type.value, value, payload)
+        await self.cache.put_many(fresh)
+
     def _normalize_person_entity(self, entity: Entity) -> List[str]:
         """Normalize person entity attributes."""
         transformations = []
@@ -861,7 +924,8 @@ class NormalizationEngine:
             "average_quality_score": self.metrics.get_average_quality_score(),
             "average_duration_ms": self.metrics.get_average_duration_ms(),
             "entity_type_metrics": self.metrics.entity_type_metrics,
-            "quality_distribution": self.metrics.quality_distribution
+            "quality_distribution": self.metrics.quality_distribution,
+            "cache": self.cache.stats()
         }
 
     async def health_check(self) -> Dict[str, bool]:
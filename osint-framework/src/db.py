@@ -2,44 +2,135 @@
 Database models and session management for OSINT Framework.
 
 Provides SQLAlchemy ORM models and database session management.
+
+The CRUD helpers are coroutines. With an async driver installed
+(aiosqlite for SQLite, asyncpg for PostgreSQL, plus greenlet) they run on
+a pooled async engine; otherwise they run on the pooled sync engine in a
+thread, so handlers never block the event loop either way. SQLite files
+are opened in WAL mode so status reads proceed while investigations write.
+
+Storage maintenance (purging expired cache rows, archiving old reports as
+compressed blobs, incremental vacuum and statistics) lives at the end of
+this module and is scheduled by src/api/maintenance.py.
+
+On SQLite, the latest report of each investigation is also kept in an FTS5
+full-text index (report_search) covering entity values, the executive
+summary and findings; see search_reports.
 """
 
+import asyncio
+import base64
+import html
 import json
-from datetime import datetime
-from typing import Optional, Dict, Any, List
+import re
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta
+from itertools import combinations
+from typing import Optional, Dict, Any, List, Callable, TypeVar, Tuple, AsyncIterator
 import logging
 
-from sqlalchemy import create_engine, Column, String, DateTime, JSON, Float, Text, Integer, Enum, ForeignKey, Index
+from sqlalchemy import create_engine, event, insert, inspect, null, select, text, tuple_, DDL, Column, String, DateTime, JSON, Float, Text, Integer, LargeBinary, Enum, ForeignKey, Index
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, relationship, Session
+from sqlalchemy.orm.attributes import set_committed_value
 from sqlalchemy.pool import StaticPool
 
 from src.config import get_config
 
+try:
+    import zstandard
+    HAS_ZSTD = True
+except ImportError:
+    HAS_ZSTD = False
+
 logger = logging.getLogger(__name__)
 
 config = get_config()
 
+T = TypeVar("T")
+
+IS_SQLITE = config.DATABASE_URL.startswith("sqlite")
+IS_MEMORY_SQLITE = IS_SQLITE and (":memory:" in config.DATABASE_URL or config.DATABASE_URL.rstrip("/") == "sqlite:")
+
+# Async drivers for the configured sync URLs
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+    "postgres": "postgresql+asyncpg",
+}
+
+
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    """Per-connection SQLite tuning: WAL, relaxed fsync, memory-mapped I/O, larger page cache."""
+    cursor = dbapi_connection.cursor()
+    if not IS_MEMORY_SQLITE:
+        # Must precede the switch to WAL, which writes the header of a new file;
+        # existing databases are converted by enable_incremental_vacuum
+        cursor.execute("PRAGMA auto_vacuum=INCREMENTAL")
+        cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute(f"PRAGMA mmap_size={int(config.SQLITE_MMAP_SIZE)}")
+    cursor.execute(f"PRAGMA cache_size=-{int(config.SQLITE_CACHE_SIZE_KB)}")
+    cursor.execute(f"PRAGMA busy_timeout={int(config.DATABASE_POOL_TIMEOUT * 1000)}")
+    cursor.close()
+
+
+def _engine_options() -> Dict[str, Any]:
+    if IS_MEMORY_SQLITE:
+        # One shared connection is the only way to share an in-memory database
+        return {"connect_args": {"check_same_thread": False}, "poolclass": StaticPool}
+    options = {
+        "pool_size": config.DATABASE_POOL_SIZE,
+        "max_overflow": config.DATABASE_MAX_OVERFLOW,
+        "pool_timeout": config.DATABASE_POOL_TIMEOUT,
+        "pool_pre_ping": True,
+    }
+    if IS_SQLITE:
+        options["connect_args"] = {"check_same_thread": False}
+    else:
+        options["pool_recycle"] = 3600
+    return options
+
+
+def async_database_url(url: str) -> str:
+    """The async-driver form of a sync database URL."""
+    scheme, sep, rest = url.partition("://")
+    return ASYNC_DRIVERS.get(scheme, scheme) + sep + rest
+
+
 # Create database engine
-if config.DATABASE_URL.startswith("sqlite"):
-    # Use StaticPool for SQLite to avoid threading issues
-    engine = create_engine(
-        config.DATABASE_URL,
-        connect_args={"check_same_thread": False},
-        poolclass=StaticPool,
-        echo=config.DATABASE_ECHO
-    )
-else:
-    engine = create_engine(
-        config.DATABASE_URL,
-        echo=config.DATABASE_ECHO,
-        pool_pre_ping=True,
-        pool_recycle=3600
-    )
+engine = create_engine(config.DATABASE_URL, echo=config.DATABASE_ECHO, **_engine_options())
+if IS_SQLITE:
+    event.listen(engine, "connect", _set_sqlite_pragmas)
 
 SessionLocal = sessionmaker(bind=engine, expire_on_commit=False)
 Base = declarative_base()
 
+# Async engine, when greenlet and the async driver are installed (not for in-memory SQLite,
+# which a second engine could not see)
+try:
+    if IS_MEMORY_SQLITE:
+        raise ImportError("in-memory SQLite uses the sync engine")
+    from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+    async_engine = create_async_engine(async_database_url(config.DATABASE_URL),
+                                       echo=config.DATABASE_ECHO, **_engine_options())
+    if IS_SQLITE:
+        event.listen(async_engine.sync_engine, "connect", _set_sqlite_pragmas)
+    AsyncSessionLocal = async_sessionmaker(async_engine, expire_on_commit=False)
+    HAS_ASYNC_DB = True
+except ImportError:
+    AsyncSession = None
+    async_engine = None
+    AsyncSessionLocal = None
+    HAS_ASYNC_DB = False
+
+# Threads for the sync fallback, sized like the pool (one for a shared in-memory connection)
+_db_executor = ThreadPoolExecutor(
+    max_workers=1 if IS_MEMORY_SQLITE else config.DATABASE_POOL_SIZE + config.DATABASE_MAX_OVERFLOW,
+    thread_name_prefix="db")
+
 
 class Investigation(Base):
     """Investigation record."""
@@ -65,21 +156,31 @@ class Investigation(Base):
     # Relationships
     reports = relationship("InvestigationReport", back_populates="investigation", cascade="all, delete-orphan")
     
+    __table_args__ = (
+        # Keyset pagination order (see list_investigations_page)
+        Index('idx_investigation_created_id', 'created_at', 'investigation_id'),
+    )
+    
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary."""
-        return {
-            "investigation_id": self.investigation_id,
-            "correlation_id": self.correlation_id,
-            "status": self.status,
-            "progress_percentage": self.progress_percentage,
-            "current_stage": self.current_stage,
-            "entities_found": self.entities_found,
-            "queries_executed": self.queries_executed,
-            "errors": self.errors or [],
-            "started_at": self.started_at.isoformat() if self.started_at else None,
-            "completed_at": self.completed_at.isoformat() if self.completed_at else None,
-            "estimated_completion": self.estimated_completion.isoformat() if self.estimated_completion else None,
-        }
+        return investigation_dict(self)
+
+
+def investigation_dict(row: Any) -> Dict[str, Any]:
+    """Dictionary form of an investigation, from an ORM object or a selected row."""
+    return {
+        "investigation_id": row.investigation_id,
+        "correlation_id": row.correlation_id,
+        "status": row.status,
+        "progress_percentage": row.progress_percentage,
+        "current_stage": row.current_stage,
+        "entities_found": row.entities_found,
+        "queries_executed": row.queries_executed,
+        "errors": row.errors or [],
+        "started_at": row.started_at.isoformat() if row.started_at else None,
+        "completed_at": row.completed_at.isoformat() if row.completed_at else None,
+        "estimated_completion": row.estimated_completion.isoformat() if row.estimated_completion else None,
+    }
 
 
 class InvestigationReport(Base):
@@ -96,6 +197,9 @@ class InvestigationReport(Base):
     detailed_findings = Column(JSON)
     confidence_score = Column(Float, default=0.0)
     created_at = Column(DateTime, default=datetime.utcnow, index=True)
+    # Old reports keep their JSON sections here, compressed (see archive_old_reports)
+    archived_sections = Column(LargeBinary, nullable=True)
+    archive_codec = Column(String(10), nullable=True)  # zstd or zlib
     
     # Relationships
     investigation = relationship("Investigation", back_populates="reports")
@@ -120,6 +224,45 @@ class InvestigationReport(Base):
         }
 
 
+# JSON sections moved into archived_sections when a report is archived
+ARCHIVED_REPORT_SECTIONS = ("identity_inventory", "exposure_analysis", "activity_timeline",
+                            "remediation_recommendations", "detailed_findings")
+
+
+def compress_sections(sections: Dict[str, Any]) -> tuple:
+    """Serialize and compress report sections; returns (blob, codec)."""
+    raw = json.dumps(sections, separators=(",", ":"), default=str).encode("utf-8")
+    if HAS_ZSTD:
+        return zstandard.ZstdCompressor(level=10).compress(raw), "zstd"
+    return zlib.compress(raw, 9), "zlib"
+
+
+def decompress_sections(blob: bytes, codec: str) -> Dict[str, Any]:
+    """Inverse of compress_sections."""
+    if codec == "zstd":
+        if not HAS_ZSTD:
+            raise RuntimeError("zstandard is required to read this archived report")
+        raw = zstandard.ZstdDecompressor().decompress(blob)
+    else:
+        raw = zlib.decompress(blob)
+    return json.loads(raw)
+
+
+@event.listens_for(InvestigationReport, "load")
+def _restore_archived_sections(report, context):
+    """Archived reports are decompressed when loaded, so callers see the usual columns."""
+    if report.archived_sections is None:
+        return
+    try:
+        sections = decompress_sections(report.archived_sections, report.archive_codec)
+    except Exception as e:
+        logger.error(f"Failed to decompress archived report {report.report_id}: {e}")
+        return
+    for name in ARCHIVED_REPORT_SECTIONS:
+        # Committed values, so loading an archived report never rewrites it
+        set_committed_value(report, name, sections.get(name))
+
+
 class SearchQueryCache(Base):
     """Cache for search queries."""
     __tablename__ = "search_query_cache"
@@ -149,130 +292,910 @@ class EntityCache(Base):
     expires_at = Column(DateTime)
 
 
-def get_db() -> Session:
-    """Get database session."""
-    return SessionLocal()
+class EntityRecord(Base):
+    """One entity found by an investigation, indexed for cross-investigation lookups."""
+    __tablename__ = "entities"
+    
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    entity_id = Column(String(36), nullable=False)  # Entity.id from the pipeline
+    investigation_id = Column(String(36), ForeignKey("investigations.investigation_id"), nullable=False)
+    entity_type = Column(String(50), nullable=False)
+    normalized_value = Column(String(500), nullable=True)
+    attributes = Column(JSON)
+    confidence_score = Column(Float, default=0.0)
+    verification_status = Column(String(20))
+    created_at = Column(DateTime, default=datetime.utcnow)
+    
+    __table_args__ = (
+        Index('idx_entity_type_value', 'entity_type', 'normalized_value'),
+        Index('idx_entity_investigation', 'investigation_id', 'entity_id'),
+    )
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary."""
+        return {
+            "entity_id": self.entity_id,
+            "investigation_id": self.investigation_id,
+            "entity_type": self.entity_type,
+            "normalized_value": self.normalized_value,
+            "attributes": self.attributes or {},
+            "confidence_score": self.confidence_score,
+            "verification_status": self.verification_status,
+        }
+
+
+class EntitySource(Base):
+    """A source an entity was seen on."""
+    __tablename__ = "entity_sources"
+    
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    entity_id = Column(String(36), nullable=False)
+    investigation_id = Column(String(36), nullable=False)
+    url = Column(Text)
+    source_type = Column(String(100))
+    confidence = Column(Float, default=0.0)
+    
+    __table_args__ = (
+        Index('idx_source_investigation_entity', 'investigation_id', 'entity_id'),
+        Index('idx_source_type', 'source_type'),
+    )
+
+
+class EntityRelationship(Base):
+    """A typed edge between two entities of one investigation."""
+    __tablename__ = "relationships"
+    
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    investigation_id = Column(String(36), nullable=False, index=True)
+    source_entity_id = Column(String(36), nullable=False, index=True)
+    target_entity_id = Column(String(36), nullable=False, index=True)
+    relationship_type = Column(String(50), nullable=False)
+    label = Column(String(200), nullable=True)
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary."""
+        data = {
+            "source": self.source_entity_id,
+            "target": self.target_entity_id,
+            "type": self.relationship_type,
+        }
+        if self.label:
+            data["label"] = self.label
+        return data
+
+
+class InvestigationJob(Base):
+    """Durable queue entry for an investigation run by a worker process."""
+    __tablename__ = "investigation_jobs"
+    
+    job_id = Column(String(36), primary_key=True)
+    tenant = Column(String(200), index=True)
+    payload = Column(JSON)
+    status = Column(String(20), index=True)  # queued, running, completed, failed
+    worker_id = Column(String(100), nullable=True)
+    attempts = Column(Integer, default=0)
+    error = Column(Text, nullable=True)
+    enqueued_at = Column(DateTime, default=datetime.utcnow)
+    started_at = Column(DateTime, nullable=True)
+    heartbeat_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
+    
+    __table_args__ = (
+        Index('idx_job_status_enqueued', 'status', 'enqueued_at'),
+    )
+
+
+class ReportSearchEntry(Base):
+    """An investigation's row in the report_search full-text index."""
+    __tablename__ = "report_search_entries"
+    
+    id = Column(Integer, primary_key=True, autoincrement=True)  # rowid in report_search
+    investigation_id = Column(String(36), ForeignKey("investigations.investigation_id"),
+                              unique=True, nullable=False)
+    report_id = Column(String(36))
+    indexed_at = Column(DateTime, default=datetime.utcnow)
+
+
+# FTS5 index created alongside its entry table. Prefix indexes keep the
+# type-ahead prefix term fast; ORDER BY rank weighs entity matches above
+# summary matches above findings
+event.listen(ReportSearchEntry.__table__, "after_create", DDL(
+    "CREATE VIRTUAL TABLE IF NOT EXISTS report_search USING fts5("
+    "entities, summary, findings, tokenize='unicode61 remove_diacritics 2', prefix='2 3 4')"
+).execute_if(dialect="sqlite"))
+event.listen(ReportSearchEntry.__table__, "after_create", DDL(
+    "INSERT INTO report_search(report_search, rank) VALUES('rank', 'bm25(10.0, 5.0, 1.0)')"
+).execute_if(dialect="sqlite"))
+event.listen(ReportSearchEntry.__table__, "before_drop", DDL(
+    "DROP TABLE IF EXISTS report_search"
+).execute_if(dialect="sqlite"))
+
+
+async def get_db():
+    """Request-scoped session (FastAPI dependency): async when the async driver is available."""
+    if HAS_ASYNC_DB:
+        async with AsyncSessionLocal() as db:
+            yield db
+    else:
+        db = SessionLocal()
+        try:
+            yield db
+        finally:
+            await asyncio.get_running_loop().run_in_executor(_db_executor, db.close)
+
+
+# Attribute that identifies each pipeline entity type, in order of preference
+ENTITY_KEY_ATTRIBUTES = {
+    "email_address": ("email",),
+    "phone_number": ("phone",),
+    "domain": ("domain",),
+    "username": ("username",),
+    "social_profile": ("url", "username"),
+    "person": ("name",),
+    "company": ("name",),
+}
+
+
+def normalize_lookup_value(entity_type: str, value: Any) -> str:
+    """Canonical form of an entity value, shared by indexing and lookups."""
+    value = " ".join(str(value).split())
+    if entity_type == "phone_number":
+        return ("+" if value.startswith("+") else "") + re.sub(r"\D", "", value)
+    if entity_type == "domain":
+        return value.lower().rstrip(".")
+    if entity_type == "social_profile":
+        return value.rstrip("/").lower()
+    return value.casefold()
+
+
+def entity_lookup_value(entity_type: str, attributes: Dict[str, Any]) -> Optional[str]:
+    """The normalized value an entity is indexed under, if it has one."""
+    for key in ENTITY_KEY_ATTRIBUTES.get(entity_type, ()):
+        if attributes.get(key):
+            return normalize_lookup_value(entity_type, attributes[key])[:500]
+    return None
+
+
+def derive_relationships(entities: List[Any], max_group: int = 50) -> List[Dict[str, str]]:
+    """Link entities of one investigation that were found on the same source URL."""
+    by_url: Dict[str, List[str]] = {}
+    for entity in entities:
+        for source in entity.sources or []:
+            if source.get("url"):
+                by_url.setdefault(source["url"], []).append(entity.id)
+    edges = {}
+    for ids in by_url.values():
+        ids = sorted(set(ids))
+        if len(ids) > max_group:  # aggregator pages link everything to everything
+            continue
+        for source_id, target_id in combinations(ids, 2):
+            edges[(source_id, target_id)] = {"source": source_id, "target": target_id,
+                                             "type": "same_source"}
+    return list(edges.values())
+
+
+def _index_entities(session: Session, investigation_id: str, entities: List[Any],
+                    relationships: Optional[List[Dict[str, str]]] = None):
+    """Replace an investigation's rows in the entity tables with bulk inserts."""
+    for model in (EntityRecord, EntitySource, EntityRelationship):
+        session.query(model).filter(model.investigation_id == investigation_id).delete(
+            synchronize_session=False)
+    entity_rows, source_rows = [], []
+    for entity in entities:
+        entity_type = getattr(entity.entity_type, "value", entity.entity_type)
+        entity_rows.append({
+            "entity_id": entity.id,
+            "investigation_id": investigation_id,
+            "entity_type": entity_type,
+            "normalized_value": entity_lookup_value(entity_type, entity.attributes),
+            "attributes": entity.attributes,
+            "confidence_score": entity.confidence_score,
+            "verification_status": getattr(entity.verification_status, "value",
+                                           entity.verification_status),
+        })
+        for source in entity.sources or []:
+            source_rows.append({
+                "entity_id": entity.id,
+                "investigation_id": investigation_id,
+                "url": source.get("url"),
+                "source_type": source.get("source_type"),
+                "confidence": source.get("confidence", 0.0),
+            })
+    if relationships is None:
+        relationships = derive_relationships(entities)
+    relationship_rows = [{
+        "investigation_id": investigation_id,
+        "source_entity_id": rel["source"],
+        "target_entity_id": rel["target"],
+        "relationship_type": rel["type"],
+        "label": rel.get("label"),
+    } for rel in relationships]
+    for model, rows in ((EntityRecord, entity_rows), (EntitySource, source_rows),
+                        (EntityRelationship, relationship_rows)):
+        if rows:
+            session.execute(insert(model), rows)
+
+
+def _text_values(value: Any, out: List[str]):
+    """Collect the string and number leaves of a JSON-like value."""
+    if isinstance(value, dict):
+        for item in value.values():
+            _text_values(item, out)
+    elif isinstance(value, (list, tuple)):
+        for item in value:
+            _text_values(item, out)
+    elif isinstance(value, (str, int, float)) and not isinstance(value, bool):
+        text_value = str(value).strip()
+        if text_value:
+            out.append(text_value)
+
+
+def _search_document(session: Session, report: InvestigationReport) -> Dict[str, str]:
+    """The entities / summary / findings text indexed for a report."""
+    entities: List[str] = []
+    for value, attributes in session.query(EntityRecord.normalized_value, EntityRecord.attributes).filter(
+            EntityRecord.investigation_id == report.investigation_id):
+        if value:
+            entities.append(value)
+        _text_values(attributes or {}, entities)
+    summary = report.executive_summary
+    if summary is not None and not isinstance(summary, str):
+        summary = json.dumps(summary, default=str)
+    findings: List[str] = []
+    for name in ARCHIVED_REPORT_SECTIONS:
+        _text_values(getattr(report, name) or [], findings)
+    return {
+        "entities": "\n".join(dict.fromkeys(entities)),
+        "summary": summary or "",
+        "findings": "\n".join(dict.fromkeys(findings)),
+    }
+
+
+def _search_enabled(session: Session) -> bool:
+    return session.get_bind().dialect.name == "sqlite"
+
+
+def _index_report_text(session: Session, report: InvestigationReport):
+    """Replace the investigation's row in the full-text index with this report."""
+    if not _search_enabled(session):
+        return
+    entry = session.query(ReportSearchEntry).filter(
+        ReportSearchEntry.investigation_id == report.investigation_id
+    ).first()
+    if entry is None:
+        entry = ReportSearchEntry(investigation_id=report.investigation_id)
+        session.add(entry)
+        session.flush()
+    else:
+        session.execute(text("DELETE FROM report_search WHERE rowid = :rowid"), {"rowid": entry.id})
+    entry.report_id = report.report_id
+    entry.indexed_at = datetime.utcnow()
+    session.execute(text(
+        "INSERT INTO report_search (rowid, entities, summary, findings) "
+        "VALUES (:rowid, :entities, :summary, :findings)"
+    ), {"rowid": entry.id, **_search_document(session, report)})
+
+
+def _unindex_report_text(session: Session, investigation_id: str):
+    if not _search_enabled(session):
+        return
+    entry = session.query(ReportSearchEntry).filter(
+        ReportSearchEntry.investigation_id == investigation_id
+    ).first()
+    if entry is not None:
+        session.execute(text("DELETE FROM report_search WHERE rowid = :rowid"), {"rowid": entry.id})
+        session.delete(entry)
+
+
+def backfill_search_index(session: Session, batch_size: int = 100) -> int:
+    """Index the latest report of every investigation missing from the full-text index."""
+    if not _search_enabled(session):
+        return 0
+    missing = [row[0] for row in session.query(InvestigationReport.investigation_id).outerjoin(
+        ReportSearchEntry, ReportSearchEntry.investigation_id == InvestigationReport.investigation_id
+    ).filter(ReportSearchEntry.id.is_(None)).distinct()]
+    for count, investigation_id in enumerate(missing, 1):
+        report = session.query(InvestigationReport).filter(
+            InvestigationReport.investigation_id == investigation_id
+        ).order_by(InvestigationReport.created_at.desc()).first()
+        _index_report_text(session, report)
+        if count % batch_size == 0:
+            session.commit()
+            session.expunge_all()
+    session.commit()
+    return len(missing)
+
+
+def _add_missing_columns(bind):
+    """Add nullable columns introduced after a table was first created."""
+    inspector = inspect(bind)
+    with bind.begin() as connection:
+        for table in Base.metadata.sorted_tables:
+            if not inspector.has_table(table.name):
+                continue
+            existing = {column["name"] for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name not in existing and column.nullable:
+                    column_type = column.type.compile(dialect=bind.dialect)
+                    connection.execute(text(
+                        f"ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}"))
+                    logger.info(f"Added column {table.name}.{column.name}")
+
+
+def _add_missing_indexes(bind):
+    """Create indexes introduced after a table was first created."""
+    inspector = inspect(bind)
+    for table in Base.metadata.sorted_tables:
+        if not inspector.has_table(table.name):
+            continue
+        existing = {index["name"] for index in inspector.get_indexes(table.name)}
+        for index in table.indexes:
+            if index.name not in existing:
+                index.create(bind)
+                logger.info(f"Created index {index.name}")
 
 
 def init_db():
     """Initialize database tables."""
     try:
         Base.metadata.create_all(bind=engine)
+        _add_missing_columns(engine)
+        _add_missing_indexes(engine)
+        with SessionLocal() as session:
+            indexed = backfill_search_index(session)
+        if indexed:
+            logger.info(f"Added {indexed} existing reports to the full-text index")
         logger.info("Database tables initialized successfully")
     except Exception as e:
         logger.error(f"Failed to initialize database: {e}")
         raise
 
 
-def get_investigation(investigation_id: str, db: Session = None) -> Optional[Investigation]:
-    """Get investigation by ID."""
+def _with_new_session(operation: Callable[[Session], T]) -> T:
+    with SessionLocal() as db:
+        return operation(db)
+
+
+async def run_in_session(operation: Callable[[Session], T], db=None) -> T:
+    """
+    Run a sync-style operation on a session without blocking the event loop.
+
+    Args:
+        operation: Callable taking a sync Session
+        db: Optional AsyncSession or Session to use; a new one is opened otherwise
+    """
+    if HAS_ASYNC_DB and (db is None or isinstance(db, AsyncSession)):
+        if db is not None:
+            return await db.run_sync(operation)
+        async with AsyncSessionLocal() as session:
+            return await session.run_sync(operation)
+    loop = asyncio.get_running_loop()
     if db is None:
-        db = get_db()
-    
-    try:
-        return db.query(Investigation).filter(
+        return await loop.run_in_executor(_db_executor, _with_new_session, operation)
+    return await loop.run_in_executor(_db_executor, operation, db)
+
+
+async def get_investigation(investigation_id: str, db=None) -> Optional[Investigation]:
+    """Get investigation by ID."""
+    def operation(session: Session):
+        return session.query(Investigation).filter(
             Investigation.investigation_id == investigation_id
         ).first()
-    finally:
-        if db:
-            db.close()
+    return await run_in_session(operation, db)
+
 
+async def get_investigations(investigation_ids: List[str], db=None) -> List[Investigation]:
+    """Get several investigations by ID in one query."""
+    def operation(session: Session):
+        return session.query(Investigation).filter(
+            Investigation.investigation_id.in_(investigation_ids)
+        ).all()
+    return await run_in_session(operation, db)
 
-def save_investigation(investigation: Investigation, db: Session = None) -> Investigation:
+
+async def save_investigation(investigation: Investigation, db=None) -> Investigation:
     """Save investigation to database."""
-    close_session = False
-    if db is None:
-        db = get_db()
-        close_session = True
-    
-    try:
-        db.add(investigation)
-        db.commit()
-        db.refresh(investigation)
-        return investigation
-    except Exception as e:
-        db.rollback()
-        logger.error(f"Failed to save investigation: {e}")
-        raise
-    finally:
-        if close_session:
-            db.close()
+    def operation(session: Session):
+        try:
+            session.add(investigation)
+            session.commit()
+            session.refresh(investigation)
+            return investigation
+        except Exception as e:
+            session.rollback()
+            logger.error(f"Failed to save investigation: {e}")
+            raise
+    return await run_in_session(operation, db)
 
 
-def save_investigation_report(report: InvestigationReport, db: Session = None) -> InvestigationReport:
-    """Save investigation report to database."""
-    close_session = False
-    if db is None:
-        db = get_db()
-        close_session = True
-    
-    try:
-        db.add(report)
-        db.commit()
-        db.refresh(report)
-        return report
-    except Exception as e:
-        db.rollback()
-        logger.error(f"Failed to save investigation report: {e}")
-        raise
-    finally:
-        if close_session:
-            db.close()
+async def update_investigations(updates: Dict[str, Dict[str, Any]], db=None) -> int:
+    """Apply column updates to many investigations in one transaction; returns rows changed."""
+    def operation(session: Session):
+        try:
+            now = datetime.utcnow()
+            changed = 0
+            for investigation_id, values in updates.items():
+                changed += session.query(Investigation).filter(
+                    Investigation.investigation_id == investigation_id
+                ).update({**values, "updated_at": now}, synchronize_session=False)
+            session.commit()
+            return changed
+        except Exception as e:
+            session.rollback()
+            logger.error(f"Failed to update investigations: {e}")
+            raise
+    return await run_in_session(operation, db)
+
+
+async def save_investigation_report(report: InvestigationReport, db=None,
+                                    entities: Optional[List[Any]] = None,
+                                    relationships: Optional[List[Dict[str, str]]] = None) -> InvestigationReport:
+    """
+    Save investigation report to database.
+
+    When `entities` (pipeline Entity objects) are given, the investigation's
+    entities, sources and relationships are indexed in the same transaction;
+    relationships default to entities sharing a source URL. The report then
+    replaces the investigation's row in the full-text index.
+    """
+    def operation(session: Session):
+        try:
+            session.add(report)
+            if entities is not None:
+                _index_entities(session, report.investigation_id, entities, relationships)
+            session.flush()
+            _index_report_text(session, report)
+            session.commit()
+            session.refresh(report)
+            return report
+        except Exception as e:
+            session.rollback()
+            logger.error(f"Failed to save investigation report: {e}")
+            raise
+    return await run_in_session(operation, db)
 
 
-def get_investigation_report(investigation_id: str, db: Session = None) -> Optional[InvestigationReport]:
+async def get_investigation_report(investigation_id: str, db=None) -> Optional[InvestigationReport]:
     """Get latest report for investigation."""
-    close_session = False
-    if db is None:
-        db = get_db()
-        close_session = True
-    
-    try:
-        return db.query(InvestigationReport).filter(
+    def operation(session: Session):
+        return session.query(InvestigationReport).filter(
             InvestigationReport.investigation_id == investigation_id
         ).order_by(InvestigationReport.created_at.desc()).first()
-    finally:
-        if close_session:
-            db.close()
+    return await run_in_session(operation, db)
 
 
-def list_investigations(limit: int = 50, offset: int = 0, db: Session = None) -> List[Investigation]:
-    """List investigations."""
-    close_session = False
-    if db is None:
-        db = get_db()
-        close_session = True
-    
-    try:
-        return db.query(Investigation).order_by(
+async def get_latest_report_id(investigation_id: str, db=None) -> Optional[str]:
+    """ID of an investigation's latest report, without loading the report itself."""
+    def operation(session: Session):
+        return session.query(InvestigationReport.report_id).filter(
+            InvestigationReport.investigation_id == investigation_id
+        ).order_by(InvestigationReport.created_at.desc()).limit(1).scalar()
+    return await run_in_session(operation, db)
+
+
+async def get_report_ids(investigation_id: str, db=None) -> List[str]:
+    """IDs of every report saved for an investigation."""
+    def operation(session: Session):
+        return [row.report_id for row in session.query(InvestigationReport.report_id).filter(
+            InvestigationReport.investigation_id == investigation_id
+        )]
+    return await run_in_session(operation, db)
+
+
+async def existing_report_ids(report_ids: List[str], db=None) -> set:
+    """The subset of report_ids that still exist."""
+    ids = list(dict.fromkeys(report_ids))
+    def operation(session: Session):
+        found = set()
+        for start in range(0, len(ids), 500):
+            found.update(row.report_id for row in session.query(InvestigationReport.report_id).filter(
+                InvestigationReport.report_id.in_(ids[start:start + 500])
+            ))
+        return found
+    return await run_in_session(operation, db)
+
+
+async def list_investigations(limit: int = 50, offset: int = 0, status: Optional[str] = None,
+                              db=None) -> List[Investigation]:
+    """List investigations, optionally only those with a status."""
+    def operation(session: Session):
+        query = session.query(Investigation)
+        if status:
+            query = query.filter(Investigation.status == status)
+        return query.order_by(
             Investigation.created_at.desc()
         ).offset(offset).limit(limit).all()
-    finally:
-        if close_session:
-            db.close()
+    return await run_in_session(operation, db)
 
 
-def delete_investigation(investigation_id: str, db: Session = None) -> bool:
-    """Delete investigation and its reports."""
-    close_session = False
-    if db is None:
-        db = get_db()
-        close_session = True
-    
+@asynccontextmanager
+async def _borrowed(session):
+    """A caller's session used as a context manager without closing it."""
+    yield session
+
+
+def encode_cursor(created_at: datetime, investigation_id: str) -> str:
+    """Opaque pagination cursor for the position after an investigation."""
+    raw = json.dumps([created_at.isoformat(), investigation_id]).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, str]:
+    """Inverse of encode_cursor; raises ValueError for a malformed cursor."""
     try:
-        investigation = db.query(Investigation).filter(
-            Investigation.investigation_id == investigation_id
-        ).first()
-        
-        if investigation:
-            db.delete(investigation)
-            db.commit()
-            return True
-        return False
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        created_at, investigation_id = json.loads(raw)
+        return datetime.fromisoformat(created_at), str(investigation_id)
     except Exception as e:
-        db.rollback()
-        logger.error(f"Failed to delete investigation: {e}")
-        raise
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+
+
+def _newest_first(statement, cursor: Optional[str] = None, status: Optional[str] = None):
+    """Order newest first on (created_at, investigation_id), starting after `cursor`."""
+    if cursor:
+        statement = statement.where(tuple_(Investigation.created_at, Investigation.investigation_id)
+                                    < tuple_(*decode_cursor(cursor)))
+    if status:
+        statement = statement.where(Investigation.status == status)
+    return statement.order_by(Investigation.created_at.desc(), Investigation.investigation_id.desc())
+
+
+async def list_investigations_page(limit: int = 50, cursor: Optional[str] = None,
+                                   status: Optional[str] = None,
+                                   db=None) -> Tuple[List[Investigation], Optional[str]]:
+    """
+    One page of investigations, newest first, using keyset pagination.
+
+    Returns the page and the cursor for the next one (None on the last
+    page). Each page is an index range scan from the cursor, so deep pages
+    cost the same as the first.
+    """
+    def operation(session: Session):
+        statement = _newest_first(select(Investigation), cursor, status).limit(limit + 1)
+        investigations = list(session.execute(statement).scalars())
+        if len(investigations) <= limit:
+            return investigations, None
+        last = investigations[limit - 1]
+        return investigations[:limit], encode_cursor(last.created_at, last.investigation_id)
+    return await run_in_session(operation, db)
+
+
+async def stream_investigations(batch_size: int = 1000, status: Optional[str] = None,
+                                cursor: Optional[str] = None, db=None) -> AsyncIterator[List[Dict[str, Any]]]:
+    """
+    Yield every investigation (newest first) as dicts, `batch_size` at a time.
+
+    Rows come from a server-side cursor, as plain rows rather than ORM
+    objects, so memory stays constant however many investigations there are.
+    """
+    statement = _newest_first(select(*Investigation.__table__.columns), cursor, status)
+    statement = statement.execution_options(yield_per=batch_size)
+    if HAS_ASYNC_DB and (db is None or isinstance(db, AsyncSession)):
+        async with AsyncSessionLocal() if db is None else _borrowed(db) as session:
+            result = await session.stream(statement)
+            async for rows in result.partitions(batch_size):
+                yield [investigation_dict(row) for row in rows]
+        return
+
+    loop = asyncio.get_running_loop()
+    session = db if db is not None else SessionLocal()
+    try:
+        result = await loop.run_in_executor(_db_executor, session.execute, statement)
+        while True:
+            rows = await loop.run_in_executor(_db_executor, result.fetchmany, batch_size)
+            if not rows:
+                break
+            yield [investigation_dict(row) for row in rows]
+        await loop.run_in_executor(_db_executor, result.close)
     finally:
-        if close_session:
-            db.close()
+        if db is None:
+            await loop.run_in_executor(_db_executor, session.close)
+
+
+async def delete_investigation(investigation_id: str, db=None) -> bool:
+    """Delete investigation and its reports."""
+    def operation(session: Session):
+        try:
+            investigation = session.query(Investigation).filter(
+                Investigation.investigation_id == investigation_id
+            ).first()
+            
+            if investigation:
+                _unindex_report_text(session, investigation_id)
+                for model in (EntityRecord, EntitySource, EntityRelationship):
+                    session.query(model).filter(
+                        model.investigation_id == investigation_id
+                    ).delete(synchronize_session=False)
+                session.delete(investigation)
+                session.commit()
+                return True
+            return False
+        except Exception as e:
+            session.rollback()
+            logger.error(f"Failed to delete investigation: {e}")
+            raise
+    return await run_in_session(operation, db)
+
+
+async def find_entities(entity_type: str, value: str, db=None) -> List[EntityRecord]:
+    """Every indexed entity of a type with this value, across investigations."""
+    normalized = normalize_lookup_value(entity_type, value)
+    def operation(session: Session):
+        return session.query(EntityRecord).filter(
+            EntityRecord.entity_type == entity_type,
+            EntityRecord.normalized_value == normalized
+        ).order_by(EntityRecord.created_at.desc()).all()
+    return await run_in_session(operation, db)
+
+
+async def find_investigations_with_entity(entity_type: str, value: str, db=None) -> List[Investigation]:
+    """Investigations that found an entity, e.g. everything containing one email address."""
+    normalized = normalize_lookup_value(entity_type, value)
+    def operation(session: Session):
+        matching = session.query(EntityRecord.investigation_id).filter(
+            EntityRecord.entity_type == entity_type,
+            EntityRecord.normalized_value == normalized
+        )
+        return session.query(Investigation).filter(
+            Investigation.investigation_id.in_(matching)
+        ).order_by(Investigation.created_at.desc()).all()
+    return await run_in_session(operation, db)
+
+
+async def get_investigation_entities(investigation_id: str, entity_type: Optional[str] = None,
+                                     db=None) -> List[EntityRecord]:
+    """Indexed entities of one investigation, optionally of one type."""
+    def operation(session: Session):
+        query = session.query(EntityRecord).filter(EntityRecord.investigation_id == investigation_id)
+        if entity_type:
+            query = query.filter(EntityRecord.entity_type == entity_type)
+        return query.order_by(EntityRecord.id).all()
+    return await run_in_session(operation, db)
+
+
+async def get_entity_relationships(investigation_id: str, db=None) -> List[EntityRelationship]:
+    """Relationships recorded for one investigation."""
+    def operation(session: Session):
+        return session.query(EntityRelationship).filter(
+            EntityRelationship.investigation_id == investigation_id
+        ).order_by(EntityRelationship.id).all()
+    return await run_in_session(operation, db)
+
+
+class SearchUnavailableError(Exception):
+    """Raised when the database has no full-text index (anything but SQLite FTS5)."""
+
+
+# Private-use characters mark matches in snippets until the text is HTML-escaped
+_MARK_START, _MARK_END = "\ue000", "\ue001"
+
+
+def _highlight(snippet: Optional[str]) -> Optional[str]:
+    """HTML-escape a snippet, then turn its match sentinels into <mark> tags."""
+    if snippet is None:
+        return None
+    escaped = html.escape(snippet)
+    return escaped.replace(_MARK_START, "<mark>").replace(_MARK_END, "</mark>")
+
+
+def fts_query(query: str) -> str:
+    """
+    FTS5 MATCH expression for free text: every term must match, the last one
+    as a prefix. Terms are quoted, so operators and punctuation in emails or
+    domains are searched literally.
+    """
+    terms = [f'"{term}"' for term in re.findall(r'[^\s"]+', query)]
+    if terms:
+        terms[-1] += "*"
+    return " ".join(terms)
+
+
+async def search_reports(query: str, limit: int = 20, offset: int = 0, db=None) -> List[Dict[str, Any]]:
+    """
+    Ranked full-text search over indexed reports.
+
+    Returns one dict per matching investigation (best match first) with an
+    HTML-escaped snippet of the best-matching column, matches wrapped in
+    <mark> tags. Raises SearchUnavailableError when the database has no
+    full-text index.
+    """
+    match = fts_query(query)
+    if not match:
+        return []
+    def operation(session: Session):
+        if not _search_enabled(session):
+            raise SearchUnavailableError("Full-text search requires SQLite FTS5")
+        rows = session.execute(text(
+            "SELECT e.investigation_id, e.report_id, i.status, i.created_at, "
+            "report_search.rank AS rank, "
+            "snippet(report_search, -1, :mark_start, :mark_end, '…', 16) AS snippet "
+            "FROM report_search "
+            "JOIN report_search_entries e ON e.id = report_search.rowid "
+            "LEFT JOIN investigations i ON i.investigation_id = e.investigation_id "
+            "WHERE report_search MATCH :match "
+            "ORDER BY report_search.rank LIMIT :limit OFFSET :offset"
+        ), {"match": match, "limit": limit, "offset": offset,
+            "mark_start": _MARK_START, "mark_end": _MARK_END}).mappings()
+        return [{
+            "investigation_id": row["investigation_id"],
+            "report_id": row["report_id"],
+            "status": row["status"],
+            "created_at": row["created_at"],
+            "score": -row["rank"],
+            "snippet": _highlight(row["snippet"]),
+        } for row in rows]
+    return await run_in_session(operation, db)
+
+
+async def get_cached_entities(entity_hashes: List[str], db=None) -> Dict[str, tuple]:
+    """Unexpired entity_cache rows for the hashes: {hash: (normalized_entity, expires_at)}."""
+    hashes = list(dict.fromkeys(entity_hashes))
+    def operation(session: Session):
+        now = datetime.utcnow()
+        found = {}
+        for start in range(0, len(hashes), 500):
+            rows = session.query(
+                EntityCache.entity_hash, EntityCache.normalized_entity, EntityCache.expires_at
+            ).filter(
+                EntityCache.entity_hash.in_(hashes[start:start + 500]),
+                EntityCache.expires_at > now
+            )
+            found.update({row.entity_hash: (row.normalized_entity, row.expires_at) for row in rows})
+        return found
+    return await run_in_session(operation, db)
+
+
+async def save_cached_entities(entries: Dict[str, tuple], expires_at: datetime, db=None) -> int:
+    """Upsert entity_cache rows from {hash: (entity_type, entity_value, normalized_entity)}."""
+    def operation(session: Session):
+        try:
+            hashes = list(entries)
+            for start in range(0, len(hashes), 500):
+                session.query(EntityCache).filter(
+                    EntityCache.entity_hash.in_(hashes[start:start + 500])
+                ).delete(synchronize_session=False)
+            now = datetime.utcnow()
+            session.execute(insert(EntityCache), [
+                {"entity_hash": entity_hash, "entity_type": entity_type,
+                 "entity_value": (entity_value or "")[:500], "normalized_entity": normalized,
+                 "created_at": now, "expires_at": expires_at}
+                for entity_hash, (entity_type, entity_value, normalized) in entries.items()
+            ])
+            session.commit()
+            return len(entries)
+        except Exception as e:
+            session.rollback()
+            logger.error(f"Failed to save entity cache: {e}")
+            raise
+    if not entries:
+        return 0
+    return await run_in_session(operation, db)
+
+
+async def purge_expired_cache(batch_size: int = 1000, db=None) -> Dict[str, int]:
+    """
+    Delete expired search_query_cache and entity_cache rows.
+
+    Rows go in batches of `batch_size`, each in its own transaction, so a
+    large backlog never holds the write lock for long.
+    """
+    def operation(session: Session):
+        now = datetime.utcnow()
+        purged = {}
+        for model, key in ((SearchQueryCache, SearchQueryCache.query_hash),
+                           (EntityCache, EntityCache.entity_hash)):
+            total = 0
+            while True:
+                try:
+                    expired = session.query(key).filter(
+                        model.expires_at < now
+                    ).limit(batch_size).subquery()
+                    deleted = session.query(model).filter(
+                        key.in_(session.query(expired))
+                    ).delete(synchronize_session=False)
+                    session.commit()
+                except Exception as e:
+                    session.rollback()
+                    logger.error(f"Failed to purge {model.__tablename__}: {e}")
+                    raise
+                total += deleted
+                if deleted < batch_size:
+                    break
+            purged[model.__tablename__] = total
+        return purged
+    return await run_in_session(operation, db)
+
+
+async def archive_old_reports(older_than_days: float, batch_size: int = 100, db=None) -> int:
+    """
+    Compress the JSON sections of reports older than `older_than_days`.
+
+    The sections move into archived_sections (zstd when zstandard is
+    installed, zlib otherwise) and the JSON columns are cleared; loading an
+    archived report decompresses it transparently. Returns reports archived.
+    """
+    def operation(session: Session):
+        cutoff = datetime.utcnow() - timedelta(days=older_than_days)
+        archived = 0
+        while True:
+            try:
+                reports = session.query(InvestigationReport).filter(
+                    InvestigationReport.created_at < cutoff,
+                    InvestigationReport.archived_sections.is_(None)
+                ).order_by(InvestigationReport.created_at).limit(batch_size).all()
+                for report in reports:
+                    blob, codec = compress_sections(
+                        {name: getattr(report, name) for name in ARCHIVED_REPORT_SECTIONS})
+                    report.archived_sections = blob
+                    report.archive_codec = codec
+                    for name in ARCHIVED_REPORT_SECTIONS:
+                        setattr(report, name, null())  # SQL NULL, not JSON 'null'
+                session.commit()
+            except Exception as e:
+                session.rollback()
+                logger.error(f"Failed to archive reports: {e}")
+                raise
+            # Archived rows must not stay in the identity map with cleared sections
+            for report in reports:
+                session.expunge(report)
+            archived += len(reports)
+            if len(reports) < batch_size:
+                return archived
+    return await run_in_session(operation, db)
+
+
+def _compact(bind, vacuum_pages: int) -> Dict[str, Any]:
+    with bind.connect().execution_options(isolation_level="AUTOCOMMIT") as connection:
+        if bind.dialect.name != "sqlite":
+            connection.exec_driver_sql("ANALYZE")
+            return {"analyzed": True}
+        result = {}
+        if connection.exec_driver_sql("PRAGMA auto_vacuum").scalar() == 2:
+            free_before = connection.exec_driver_sql("PRAGMA freelist_count").scalar()
+            connection.exec_driver_sql(f"PRAGMA incremental_vacuum({int(vacuum_pages)})")
+            result["pages_freed"] = free_before - connection.exec_driver_sql("PRAGMA freelist_count").scalar()
+        else:
+            # Converting needs a full VACUUM, which locks the database; that is an
+            # explicit admin step (python -m src.api.maintenance enable-incremental-vacuum)
+            logger.warning("Incremental auto-vacuum is not enabled on this database; skipping vacuum")
+            result["incremental_vacuum"] = False
+        connection.exec_driver_sql("PRAGMA optimize")
+        connection.exec_driver_sql("PRAGMA wal_checkpoint(TRUNCATE)").fetchall()
+        result["analyzed"] = True
+        return result
+
+
+def enable_incremental_vacuum(bind=None) -> bool:
+    """
+    Convert a SQLite database created without incremental auto-vacuum.
+
+    Runs a full VACUUM, which rewrites the file and holds an exclusive lock
+    for its duration; run it during a maintenance window. Returns whether a
+    conversion was needed.
+    """
+    bind = bind or engine
+    if bind.dialect.name != "sqlite":
+        return False
+    with bind.connect().execution_options(isolation_level="AUTOCOMMIT") as connection:
+        if connection.exec_driver_sql("PRAGMA auto_vacuum").scalar() == 2:
+            return False
+        logger.info("Converting database to incremental auto-vacuum (full VACUUM)")
+        connection.exec_driver_sql("PRAGMA auto_vacuum=INCREMENTAL")
+        connection.exec_driver_sql("VACUUM")
+    # Pooled connections may hold statements prepared against the old header
+    bind.dispose()
+    return True
+
+
+async def compact_database(vacuum_pages: int = 2000, bind=None) -> Dict[str, Any]:
+    """
+    Return free pages to the filesystem and refresh planner statistics.
+
+    SQLite: incremental_vacuum of up to `vacuum_pages` pages, PRAGMA optimize
+    and a WAL checkpoint. Other databases: ANALYZE (their own autovacuum
+    reclaims space).
+    """
+    if IS_MEMORY_SQLITE and bind is None:
+        return {}
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_db_executor, _compact, bind or engine, vacuum_pages)
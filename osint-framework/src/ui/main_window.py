@@ -11,6 +11,7 @@ import os
 import json
 import asyncio
 import logging
+from collections import Counter
 from datetime import datetime
 from typing import Optional, Dict, Any
 
@@ -813,7 +814,8 @@ class MainWindow(QMainWindow):
         }
 
         display_name = stage_names.get(stage, stage)
-        status_icon = "🟢" if status == "complete" else "🔵" if status == "running" else "⚪"
+        status_icons = {"complete": "🟢", "cached": "🟢", "running": "🔵", "timeout": "🟠", "failed": "🔴"}
+        status_icon = status_icons.get(status, "⚪")
 
         # Update or add to stage list
         found = False
@@ -1005,12 +1007,15 @@ class MainWindow(QMainWindow):
             self.graph_canvas.draw()
 
             # Entity table
+            connections = Counter()
+            for rel in result.relationships:
+                connections[rel["source"]] += 1
+                connections[rel["target"]] += 1
             self.entity_table.setRowCount(len(result.entities))
             for i, entity in enumerate(result.entities):
                 self.entity_table.setItem(i, 0, QTableWidgetItem(entity.get("type", "")))
                 self.entity_table.setItem(i, 1, QTableWidgetItem(entity.get("value", "")))
-                connections = sum(1 for r in result.relationships if r["source"] == entity["id"] or r["target"] == entity["id"])
-                self.entity_table.setItem(i, 2, QTableWidgetItem(str(connections)))
+                self.entity_table.setItem(i, 2, QTableWidgetItem(str(connections[entity["id"]])))
                 self.entity_table.setItem(i, 3, QTableWidgetItem("primary" if entity.get("is_target") else "derived"))
 
         except Exception as e:
@@ -1119,9 +1124,7 @@ class MainWindow(QMainWindow):
     def _load_investigation(self):
         path, _ = QFileDialog.getOpenFileName(self, "Open Investigation", "", "OSINT Files (*.osint);;JSON (*.json)")
         if path:
-            with open(path, "r") as f:
-                data = json.load(f)
-            self.current_result = InvestigationResult(**{k: v for k, v in data.items() if k in InvestigationResult.__dataclass_fields__})
+            self.current_result = InvestigationResult.load(path)
             self._populate_recon_tab(self.current_result)
             self._populate_graph_tab(self.current_result)
             self._populate_timeline_tab(self.current_result)
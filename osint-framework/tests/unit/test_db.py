@@ -0,0 +1,384 @@
+"""
+Unit tests for the database layer
+
+Tests:
+- SQLite connection tuning (WAL, synchronous, cache)
+- Async CRUD helpers against a real SQLite database
+- Reads proceed while a write transaction is open
+- Helpers run on an AsyncSession when aiosqlite and greenlet are installed
+- Normalized entity, source and relationship tables and cross-case lookups
+- Storage maintenance: cache purge, report archival, incremental vacuum
+- Full-text report search: ranking, snippets, reindexing and backfill
+- Keyset pagination and streamed export of investigations
+"""
+
+import pytest
+import sys
+import asyncio
+import sqlite3
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+
+from src.db import (
+    Base, Investigation, InvestigationReport, async_database_url, _set_sqlite_pragmas, HAS_ASYNC_DB,
+    get_investigation, get_investigations, save_investigation, save_investigation_report,
+    get_investigation_report, list_investigations, delete_investigation,
+    EntityRecord, EntitySource, find_entities, find_investigations_with_entity,
+    get_investigation_entities, get_entity_relationships,
+    SearchQueryCache, purge_expired_cache, archive_old_reports, compact_database, init_db,
+    enable_incremental_vacuum,
+    _add_missing_columns, search_reports, fts_query, backfill_search_index,
+    list_investigations_page, stream_investigations, decode_cursor
+)
+from src.core.models.entities import Entity, EntityType
+
+
+def _sqlite_sessions(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'osint.db'}",
+                           connect_args={"check_same_thread": False})
+    event.listen(engine, "connect", _set_sqlite_pragmas)
+    Base.metadata.create_all(engine)
+    return engine, sessionmaker(bind=engine, expire_on_commit=False)
+
+
+class TestDatabaseLayer:
+    """Test engine tuning and the async helpers."""
+
+    def test_sqlite_pragmas(self, tmp_path):
+        """File databases run in WAL mode with relaxed sync and a larger cache."""
+        engine, _ = _sqlite_sessions(tmp_path)
+        with engine.connect() as conn:
+            assert conn.exec_driver_sql("PRAGMA journal_mode").scalar() == "wal"
+            assert conn.exec_driver_sql("PRAGMA synchronous").scalar() == 1  # NORMAL
+            assert conn.exec_driver_sql("PRAGMA cache_size").scalar() < -2000
+        assert async_database_url("sqlite:///./x.db") == "sqlite+aiosqlite:///./x.db"
+        assert async_database_url("postgresql://u@h/db") == "postgresql+asyncpg://u@h/db"
+
+    def test_async_crud_round_trip(self, tmp_path):
+        """Helpers are awaitable and work with a caller-provided session."""
+        _, Sessions = _sqlite_sessions(tmp_path)
+
+        async def scenario():
+            db = Sessions()
+            for i in range(3):
+                await save_investigation(Investigation(investigation_id=f"inv-{i}",
+                                                       correlation_id=f"c-{i}", status="pending"), db)
+            await save_investigation_report(InvestigationReport(report_id="r-1", investigation_id="inv-1",
+                                                                executive_summary="ok"), db)
+            found = await get_investigation("inv-1", db)
+            several = await get_investigations(["inv-0", "inv-2", "missing"], db)
+            report = await get_investigation_report("inv-1", db)
+            deleted = await delete_investigation("inv-0", db)
+            remaining = await list_investigations(limit=10, db=db)
+            db.close()
+            return found, several, report, deleted, remaining
+
+        found, several, report, deleted, remaining = asyncio.run(scenario())
+        assert found.correlation_id == "c-1"
+        assert sorted(inv.investigation_id for inv in several) == ["inv-0", "inv-2"]
+        assert report.report_id == "r-1" and deleted
+        assert sorted(inv.investigation_id for inv in remaining) == ["inv-1", "inv-2"]
+
+    def test_reads_during_open_write(self, tmp_path):
+        """With WAL a reader is not blocked by a writer holding the exclusive lock."""
+        def read_during_write(path, wal):
+            engine = create_engine(f"sqlite:///{path}", connect_args={"timeout": 0.1})
+            if wal:
+                event.listen(engine, "connect", _set_sqlite_pragmas)
+            Base.metadata.create_all(engine)
+            Sessions = sessionmaker(bind=engine)
+            with Sessions() as db:
+                db.add(Investigation(investigation_id="inv", correlation_id="c", status="running"))
+                db.commit()
+
+            # EXCLUSIVE is the lock a commit takes; without WAL it shuts readers out
+            writer = sqlite3.connect(str(path), timeout=0.1)
+            writer.execute("BEGIN EXCLUSIVE")
+            writer.execute("UPDATE investigations SET status = 'completed'")
+            try:
+                with Sessions() as db:
+                    return asyncio.run(get_investigation("inv", db)).status
+            finally:
+                writer.rollback()
+                writer.close()
+                engine.dispose()
+
+        assert read_during_write(tmp_path / "wal.db", wal=True) == "running"
+        with pytest.raises(OperationalError, match="database is locked"):
+            read_during_write(tmp_path / "rollback.db", wal=False)
+
+    @pytest.mark.skipif(not HAS_ASYNC_DB, reason="aiosqlite and greenlet are required")
+    def test_helpers_on_async_session(self, tmp_path):
+        """Helpers run their work through AsyncSession.run_sync on the async engine."""
+        from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+        async def scenario():
+            engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'async.db'}")
+            event.listen(engine.sync_engine, "connect", _set_sqlite_pragmas)
+            async with engine.begin() as conn:
+                await conn.run_sync(Base.metadata.create_all)
+            Sessions = async_sessionmaker(engine, expire_on_commit=False)
+            async with Sessions() as db:
+                await save_investigation(Investigation(investigation_id="inv", correlation_id="c",
+                                                       status="pending"), db)
+                found = await get_investigation("inv", db)
+                listed = await list_investigations(limit=10, db=db)
+            await engine.dispose()
+            return found, listed
+
+        found, listed = asyncio.run(scenario())
+        assert found.correlation_id == "c"
+        assert [inv.investigation_id for inv in listed] == ["inv"]
+
+
+def _entity(entity_type, urls=(), **attributes):
+    entity = Entity(entity_type=entity_type, attributes=attributes, confidence_score=80.0)
+    for url in urls:
+        entity.add_source(url, "search", 70.0)
+    return entity
+
+
+class TestEntityIndex:
+    """Test the normalized entity tables filled when reports are saved."""
+
+    def test_report_entities_are_indexed_and_queryable(self, tmp_path):
+        """Entities from two investigations are found by normalized value."""
+        _, Sessions = _sqlite_sessions(tmp_path)
+        email = _entity(EntityType.EMAIL_ADDRESS, ["https://a.example/team"], email="Jane.Doe@Example.com")
+        profile = _entity(EntityType.SOCIAL_PROFILE, ["https://a.example/team"],
+                          url="https://github.com/JaneDoe/", platform="github")
+        phone = _entity(EntityType.PHONE_NUMBER, phone="+1 (555) 010-0000")
+        other_email = _entity(EntityType.EMAIL_ADDRESS, email="jane.doe@example.com")
+
+        async def scenario():
+            db = Sessions()
+            for inv_id in ("inv-a", "inv-b"):
+                await save_investigation(Investigation(investigation_id=inv_id, correlation_id=f"c-{inv_id}",
+                                                       status="completed"), db)
+            await save_investigation_report(InvestigationReport(report_id="r-a", investigation_id="inv-a"),
+                                            db, entities=[email, profile, phone])
+            await save_investigation_report(InvestigationReport(report_id="r-b", investigation_id="inv-b"),
+                                            db, entities=[other_email])
+            found = await find_investigations_with_entity("email_address", " JANE.DOE@example.com", db)
+            by_phone = await find_entities("phone_number", "+15550100000", db)
+            entities = await get_investigation_entities("inv-a", db=db)
+            relationships = await get_entity_relationships("inv-a", db)
+            sources = db.query(EntitySource).filter(EntitySource.investigation_id == "inv-a").count()
+            await delete_investigation("inv-b", db)
+            after_delete = await find_investigations_with_entity("email_address", "jane.doe@example.com", db)
+            leftover = db.query(EntityRecord).filter(EntityRecord.investigation_id == "inv-b").count()
+            db.close()
+            return found, by_phone, entities, relationships, sources, after_delete, leftover
+
+        found, by_phone, entities, relationships, sources, after_delete, leftover = asyncio.run(scenario())
+        assert sorted(inv.investigation_id for inv in found) == ["inv-a", "inv-b"]
+        assert [e.entity_id for e in by_phone] == [phone.id]
+        assert [e.normalized_value for e in entities] == [
+            "jane.doe@example.com", "https://github.com/janedoe", "+15550100000"]
+        # The email and the profile were both seen on the team page
+        assert [r.to_dict() for r in relationships] == [{
+            "source": min(email.id, profile.id), "target": max(email.id, profile.id), "type": "same_source"}]
+        assert sources == 2
+        assert [inv.investigation_id for inv in after_delete] == ["inv-a"] and leftover == 0
+
+
+class TestInvestigationPaging:
+    """Test cursor pages and the streaming export."""
+
+    def _seed(self, Sessions, count=25):
+        db = Sessions()
+        base = datetime(2026, 1, 1)
+        # Pairs share a created_at, so the investigation_id tie-break matters
+        db.add_all([Investigation(investigation_id=f"inv-{i:03d}", correlation_id=f"c-{i}",
+                                  status="completed" if i % 3 else "failed",
+                                  created_at=base + timedelta(minutes=i // 2)) for i in range(count)])
+        db.commit()
+        return db
+
+    def test_cursor_pages_cover_every_row_once(self, tmp_path):
+        """Walking next_cursor returns each investigation once, newest first."""
+        _, Sessions = _sqlite_sessions(tmp_path)
+        db = self._seed(Sessions)
+
+        async def walk(**filters):
+            seen, cursor = [], None
+            while True:
+                page, cursor = await list_investigations_page(limit=10, cursor=cursor, db=db, **filters)
+                seen.extend(inv.investigation_id for inv in page)
+                if cursor is None:
+                    return seen
+
+        everything = asyncio.run(walk())
+        assert everything == [f"inv-{i:03d}" for i in reversed(range(25))]
+        failed = asyncio.run(walk(status="failed"))
+        assert failed == [f"inv-{i:03d}" for i in reversed(range(0, 25, 3))]
+        by_offset = asyncio.run(list_investigations(limit=3, offset=2, status="failed", db=db))
+        assert [inv.investigation_id for inv in by_offset] == failed[2:5]
+        with pytest.raises(ValueError):
+            decode_cursor("not-a-cursor")
+        db.close()
+
+    def test_stream_yields_bounded_batches(self, tmp_path):
+        """The export stream yields plain dicts in batches of at most batch_size."""
+        _, Sessions = _sqlite_sessions(tmp_path)
+        db = self._seed(Sessions)
+
+        async def collect():
+            return [batch async for batch in stream_investigations(batch_size=7, db=db)]
+
+        batches = asyncio.run(collect())
+        assert [len(batch) for batch in batches] == [7, 7, 7, 4]
+        rows = [row for batch in batches for row in batch]
+        assert rows[0]["investigation_id"] == "inv-024" and rows[-1]["investigation_id"] == "inv-000"
+        assert rows[0] == db.query(Investigation).filter_by(investigation_id="inv-024").one().to_dict()
+        db.close()
+
+
+class TestReportSearch:
+    """Test the FTS5 index kept in step with saved reports."""
+
+    def test_ranked_search_with_snippets(self, tmp_path):
+        """Entity matches outrank findings; saving again replaces the indexed text."""
+        _, Sessions = _sqlite_sessions(tmp_path)
+        jane = _entity(EntityType.EMAIL_ADDRESS, email="jane.doe@example.com")
+
+        async def scenario():
+            db = Sessions()
+            for inv_id in ("inv-a", "inv-b", "inv-c"):
+                await save_investigation(Investigation(investigation_id=inv_id, correlation_id=f"c-{inv_id}",
+                                                       status="completed"), db)
+            await save_investigation_report(InvestigationReport(
+                report_id="r-a", investigation_id="inv-a", executive_summary="Exposure review",
+                detailed_findings=[{"note": "Jane Doe listed on a <b>conference</b> page"}]), db, entities=[])
+            await save_investigation_report(InvestigationReport(
+                report_id="r-b", investigation_id="inv-b", executive_summary="Breach exposure",
+                detailed_findings=[{"note": "credentials leaked"}]), db, entities=[jane])
+            await save_investigation_report(InvestigationReport(
+                report_id="r-c", investigation_id="inv-c", executive_summary="Unrelated company"), db)
+            by_name = await search_reports("jane doe", db=db)
+            by_email = await search_reports("jane.doe@example.com", db=db)
+            prefix = await search_reports("expos", db=db)
+            await save_investigation_report(InvestigationReport(
+                report_id="r-a2", investigation_id="inv-a", executive_summary="Rerun: nothing found"), db)
+            rerun = await search_reports("conference", db=db)
+            await delete_investigation("inv-b", db)
+            deleted = await search_reports("credentials", db=db)
+            db.close()
+            return by_name, by_email, prefix, rerun, deleted
+
+        by_name, by_email, prefix, rerun, deleted = asyncio.run(scenario())
+        assert [r["investigation_id"] for r in by_name] == ["inv-b", "inv-a"]
+        assert by_name[0]["score"] > by_name[1]["score"]
+        assert "<mark>Jane</mark> <mark>Doe</mark>" in by_name[1]["snippet"]
+        assert "&lt;b&gt;conference&lt;/b&gt;" in by_name[1]["snippet"]  # report text is escaped
+        assert [r["investigation_id"] for r in by_email] == ["inv-b"]
+        assert sorted(r["investigation_id"] for r in prefix) == ["inv-a", "inv-b"]
+        assert rerun == [] and deleted == []
+        assert fts_query('name" OR x') == '"name" "OR" "x"*'
+
+    def test_backfill_indexes_existing_reports(self, tmp_path):
+        """Reports saved before the index existed are added once."""
+        _, Sessions = _sqlite_sessions(tmp_path)
+        db = Sessions()
+        db.add(Investigation(investigation_id="inv-old", correlation_id="c-old", status="completed"))
+        db.add(InvestigationReport(report_id="r-old", investigation_id="inv-old",
+                                   executive_summary="Legacy findings for acme.example"))
+        db.commit()
+
+        assert backfill_search_index(db) == 1
+        assert backfill_search_index(db) == 0
+        results = asyncio.run(search_reports("acme.example", db=db))
+        assert [r["report_id"] for r in results] == ["r-old"]
+        db.close()
+
+
+class TestStorageMaintenance:
+    """Test the retention, archival and compaction helpers."""
+
+    def test_purge_expired_cache_in_batches(self, tmp_path):
+        """Only expired rows are deleted, across several batches."""
+        _, Sessions = _sqlite_sessions(tmp_path)
+        db = Sessions()
+        now = datetime.utcnow()
+        db.add_all([SearchQueryCache(query_hash=f"q{i}", source_name="test",
+                                     expires_at=now + timedelta(hours=-1 if i < 25 else 1))
+                    for i in range(30)])
+        db.commit()
+
+        purged = asyncio.run(purge_expired_cache(batch_size=10, db=db))
+        assert purged == {"search_query_cache": 25, "entity_cache": 0}
+        assert db.query(SearchQueryCache).count() == 5
+        db.close()
+
+    def test_old_reports_are_archived_and_read_back(self, tmp_path):
+        """Archived sections are compressed in storage and restored on load."""
+        engine, Sessions = _sqlite_sessions(tmp_path)
+        findings = [{"finding": f"exposed record {i}", "severity": "high"} for i in range(200)]
+        db = Sessions()
+        db.add(Investigation(investigation_id="inv-old", correlation_id="c-old", status="completed"))
+        db.add(InvestigationReport(report_id="r-old", investigation_id="inv-old",
+                                   created_at=datetime.utcnow() - timedelta(days=45),
+                                   identity_inventory={"emails": ["a@example.com"]},
+                                   detailed_findings=findings))
+        db.add(InvestigationReport(report_id="r-new", investigation_id="inv-old",
+                                   detailed_findings=findings))
+        db.commit()
+        db.close()
+
+        archived = asyncio.run(archive_old_reports(30, db=Sessions()))
+        assert archived == 1
+        with engine.connect() as conn:
+            rows = dict(conn.exec_driver_sql(
+                "SELECT report_id, detailed_findings IS NULL FROM investigation_reports").fetchall())
+            blob = conn.exec_driver_sql(
+                "SELECT archived_sections FROM investigation_reports WHERE report_id = 'r-old'").scalar()
+        assert rows == {"r-old": 1, "r-new": 0}
+        assert len(blob) < len(str(findings)) / 5
+
+        db = Sessions()
+        report = db.query(InvestigationReport).filter_by(report_id="r-old").one()
+        assert report.detailed_findings == findings
+        assert report.to_dict()["identity_inventory"] == {"emails": ["a@example.com"]}
+        db.commit()  # loading must not rewrite the archived row
+        assert asyncio.run(archive_old_reports(30, db=db)) == 0
+        db.close()
+
+    def test_compaction_and_schema_upgrade(self, tmp_path):
+        """Old databases gain new columns; only an explicit step switches them to incremental vacuum."""
+        engine = create_engine(f"sqlite:///{tmp_path / 'legacy.db'}")
+        with engine.begin() as conn:
+            conn.exec_driver_sql("CREATE TABLE investigation_reports (report_id VARCHAR(36) PRIMARY KEY)")
+            conn.exec_driver_sql("CREATE TABLE filler (payload TEXT)")
+            conn.exec_driver_sql("INSERT INTO filler VALUES (zeroblob(400000))")
+            conn.exec_driver_sql("DROP TABLE filler")
+        _add_missing_columns(engine)
+
+        skipped = asyncio.run(compact_database(vacuum_pages=100, bind=engine))
+        with engine.connect() as conn:
+            columns = {row[1] for row in conn.exec_driver_sql("PRAGMA table_info(investigation_reports)")}
+            before = conn.exec_driver_sql("PRAGMA auto_vacuum").scalar()
+        assert {"archived_sections", "archive_codec"} <= columns
+        assert skipped["incremental_vacuum"] is False and skipped["analyzed"] and before == 0
+
+        assert enable_incremental_vacuum(engine) is True
+        assert enable_incremental_vacuum(engine) is False
+        result = asyncio.run(compact_database(vacuum_pages=100, bind=engine))
+        assert "pages_freed" in result
+
+    def test_new_databases_use_incremental_vacuum(self, tmp_path):
+        """The connect hook enables incremental auto-vacuum before WAL writes the header."""
+        engine, _ = _sqlite_sessions(tmp_path)
+        with engine.connect() as conn:
+            assert conn.exec_driver_sql("PRAGMA auto_vacuum").scalar() == 2
+            assert conn.exec_driver_sql("PRAGMA journal_mode").scalar() == "wal"
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "-s"])
@@ -0,0 +1,341 @@
+"""
+Unit tests for the API investigation job queue
+
+Tests:
+- Worker pool bounds concurrent investigations
+- Round-robin fairness across tenants and queue positions
+- Admission control when the queue is full
+- Durable queue backends: fair claims, compare-and-set, stale job requeue
+- Worker processes' job loop and concurrency bound
+- Worker processes write pending status updates on shutdown
+"""
+
+import pytest
+import sys
+import asyncio
+from pathlib import Path
+from types import SimpleNamespace
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from datetime import datetime, timedelta
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from src.api.jobs import InvestigationQueue, QueueFullError
+from src.api.job_queue import MemoryJobQueue, DatabaseJobQueue
+from src.api.status_writer import StatusWriter
+from src.api.worker import InvestigationWorker, stop_pipeline
+from src.db import Base, InvestigationJob
+
+
+def _database_queue(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'jobs.db'}")
+    Base.metadata.create_all(engine)
+    return DatabaseJobQueue(sessionmaker(bind=engine, expire_on_commit=False))
+
+
+class TestInvestigationQueue:
+    """Test admission, fairness and worker bounds."""
+
+    def test_positions_follow_round_robin(self):
+        """A burst from one tenant does not push another tenant's job to the back."""
+        async def scenario():
+            queue = InvestigationQueue(workers=1, max_pending=10)
+            started = []
+            gate = asyncio.Event()
+
+            def job(name):
+                async def run():
+                    started.append(name)
+                    await gate.wait()
+                return run
+
+            for i in range(3):
+                queue.submit(f"a{i}", "tenant-a", job(f"a{i}"))
+            queue.submit("b0", "tenant-b", job("b0"))
+            await asyncio.sleep(0)  # the single worker takes a0
+
+            # tenant-a was just served, so tenant-b goes next
+            assert queue.position("b0") == 1
+            assert queue.position("a1") == 2
+            assert queue.position("a2") == 3
+            assert queue.position("a0") is None
+
+            gate.set()
+            while queue.pending or queue.running:
+                await asyncio.sleep(0.01)
+            await queue.stop()
+            return started
+
+        assert asyncio.run(scenario()) == ["a0", "b0", "a1", "a2"]
+
+    def test_workers_bound_concurrency(self):
+        """No more than `workers` jobs run at once."""
+        async def scenario():
+            queue = InvestigationQueue(workers=2, max_pending=20)
+            running = peak = 0
+
+            async def run():
+                nonlocal running, peak
+                running += 1
+                peak = max(peak, running)
+                await asyncio.sleep(0.01)
+                running -= 1
+
+            for i in range(8):
+                queue.submit(f"job{i}", f"tenant{i % 3}", run)
+            while queue.pending or queue.running:
+                await asyncio.sleep(0.01)
+            await queue.stop()
+            return peak, queue.completed
+
+        assert asyncio.run(scenario()) == (2, 8)
+
+    def test_rejects_when_full(self):
+        """Overall and per-tenant limits raise QueueFullError with a retry hint."""
+        async def scenario():
+            queue = InvestigationQueue(workers=1, max_pending=3, max_pending_per_tenant=2)
+            blocker = asyncio.Event()
+            queue.submit("running", "a", blocker.wait)
+            await asyncio.sleep(0)
+            queue.submit("a1", "a", blocker.wait)
+            queue.submit("a2", "a", blocker.wait)
+            with pytest.raises(QueueFullError) as tenant_full:
+                queue.submit("a3", "a", blocker.wait)
+            queue.submit("b1", "b", blocker.wait)
+            with pytest.raises(QueueFullError) as queue_full:
+                queue.submit("c1", "c", blocker.wait)
+            await queue.stop()
+            return tenant_full.value, queue_full.value, queue.stats()
+
+        tenant_full, queue_full, stats = asyncio.run(scenario())
+        assert "tenant" in str(tenant_full) and queue_full.retry_after >= 1
+        assert stats["rejected"] == 2 and stats["pending"] == 3
+
+
+class TestDurableJobQueue:
+    """Test the backends shared by the API and the worker processes."""
+
+    @pytest.mark.parametrize("backend", ["memory", "database"])
+    def test_claims_are_fair_and_exclusive(self, backend, tmp_path):
+        """Jobs alternate between tenants and each is claimed exactly once."""
+        queue = MemoryJobQueue() if backend == "memory" else _database_queue(tmp_path)
+        for i in range(3):
+            queue.enqueue(f"a{i}", "tenant-a", {"n": i})
+        queue.enqueue("b0", "tenant-b", {})
+        assert queue.pending_count() == 4 and queue.pending_count("tenant-a") == 3
+
+        first = queue.claim("w1")
+        assert (first.job_id, first.payload, first.attempts) == ("a0", {"n": 0}, 1)
+        assert queue.position("b0") == 1
+        claimed = [queue.claim(f"w{i}").job_id for i in range(3)]
+        assert claimed == ["b0", "a1", "a2"]
+        assert queue.claim("w1") is None and queue.pending_count() == 0
+
+    def test_database_requeues_stale_jobs(self, tmp_path):
+        """A job whose worker stopped heartbeating is requeued, then failed after max attempts."""
+        queue = _database_queue(tmp_path)
+        queue.max_attempts = 2
+        queue.enqueue("job", "tenant", {})
+
+        def expire():
+            with queue._session_factory() as db:
+                db.get(InvestigationJob, "job").heartbeat_at = datetime.utcnow() - timedelta(hours=1)
+                db.commit()
+
+        queue.claim("lost-worker")
+        assert queue.requeue_stale(60) == (0, [])  # still heartbeating
+        expire()
+        assert queue.requeue_stale(60) == (1, [])
+        assert queue.claim("w2").attempts == 2
+        expire()
+        requeued, abandoned = queue.requeue_stale(60)
+        assert requeued == 0 and [job.job_id for job in abandoned] == ["job"]
+        with queue._session_factory() as db:
+            job = db.get(InvestigationJob, "job")
+            assert job.status == "failed" and "worker lost" in job.error
+
+    @pytest.mark.parametrize("backend", ["memory", "database"])
+    def test_only_the_owner_heartbeats_and_completes(self, backend, tmp_path):
+        """A stalled worker whose job was requeued can neither heartbeat nor complete it."""
+        queue = MemoryJobQueue() if backend == "memory" else _database_queue(tmp_path)
+        queue.enqueue("job", "tenant", {})
+        queue.claim("stalled")
+        assert queue.heartbeat("job", "stalled")
+        requeued, _ = queue.requeue_stale(-1)
+        assert requeued == 1
+        queue.claim("w2")
+        assert not queue.heartbeat("job", "stalled")
+        assert not queue.complete("job", "stalled", "late")
+        assert queue.heartbeat("job", "w2") and queue.complete("job", "w2")
+        assert not queue.complete("job", "w2")
+
+    def test_admission_limits(self):
+        """Durable queues reject like the in-process queue."""
+        queue = MemoryJobQueue()
+        queue.enqueue("a1", "a", {})
+        with pytest.raises(QueueFullError):
+            queue.check_admission("a", max_pending=5, max_pending_per_tenant=1)
+        with pytest.raises(QueueFullError):
+            queue.check_admission("b", max_pending=1, max_pending_per_tenant=5)
+        queue.check_admission("b", max_pending=5, max_pending_per_tenant=5)
+
+
+class TestInvestigationWorker:
+    """Test the worker loop that runs queued jobs."""
+
+    def test_runs_jobs_with_bounded_concurrency(self):
+        """All jobs run, at most `concurrency` at a time, and are completed in the queue."""
+        queue = MemoryJobQueue()
+        for i in range(6):
+            queue.enqueue(f"job{i}", f"tenant{i % 2}", {"fail": i == 3})
+        running = peak = 0
+
+        async def execute(job):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.02)
+            running -= 1
+            if job.payload["fail"]:
+                raise RuntimeError("boom")
+
+        updates = {}
+
+        async def update(values):
+            updates.update(values)
+
+        async def scenario():
+            worker = InvestigationWorker(queue, "w1", concurrency=2, poll_interval=0.01,
+                                         heartbeat_interval=0.005, execute=execute, update=update)
+            stop = asyncio.Event()
+            task = asyncio.create_task(worker.run(stop))
+            while len(queue.finished) < 6:
+                await asyncio.sleep(0.01)
+            stop.set()
+            await task
+            return worker
+
+        worker = asyncio.run(scenario())
+        assert peak == 2
+        assert (worker.completed, worker.failed) == (5, 1)
+        assert queue.finished["job3"] == "boom"
+        assert list(updates) == ["job3"]
+        assert updates["job3"]["status"] == "failed" and updates["job3"]["errors"] == ["boom"]
+
+    def test_abandoned_jobs_fail_their_investigation(self):
+        """Lost jobs are swept while every slot is busy; exhausted ones fail their investigation."""
+        queue = MemoryJobQueue()
+        queue.max_attempts = 1
+        queue.enqueue("job", "t", {"input": {"investigation_id": "inv-1"}})
+        queue.claim("lost-worker")
+        queue._heartbeats["job"] -= 60
+        queue.enqueue("busy", "t", {})
+        queue.enqueue("backlog", "t", {})
+        updates = {}
+
+        async def update(values):
+            updates.update(values)
+
+        async def execute(job):
+            for _ in range(200):
+                if updates:
+                    return
+                await asyncio.sleep(0.01)
+
+        async def scenario():
+            worker = InvestigationWorker(queue, "w1", concurrency=1, poll_interval=0.01,
+                                         heartbeat_interval=0.01, stale_timeout=1.0,
+                                         execute=execute, update=update)
+            stop = asyncio.Event()
+            task = asyncio.create_task(worker.run(stop))
+            while not updates:
+                await asyncio.sleep(0.01)
+            stop.set()
+            await task
+
+        asyncio.run(scenario())
+        assert queue.finished["job"] == "worker lost too many times"
+        assert updates["inv-1"]["status"] == "failed"
+        assert "backlog" not in queue.finished  # the sweep did not wait for the queue to drain
+
+    def test_stops_job_lost_to_another_worker(self):
+        """A heartbeat that finds the job requeued cancels it without completing it."""
+        queue = MemoryJobQueue()
+        queue.enqueue("job", "t", {})
+        cancelled = asyncio.Event()
+        updates = {}
+
+        async def update(values):
+            updates.update(values)
+
+        async def execute(job):
+            queue.requeue_stale(-1)  # stall long enough to be presumed lost
+            queue.claim("w2")
+            try:
+                await asyncio.sleep(5)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        async def scenario():
+            worker = InvestigationWorker(queue, "w1", concurrency=1, poll_interval=0.01,
+                                         heartbeat_interval=0.01, stale_timeout=60,
+                                         execute=execute, update=update)
+            stop = asyncio.Event()
+            task = asyncio.create_task(worker.run(stop))
+            await asyncio.wait_for(cancelled.wait(), 2)
+            stop.set()
+            await task
+            return worker
+
+        worker = asyncio.run(scenario())
+        assert (worker.completed, worker.failed) == (0, 0)
+        assert "job" not in queue.finished and updates == {}
+        assert queue.complete("job", "w2")
+
+    def test_stop_lets_running_jobs_finish(self):
+        """Stopping the worker claims nothing new but waits for jobs in flight."""
+        queue = MemoryJobQueue()
+        queue.enqueue("slow", "t", {})
+        queue.enqueue("next", "t", {})
+
+        async def scenario():
+            stop = asyncio.Event()
+
+            async def execute(job):
+                stop.set()
+                await asyncio.sleep(0.05)
+
+            worker = InvestigationWorker(queue, "w1", concurrency=1, poll_interval=0.01,
+                                         execute=execute)
+            await worker.run(stop)
+
+        asyncio.run(scenario())
+        assert list(queue.finished) == ["slow"]
+        assert queue.pending_count() == 1
+
+    def test_stop_pipeline_writes_pending_status(self, monkeypatch):
+        """A draining worker process writes its pending status updates before exiting."""
+        written = {}
+
+        async def write(batch):
+            written.update(batch)
+            return len(batch)
+
+        async def scenario():
+            writer = StatusWriter(flush_interval=60, write=write)
+            monkeypatch.setitem(sys.modules, "src.api.app", SimpleNamespace(status_writer=writer))
+            writer.update("inv-1", status="completed")
+            await stop_pipeline()
+            return writer.stats()
+
+        stats = asyncio.run(scenario())
+        assert written == {"inv-1": {"status": "completed"}}
+        assert stats["pending"] == 0
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "-s"])
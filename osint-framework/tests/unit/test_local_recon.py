@@ -0,0 +1,639 @@
+"""
+Unit tests for the local (no API key) recon modules
+
+Tests:
+- Batched, cached IP enrichment in WhoisRecon
+- Persistent, merged WHOIS lookups
+- Streaming crt.sh parsing and the local CT index
+- EmailHarvester crawl frontier
+- Shared, cached breach lookups
+- Per-investigation page cache
+- Compiled technology matcher
+- Single-pass WebScraper extraction
+- Batched username checks
+- Streaming content checks
+- Batch metadata extraction
+"""
+
+import pytest
+import sys
+import asyncio
+import json
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from src.connectors.local.whois_recon import WhoisRecon, IPInfo, registrable_domain
+from src.connectors.local.recon_cache import ReconCache
+from src.connectors.local.cert_recon import CertRecon, CertReport, CTIndex, JSONArrayStream
+from src.connectors.local.email_harvester import EmailHarvester, CrawlFrontier
+from src.connectors.local.page_cache import PageCache, CachedPage
+from src.connectors.local.tech_fingerprinter import TechFingerprinter, TechMatcher, required_literals
+from src.connectors.local import web_scraper
+from src.connectors.local.web_scraper import WebScraper, WebPage
+from src.connectors.local import username_checker
+from src.connectors.local.username_checker import UsernameChecker, MarkerRule, DEFAULT_MARKER_RULE
+from src.connectors.local.metadata_extractor import MetadataExtractor
+from src.connectors.breach.lookup import BreachLookupService
+
+
+class TestWhoisIPEnrichment:
+    """Test WhoisRecon.lookup_ips batching and caching."""
+
+    def _recon(self, monkeypatch):
+        recon = WhoisRecon(whois_cache_ttl=0)
+        calls = []
+
+        async def fake_batch(session, ips):
+            calls.append(list(ips))
+            return {ip: IPInfo(ip=ip, org=f"org-{ip}") for ip in ips}
+
+        monkeypatch.setattr(recon, "_fetch_ip_batch", fake_batch)
+        return recon, calls
+
+    def test_lookup_ips_deduplicates(self, monkeypatch):
+        """Duplicate IPs are sent once in a single batch."""
+        recon, calls = self._recon(monkeypatch)
+        results = asyncio.run(recon.lookup_ips(["1.1.1.1", "8.8.8.8", "1.1.1.1", " 8.8.8.8 "]))
+        assert set(results) == {"1.1.1.1", "8.8.8.8"}
+        assert calls == [["1.1.1.1", "8.8.8.8"]]
+
+    def test_lookup_ips_chunks_large_batches(self, monkeypatch):
+        """More than 100 IPs are split into ip-api sized chunks."""
+        recon, calls = self._recon(monkeypatch)
+        ips = [f"10.0.{i // 256}.{i % 256}" for i in range(250)]
+        results = asyncio.run(recon.lookup_ips(ips))
+        assert len(results) == 250
+        assert sorted(len(c) for c in calls) == [50, 100, 100]
+
+    def test_lookup_ips_uses_cache(self, monkeypatch):
+        """Cached IPs are not requested again within the TTL."""
+        recon, calls = self._recon(monkeypatch)
+        asyncio.run(recon.lookup_ips(["1.1.1.1"]))
+        results = asyncio.run(recon.lookup_ips(["1.1.1.1", "9.9.9.9"]))
+        assert results["1.1.1.1"].org == "org-1.1.1.1"
+        assert calls == [["1.1.1.1"], ["9.9.9.9"]]
+
+
+class TestWhoisCache:
+    """Test WHOIS caching and in-flight merging."""
+
+    def test_registrable_domain(self):
+        """Host names reduce to their registrable domain."""
+        assert registrable_domain("www.example.com") == "example.com"
+        assert registrable_domain("mail.example.co.nz") == "example.co.nz"
+        assert registrable_domain("example.org") == "example.org"
+
+    def test_concurrent_lookups_are_merged_and_cached(self, monkeypatch):
+        """Concurrent lookups share one query; later ones hit the cache."""
+        cache = ReconCache("whois", path=":memory:")
+        recon = WhoisRecon(whois_cache=cache)
+        calls = []
+
+        def fake_whois(domain):
+            calls.append(domain)
+            return {"registrar": "Example Registrar"}
+
+        monkeypatch.setattr(recon, "_sync_whois", fake_whois)
+
+        async def run():
+            first = await asyncio.gather(recon.domain_whois("example.com"),
+                                         recon.domain_whois("www.example.com"))
+            second = await recon.domain_whois("api.example.com")
+            return first, second
+
+        (a, b), c = asyncio.run(run())
+        assert calls == ["example.com"]
+        assert a.registrar == b.registrar == c.registrar == "Example Registrar"
+        assert c.domain == "api.example.com"
+
+    def test_cache_opens_lazily_in_user_cache_dir(self, tmp_path, monkeypatch):
+        """Constructing WhoisRecon creates no file; the default lives under the user cache dir."""
+        monkeypatch.delenv("RECON_CACHE_PATH", raising=False)
+        monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "xdg"))
+        monkeypatch.chdir(tmp_path)
+        recon = WhoisRecon()
+        assert list(tmp_path.iterdir()) == []
+        recon._whois_cache.set("example.com", {"registrar": "R"}, 60)
+        assert (tmp_path / "xdg" / "osint-framework" / "recon_cache.db").exists()
+        recon._whois_cache.close()
+
+    def test_unwritable_cache_falls_back_to_memory(self, tmp_path):
+        """A cache path that cannot be created degrades to an in-memory cache."""
+        (tmp_path / "not-a-dir").write_text("")
+        cache = ReconCache("whois", path=str(tmp_path / "not-a-dir" / "cache.db"))
+        cache.set("example.com", {"registrar": "R"}, 60)
+        assert cache.get("example.com") == {"registrar": "R"}
+        assert cache.path == ":memory:"
+
+
+class TestCertTransparency:
+    """Test incremental crt.sh parsing and indexing."""
+
+    ENTRIES = [
+        {"id": 3, "issuer_name": "C=US, O=Let's Encrypt, CN=R3", "common_name": "example.com",
+         "name_value": "example.com\nwww.example.com", "not_after": "2000-01-01T00:00:00",
+         "serial_number": "aa"},
+        {"id": 2, "issuer_name": "C=US, O=Let's Encrypt, CN=R3", "common_name": "example.com",
+         "name_value": "example.com", "serial_number": "aa"},
+        {"id": 1, "issuer_name": "C=BE, O=GlobalSign, CN=GS", "common_name": "*.example.com",
+         "name_value": "*.example.com\napi.example.com", "serial_number": "bb"},
+    ]
+
+    def test_stream_yields_elements_across_chunk_boundaries(self):
+        """Elements split over many small chunks are parsed exactly once."""
+        payload = json.dumps(self.ENTRIES).encode()
+        stream = JSONArrayStream()
+        items = []
+        for i in range(0, len(payload), 7):
+            items.extend(stream.feed(payload[i:i + 7]))
+        stream.close()
+        assert items == self.ENTRIES
+
+    def test_stream_rejects_truncated_payload(self):
+        """A body cut off mid-element is reported instead of silently accepted."""
+        stream = JSONArrayStream()
+        stream.feed(json.dumps(self.ENTRIES).encode()[:-20])
+        with pytest.raises(ValueError):
+            stream.close()
+
+    def test_index_deduplicates_and_aggregates(self):
+        """Duplicate serials collapse and the report is built from the index."""
+        recon = CertRecon(index=CTIndex(path=":memory:"))
+        recon.index.add("example.com", [recon._entry_from_json(e) for e in self.ENTRIES])
+        report = CertReport(domain="example.com")
+        recon._process_results(recon.index.iter_entries("example.com"), report, "example.com")
+        assert report.total_certs == 2
+        assert report.unique_subdomains == ["api.example.com", "example.com", "www.example.com"]
+        assert report.unique_issuers == ["GlobalSign", "Let's Encrypt"]
+        assert report.wildcard_certs == 1
+        assert report.expired_certs == 1
+
+    def test_index_opens_lazily(self, tmp_path, monkeypatch):
+        """CertRecon() creates no file; the index database appears on first use."""
+        monkeypatch.setenv("RECON_CACHE_PATH", str(tmp_path / "ct.db"))
+        recon = CertRecon()
+        assert not (tmp_path / "ct.db").exists()
+        assert recon.index.sync_state("example.com") == (0, 0.0)
+        assert (tmp_path / "ct.db").exists()
+
+
+class TestCrawlFrontier:
+    """Test the EmailHarvester crawl frontier."""
+
+    def test_frontier_deduplicates_and_limits_depth(self):
+        """Normalized duplicates and links past max_depth are dropped."""
+        frontier = CrawlFrontier(max_depth=1)
+        assert frontier.add("https://Example.com", 0)
+        assert not frontier.add("https://example.com/#top", 0)
+        assert frontier.add("https://example.com/a", 1)
+        assert not frontier.add("https://example.com/b", 2)
+        assert [frontier.pop(), frontier.pop(), frontier.pop()] == [
+            ("https://example.com/", 0), ("https://example.com/a", 1), None]
+
+    def test_harvest_fetches_concurrently_within_budget(self, monkeypatch):
+        """Pages are fetched in parallel, link depth is honoured and max_pages is respected."""
+        harvester = EmailHarvester(max_pages=12, max_depth=1, per_host_delay=0)
+        active = {"now": 0, "peak": 0}
+
+        async def fake_scrape(session, url, domain):
+            active["now"] += 1
+            active["peak"] = max(active["peak"], active["now"])
+            await asyncio.sleep(0.01)
+            active["now"] -= 1
+            links = [f"https://{domain}/p{i}" for i in range(20)] if url.endswith("/") else []
+            return {f"info@{domain}"}, links
+
+        async def no_breach(emails):
+            return {}
+
+        monkeypatch.setattr(harvester, "_scrape_page", fake_scrape)
+        monkeypatch.setattr(harvester, "_check_breaches", no_breach)
+        report = asyncio.run(harvester.harvest("example.com"))
+        assert report.pages_crawled == 12
+        assert active["peak"] > 1
+        assert [e.email for e in report.emails] == ["info@example.com"]
+
+    def test_mailto_emails_match_breach_keys(self):
+        """mailto: addresses are decoded, stripped and lowercased like breach lookup keys."""
+        class FakePages:
+            async def fetch(self, url, timeout):
+                page = CachedPage(url=url, final_url=url, status=200, headers={}, charset="utf-8")
+                page._body = b'<a href="mailto:Sales%40Example.com ?subject=hi">mail</a>'
+                return page
+
+        emails, _ = asyncio.run(EmailHarvester()._scrape_page(
+            FakePages(), "https://example.com/", "example.com"))
+        assert emails == {"sales@example.com"}
+
+
+class TestBreachLookupService:
+    """Test batched, cached breach lookups."""
+
+    def _service(self, monkeypatch):
+        service = BreachLookupService(api_key="test", requests_per_minute=60000,
+                                      cache=ReconCache("breach", path=":memory:"))
+        calls = []
+
+        async def fake_get(session, path):
+            calls.append(path)
+            await asyncio.sleep(0.01)
+            return [{"Name": "Adobe"}] if "alice" in path else []
+
+        monkeypatch.setattr(service, "_get", fake_get)
+        return service, calls
+
+    def _run(self, service, coro):
+        async def run():
+            try:
+                return await coro
+            finally:
+                await service.close()
+        return asyncio.run(run())
+
+    def test_lookup_many_deduplicates_and_merges(self, monkeypatch):
+        """Duplicate and concurrent lookups of one email cost one request."""
+        service, calls = self._service(monkeypatch)
+
+        async def run():
+            return await asyncio.gather(
+                service.lookup_many(["alice@example.com", "ALICE@example.com", "bob@example.com"]),
+                service.lookup("alice@example.com"))
+
+        many, single = self._run(service, run())
+        assert len(calls) == 2
+        assert set(many) == {"alice@example.com", "bob@example.com"}
+        assert single.breaches == [{"Name": "Adobe"}]
+
+    def test_cancelled_caller_does_not_fail_merged_lookup(self, monkeypatch):
+        """A merged lookup survives the caller that started it being cancelled."""
+        service = BreachLookupService(api_key="test", requests_per_minute=60000,
+                                      cache=ReconCache("breach", path=":memory:"))
+
+        async def fake_get(session, path):
+            await asyncio.sleep(0.05)
+            assert not session.closed
+            return [{"Name": "Adobe"}]
+
+        monkeypatch.setattr(service, "_get", fake_get)
+
+        async def run():
+            first = asyncio.create_task(service.lookup("alice@example.com"))
+            await asyncio.sleep(0.01)
+            second = asyncio.create_task(service.lookup("alice@example.com"))
+            await asyncio.sleep(0.01)
+            first.cancel()
+            return await second
+
+        result = self._run(service, run())
+        assert not result.error
+        assert result.breaches == [{"Name": "Adobe"}]
+
+    def test_negative_answers_are_cached(self, monkeypatch):
+        """Clean emails are cached too, so repeat checks make no requests."""
+        service, calls = self._service(monkeypatch)
+        self._run(service, service.lookup_many(["alice@example.com", "bob@example.com"]))
+        results = self._run(service, service.lookup_many(["alice@example.com", "bob@example.com"]))
+        assert len(calls) == 2
+        assert results["bob@example.com"].breaches == []
+        assert all(r.cached for r in results.values())
+
+    def test_missing_api_key_skips_network(self, monkeypatch):
+        """Without a key, lookups report an error instead of calling HIBP."""
+        service, calls = self._service(monkeypatch)
+        service.api_key = None
+        result = asyncio.run(service.lookup("alice@example.com"))
+        assert calls == []
+        assert result.error
+
+
+class TestPageCache:
+    """Test the fetch-once page store shared by the web modules."""
+
+    HTML = b'<html><head><meta name="generator" content="WordPress 6.4"></head>' \
+           b'<body><a href="mailto:info@example.com">mail</a></body></html>'
+
+    def _cache(self, monkeypatch, **kwargs):
+        cache = PageCache(**kwargs)
+        calls = []
+
+        async def fake_fetch(url, timeout):
+            calls.append(url)
+            await asyncio.sleep(0.01)
+            page = CachedPage(url=url, final_url=url, status=200,
+                              headers={"server": "nginx"}, charset="utf-8")
+            page._body = self.HTML
+            return page
+
+        monkeypatch.setattr(cache, "_fetch", fake_fetch)
+        return cache, calls
+
+    def test_each_url_fetched_once_across_modules(self, monkeypatch):
+        """Scraper, fingerprinter and harvester reuse the same homepage fetch."""
+        cache, calls = self._cache(monkeypatch)
+        fingerprinter = TechFingerprinter()
+        harvester = EmailHarvester(max_pages=1, per_host_delay=0)
+
+        async def no_breach(emails):
+            return {}
+
+        monkeypatch.setattr(harvester, "_check_breaches", no_breach)
+
+        async def run():
+            matches, _ = await asyncio.gather(
+                fingerprinter.fingerprint_url("https://Example.com", cache),
+                cache.fetch("https://example.com/#top"))
+            report = await harvester.harvest("example.com", page_cache=cache)
+            return matches, report
+
+        matches, report = asyncio.run(run())
+        assert calls == ["https://Example.com"]
+        assert "WordPress" in [m.name for m in matches]
+        assert [e.email for e in report.emails] == ["info@example.com"]
+
+    def test_large_bodies_are_compressed(self):
+        """Large bodies are held compressed and redirect targets are cached too."""
+        from aiohttp import web
+        from aiohttp.test_utils import TestServer
+
+        body = "<p>hello</p>" * 10000
+        hits = []
+
+        async def home(request):
+            hits.append(request.path)
+            return web.Response(text=body, content_type="text/html")
+
+        async def old(request):
+            hits.append(request.path)
+            raise web.HTTPFound("/home")
+
+        async def run():
+            app = web.Application()
+            app.router.add_get("/home", home)
+            app.router.add_get("/old", old)
+            async with TestServer(app) as server:
+                async with PageCache(compress_threshold=1024) as cache:
+                    page = await cache.fetch(str(server.make_url("/old")))
+                    again = await cache.fetch(str(server.make_url("/home")))
+                    return page, again
+
+        page, again = asyncio.run(run())
+        assert hits == ["/old", "/home"]
+        assert page is again
+        assert page.compressed and len(page._body) < len(body)
+        assert page.text() == body
+
+
+class TestTechMatcher:
+    """Test the precompiled TECH_DB matcher."""
+
+    def test_required_literals(self):
+        """Literal runs are extracted, lowercased and split at non-literals."""
+        assert required_literals(r'cdn\.shopify\.com') == ["cdn.shopify.com"]
+        assert required_literals(r'react\.(?:production|development)\.min\.js') == ["react.", ".min.js"]
+        assert required_literals(r'(?:Python|Flask)') == []
+
+    def test_matches_html_meta_headers_and_cookies(self):
+        """All signature kinds match with versions, as the per-signature scan did."""
+        html = ('<meta name="generator" content="WordPress 6.4.2">'
+                '<script src="/js/jquery-3.7.1.min.js"></script><p>nothing else</p>')
+        matches = {m.name: m for m in TechMatcher().match(
+            html, {"Server": "nginx/1.25.3"}, ["laravel_session=x"])}
+        assert matches["WordPress"].version == "6.4.2"
+        assert matches["WordPress"].evidence == "meta: generator"
+        assert matches["jQuery"].version == "3.7.1"
+        assert matches["Nginx"].version == "1.25.3"
+        assert matches["Laravel"].evidence == "cookie: laravel_session"
+        assert "React" not in matches
+
+    def test_prefilter_handles_unicode_case_folding(self):
+        """Characters IGNORECASE folds to ASCII (long s, dotless i) still match."""
+        matches = TechMatcher().match("<script>\u017ftripe(key)</script>", {})
+        assert [m.name for m in matches] == ["Stripe"]
+
+
+class TestWebExtraction:
+    """Test the lxml extraction pass against the BeautifulSoup extractors."""
+
+    PAGES = [
+        '<html lang="en"><head><title> Box&lt;T&gt; &amp; more </title>'
+        '<meta name="description" content="About us">'
+        '<meta name="generator" content="WordPress 6.4">'
+        '<meta property="og:title" content="Example">'
+        '<link rel="stylesheet" href="/a.css"><link rel="Shortcut Icon" href="/favicon.ico">'
+        '<script src="/static/app.js"></script></head>'
+        '<body><a href="https://twitter.com/example">t</a><a href="https://GitHub.com/example">g</a>'
+        '<a href="mailto:info@example.com">mail</a> Call +1 555-123-4567'
+        '<script>var s = "<script src=fake.js>";</script></body></html>',
+        '<title>A <b>bold</b> title</title><p>no html tag, <a href="">empty</a></p>',
+        '<html><body><link rel="icon"><link rel="icon" href="/late.ico"></body></html>',
+        '<html><body><textarea><a href="https://twitter.com/alice">x</a><title>T</title></textarea>'
+        '<title>Real</title></body></html>',
+        '<title>Real</title><textarea>plain &lt;text&gt;</textarea><a href="https://github.com/a">g</a>',
+    ]
+
+    def _extract(self, html, use_lxml, monkeypatch):
+        monkeypatch.setattr(web_scraper, "HAS_LXML", use_lxml)
+        page = WebPage(url="https://example.com/")
+        WebScraper()._extract_content(html, page, "https://example.com/")
+        return page
+
+    def test_lxml_pass_matches_beautifulsoup(self, monkeypatch):
+        """The single lxml pass produces the same WebPage as the soup extractors."""
+        for html in self.PAGES:
+            assert self._extract(html, True, monkeypatch) == self._extract(html, False, monkeypatch)
+
+    def test_extracted_fields(self, monkeypatch):
+        """Spot-check the fields extracted from a typical page."""
+        page = self._extract(self.PAGES[0], True, monkeypatch)
+        assert page.title == "Box<T> & more"
+        assert page.language == "en"
+        assert page.generator == "WordPress 6.4"
+        assert page.open_graph == {"title": "Example"}
+        assert page.favicon_url == "https://example.com/favicon.ico"
+        assert page.scripts == ["https://example.com/static/app.js"]
+        assert set(page.social_links) == {"twitter", "github"}
+        assert page.emails == ["info@example.com"]
+
+    def test_repeated_attribute_keeps_first_value(self, monkeypatch):
+        """Documented difference: lxml keeps a repeated attribute's first value, soup its last."""
+        html = '<html><head><meta name="description" content="first" content="second"></head></html>'
+        assert self._extract(html, True, monkeypatch).description == "first"
+        assert self._extract(html, False, monkeypatch).description == "second"
+
+
+class TestUsernameBatch:
+    """Test UsernameChecker.check_many against a local server."""
+
+    def test_grid_uses_cheap_probes(self, monkeypatch):
+        """HEAD/range probes for status platforms, bodies only for content checks."""
+        from aiohttp import web
+        from aiohttp.test_utils import TestServer
+
+        requests = []
+
+        async def head_ok(request):
+            requests.append(("head_ok", request.method))
+            return web.Response(status=200 if request.match_info["user"] == "alice" else 404)
+
+        async def no_head(request):
+            requests.append(("no_head", request.method))
+            if request.method == "HEAD":
+                return web.Response(status=405)
+            if request.match_info["user"] != "alice":
+                return web.Response(status=404)
+            assert request.headers["Range"] == "bytes=0-0"
+            return web.Response(status=206, body=b"<")
+
+        async def content(request):
+            requests.append(("content", request.method))
+            return web.Response(text=f"<h1>profile of {request.query['id'].upper()}</h1>"
+                                if request.query["id"] == "alice" else "no such user")
+
+        async def run():
+            app = web.Application()
+            app.router.add_route("*", "/h/{user}", head_ok)
+            app.router.add_route("*", "/n/{user}", no_head)
+            app.router.add_get("/c", content)
+            async with TestServer(app) as server:
+                base = str(server.make_url(""))
+                monkeypatch.setattr(username_checker, "PLATFORMS", [
+                    ("HeadOK", base + "/h/{}", "status", [200]),
+                    ("NoHead", base + "/n/{}", "status", [200]),
+                    ("Content", base + "/c?id={}", "content", [200]),
+                ])
+                return await UsernameChecker().check_many(["alice", "bob", "alice"])
+
+        reports = asyncio.run(run())
+        assert list(reports) == ["alice", "bob"]
+        assert reports["alice"].found_count == 3
+        assert reports["bob"].found_count == 0
+        assert reports["bob"].checked_count == 3
+        assert requests.count(("head_ok", "HEAD")) == 2
+        assert ("head_ok", "GET") not in requests
+        assert requests.count(("content", "GET")) == 2
+        # Once HEAD proved useless for a platform, later checks go straight to GET
+        assert requests.count(("no_head", "HEAD")) <= 2
+        assert requests.count(("no_head", "GET")) == 2
+
+
+class _FakeContent:
+    def __init__(self, body, consumed):
+        self.body = body
+        self.consumed = consumed
+
+    async def iter_chunked(self, size):
+        for i in range(0, len(self.body), size):
+            self.consumed.append(size)
+            yield self.body[i:i + size]
+
+
+class _FakeResponse:
+    charset = "utf-8"
+
+    def __init__(self, body):
+        self.chunks = []
+        self.content = _FakeContent(body, self.chunks)
+
+
+class TestStreamingContentCheck:
+    """Test UsernameChecker._scan_body."""
+
+    def _scan(self, body, username="alice", rule=DEFAULT_MARKER_RULE, **kwargs):
+        checker = UsernameChecker(chunk_size=8, **kwargs)
+        resp = _FakeResponse(body)
+        return asyncio.run(checker._scan_body(resp, username, rule)), len(resp.chunks)
+
+    def test_stops_at_first_match_across_chunks(self):
+        """A case-insensitive match split over chunks ends the read early."""
+        found, chunks = self._scan(b"profile: ALICE" + b"x" * 10000)
+        assert found
+        assert chunks == 2
+
+    def test_respects_byte_limit(self):
+        """Nothing past max_body_bytes is read or searched."""
+        found, chunks = self._scan(b"x" * 100 + b"alice", max_body_bytes=64)
+        assert not found
+        assert chunks == 8
+
+    def test_not_found_marker_wins(self):
+        """A not-found marker settles the check even though the name is echoed later."""
+        rule = MarkerRule.compile({"not_found": ["No such user."]})
+        found, _ = self._scan(b"<p>no SUCH user.</p> search: alice", rule=rule)
+        assert not found
+
+    def test_echoed_name_waits_for_not_found_markers(self):
+        """A not-found page that echoes the name before its marker is not a hit."""
+        rule = MarkerRule.compile({"not_found": ["No such user."]})
+        found, _ = self._scan(b"search: alice" + b"x" * 100 + b"<p>No such user.</p>", rule=rule)
+        assert not found
+        found, chunks = self._scan(b"profile: alice" + b"x" * 100, rule=rule)
+        assert found
+        assert chunks == 15
+
+
+class TestBatchMetadata:
+    """Test directory/archive batch extraction and its cache."""
+
+    def _evidence(self, tmp_path):
+        from PIL import Image
+        import zipfile
+
+        root = tmp_path / "evidence"
+        root.mkdir()
+        exif = Image.Exif()
+        exif[0x010F] = "Canon"
+        Image.new("RGB", (8, 8)).save(root / "photo.jpg", exif=exif)
+        (root / "notes.txt").write_text("hello")
+        with zipfile.ZipFile(root / "dump.zip", "w") as zf:
+            zf.write(root / "photo.jpg", "inner/photo.jpg")
+        return root
+
+    def test_walks_directories_and_archives_to_ndjson(self, tmp_path):
+        """Files and archive members are extracted and streamed one JSON per line."""
+        import io
+        root = self._evidence(tmp_path)
+        extractor = MetadataExtractor(cache_path=str(tmp_path / "cache.db"))
+        out = io.StringIO()
+        assert extractor.write_ndjson(str(root), out, workers=2) == 3
+        rows = {r["filepath"]: r for r in map(json.loads, out.getvalue().splitlines())}
+        member = rows[f"{root / 'dump.zip'}::inner/photo.jpg"]
+        assert member["filename"] == "photo.jpg"
+        assert member["metadata"]["Make"] == "Canon"
+        assert rows[str(root / "photo.jpg")]["metadata"] == member["metadata"]
+
+    def test_only_images_and_pdfs_are_hashed(self, tmp_path):
+        """Other files come from their directory entry; oversized members are not read."""
+        import sqlite3
+        root = self._evidence(tmp_path)
+        extractor = MetadataExtractor(cache_path=str(tmp_path / "cache.db"))
+        rows = {m.filepath: m for m in extractor.extract_batch(str(root), workers=1,
+                                                               max_member_bytes=64)}
+        notes = rows[str(root / "notes.txt")]
+        assert (notes.file_size, notes.file_type, notes.metadata) == (5, ".txt", {})
+        member = rows[f"{root / 'dump.zip'}::inner/photo.jpg"]
+        assert member.errors and not member.metadata
+        with sqlite3.connect(str(tmp_path / "cache.db")) as db:
+            indexed = db.execute("SELECT key FROM recon_cache WHERE namespace = 'metadata_stat'").fetchall()
+        assert [key.split("|")[0] for (key,) in indexed] == [str((root / "photo.jpg").resolve())]
+
+    def test_rerun_skips_unchanged_files(self, tmp_path, monkeypatch):
+        """A second run serves unchanged files from the cache without the pool."""
+        import zipfile
+        root = self._evidence(tmp_path)
+        extractor = MetadataExtractor(cache_path=str(tmp_path / "cache.db"))
+        first = sorted((m.filepath, m.metadata) for m in extractor.extract_batch(str(root), workers=2))
+
+        def no_pool(*args):
+            raise AssertionError("unchanged file was re-processed")
+
+        monkeypatch.setattr(extractor, "_finish", no_pool)
+        # Cached archive members are not decompressed either
+        monkeypatch.setattr(zipfile.ZipFile, "read", no_pool)
+        second = sorted((m.filepath, m.metadata) for m in extractor.extract_batch(str(root), workers=2))
+        assert first == second
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "-s"])
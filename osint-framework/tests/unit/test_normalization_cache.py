@@ -0,0 +1,123 @@
+"""
+Unit tests for the cross-investigation normalization cache
+
+Tests:
+- Repeat entities are served from the cache instead of renormalized
+- Entries expire after the TTL
+- Keys change with the normalization version
+- Results round-trip through the entity_cache table
+"""
+
+import pytest
+import sys
+import asyncio
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from src.core.models.entities import Entity, EntityType
+from src.core.pipeline.normalize import NormalizationEngine, NormalizationStatus
+from src.core.pipeline import normalization_cache
+from src.core.pipeline.normalization_cache import NormalizationCache, normalization_key
+from src.db import Base, get_cached_entities, save_cached_entities
+
+
+def make_entity(email: str, investigation_id: str = "inv-1") -> Entity:
+    return Entity(investigation_id=investigation_id, entity_type=EntityType.EMAIL_ADDRESS,
+                  attributes={"email": email, "source": "test"})
+
+
+class TestNormalizationCache:
+    """Test read-through caching of normalization results."""
+
+    def test_repeat_entities_hit_cache(self):
+        """The second investigation gets identical results without renormalizing."""
+        engine = NormalizationEngine()
+        calls = []
+        original = engine._normalize_single_entity
+
+        async def counting(entity, correlation_id):
+            calls.append(entity.id)
+            return await original(entity, correlation_id)
+
+        engine._normalize_single_entity = counting
+
+        async def scenario():
+            first = await engine.normalize_entities([make_entity(" Alice@Example.COM ")])
+            second = await engine.normalize_entities(
+                [make_entity(" Alice@Example.COM ", "inv-2"), make_entity("bob@example.com", "inv-2")])
+            return first, second
+
+        first, second = asyncio.run(scenario())
+        assert len(calls) == 2  # alice once, bob once
+        cached = second[0]
+        assert cached.normalization_status == NormalizationStatus.COMPLETED
+        assert cached.normalized_entity.attributes == first[0].normalized_entity.attributes
+        assert cached.normalized_entity.investigation_id == "inv-2"
+        assert cached.transformations_applied == first[0].transformations_applied
+        assert engine.get_metrics()["cache"]["hits"] == 1
+
+    def test_entries_expire(self):
+        """Entries older than the TTL are misses."""
+        async def scenario():
+            cache = NormalizationCache(ttl_seconds=0.05)
+            await cache.put_many({"k": ("email_address", "a@b.c", {"attributes": {}})})
+            hit = await cache.get_many(["k"])
+            await asyncio.sleep(0.1)
+            return hit, await cache.get_many(["k"]), cache.stats()
+
+        hit, expired, stats = asyncio.run(scenario())
+        assert "k" in hit and expired == {}
+        assert stats["hits"] == 1 and stats["misses"] == 1 and stats["entries"] == 0
+
+    def test_version_is_part_of_the_key(self, monkeypatch):
+        """Bumping NORMALIZATION_VERSION retires every cached result."""
+        before = normalization_key("email_address", {"email": "a@b.c"})
+        assert normalization_key("email_address", {"email": "a@b.c"}) == before
+        monkeypatch.setattr(normalization_cache, "NORMALIZATION_VERSION",
+                            normalization_cache.NORMALIZATION_VERSION + 1)
+        assert normalization_key("email_address", {"email": "a@b.c"}) != before
+
+    def test_entity_cache_table_round_trip(self, tmp_path):
+        """A fresh process finds earlier results in entity_cache with one bulk lookup."""
+        engine = create_engine(f"sqlite:///{tmp_path / 'cache.db'}")
+        Base.metadata.create_all(engine)
+        db = sessionmaker(bind=engine)()
+        loads = []
+
+        async def load(hashes):
+            loads.append(list(hashes))
+            return await get_cached_entities(hashes, db=db)
+
+        async def save(entries, expires_at):
+            return await save_cached_entities(entries, expires_at, db=db)
+
+        def new_engine():
+            return NormalizationEngine(cache=NormalizationCache(load=load, save=save))
+
+        async def scenario():
+            await new_engine().normalize_entities([make_entity("Carol@Example.com")])
+            restarted = new_engine()
+            results = await restarted.normalize_entities(
+                [make_entity("Carol@Example.com"), make_entity("dave@example.com")])
+            return results, restarted.cache.stats()
+
+        results, stats = asyncio.run(scenario())
+        assert results[0].normalized_entity.attributes["email"] == "carol@example.com"
+        assert stats["store_hits"] == 1 and stats["misses"] == 1
+        assert len(loads[-1]) == 2
+
+        key = normalization_key("email_address", {"email": "x@y.z"})
+        past = datetime.utcnow() - timedelta(seconds=1)
+        asyncio.run(save_cached_entities({key: ("email_address", "x@y.z", {})}, past, db=db))
+        assert key not in asyncio.run(get_cached_entities([key], db=db))
+        db.close()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "-s"])
@@ -0,0 +1,241 @@
+"""
+Unit tests for the investigation orchestrator
+
+Tests:
+- Concurrent stage graph execution and dependency ordering
+- Per-stage time budgets
+- Progress and stage reporting while stages overlap
+- Incremental re-runs that repeat only stale stages
+- Indexed entity resolution
+- Batch runs over many targets
+"""
+
+import pytest
+import sys
+import asyncio
+import json
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from src.core.orchestrator import (
+    InvestigationOrchestrator, InvestigationConfig, InvestigationStage, InvestigationResult,
+    EntityTable
+)
+from src.core.batch import BatchRunner, read_targets
+
+
+def _report(data):
+    return SimpleNamespace(to_dict=lambda: dict(data), errors=[], status_code=0)
+
+
+class _FakeModules:
+    """Slow stand-ins for the domain recon modules that record call order."""
+
+    def __init__(self, delay: float = 0.2):
+        self.delay = delay
+        self.calls = []
+
+    async def _step(self, name, data):
+        self.calls.append(f"{name}:start")
+        await asyncio.sleep(self.delay)
+        self.calls.append(f"{name}:end")
+        return _report(data)
+
+    def install(self, orch: InvestigationOrchestrator):
+        orch.dns.full_recon = lambda domain, subdomain_scan=True: self._step(
+            "dns", {"ip_addresses": ["192.0.2.1"]})
+        orch.whois.domain_whois = lambda domain: self._step("whois", {"registrar": "Example"})
+
+        async def lookup_ips(ips):
+            self.calls.append(f"ips:{','.join(ips)}")
+            return {ip: _report({"org": "Example Net"}) for ip in ips}
+
+        orch.whois.lookup_ips = lookup_ips
+        orch.port_scanner.scan = lambda domain, quick=True: self._step("ports", {})
+        orch.cert_recon.search = lambda domain: self._step("certs", {})
+        orch.web_scraper.analyze = lambda domain, page_cache=None: self._step("web", {})
+        orch.email_harvester.harvest = lambda domain, max_pages=10, page_cache=None: self._step("emails", {})
+
+
+class TestStageGraph:
+    """Test concurrent execution of the domain stage graph."""
+
+    def test_stages_overlap_and_respect_dependencies(self):
+        """Independent stages run together; IP enrichment waits for DNS."""
+        orch = InvestigationOrchestrator()
+        fakes = _FakeModules(delay=0.2)
+        fakes.install(orch)
+        config = InvestigationConfig(target="example.com", max_parallel_stages=8)
+
+        start = time.monotonic()
+        result = asyncio.run(orch.run_investigation(config))
+        elapsed = time.monotonic() - start
+
+        # Six 0.2s stages finish in about one stage's time, not 1.2s
+        assert elapsed < 0.8
+        assert fakes.calls.index("ips:192.0.2.1") > fakes.calls.index("dns:end")
+        assert result.ip_info == {"org": "Example Net"}
+        assert result.whois == {"registrar": "Example"}
+
+    def test_parallelism_is_bounded(self):
+        """No more than max_parallel_stages stages are in flight at once."""
+        orch = InvestigationOrchestrator()
+        fakes = _FakeModules(delay=0.05)
+        fakes.install(orch)
+        asyncio.run(orch.run_investigation(InvestigationConfig(target="example.com",
+                                                               max_parallel_stages=2)))
+
+        running = peak = 0
+        for call in fakes.calls:
+            if call.endswith(":start"):
+                running += 1
+                peak = max(peak, running)
+            elif call.endswith(":end"):
+                running -= 1
+        assert peak == 2
+
+    def test_budget_and_progress_reporting(self):
+        """An over-budget stage times out without holding back the others."""
+        orch = InvestigationOrchestrator()
+        fakes = _FakeModules(delay=0.05)
+        fakes.install(orch)
+
+        async def hanging_scan(domain, quick=True):
+            await asyncio.sleep(30)
+
+        orch.port_scanner.scan = hanging_scan
+        config = InvestigationConfig(target="example.com", stage_budgets={"port_scan": 0.1})
+        percents, stages = [], []
+        result = asyncio.run(orch.run_investigation(
+            config,
+            progress_callback=lambda msg, pct: percents.append(pct),
+            stage_callback=lambda stage, status: stages.append((stage, status)),
+        ))
+
+        assert (InvestigationStage.PORT_SCAN, "timeout") in stages
+        assert any("timed out" in e for e in result.errors)
+        assert (InvestigationStage.WEB_ANALYSIS, "complete") in stages
+        assert percents == sorted(percents) and percents[-1] == 100
+
+
+class TestIncrementalRun:
+    """Test re-investigation against a previous result."""
+
+    def test_only_stale_stages_rerun(self, tmp_path):
+        """Fresh stages are reused from the saved result; stale ones run again."""
+        orch = InvestigationOrchestrator()
+        fakes = _FakeModules(delay=0)
+        fakes.install(orch)
+        config = InvestigationConfig(target="example.com")
+        first = asyncio.run(orch.run_investigation(config))
+        assert "whois_lookup" in first.refreshed_sections
+        saved = tmp_path / "example.com.json"
+        saved.write_text(first.to_json())
+
+        fakes.calls.clear()
+        config.freshness_ttls = {"port_scan": 0}
+        stages = []
+        second = asyncio.run(orch.run_investigation(
+            config, stage_callback=lambda stage, status: stages.append((stage, status)),
+            previous=str(saved)))
+
+        assert [c for c in fakes.calls if c.endswith(":start")] == ["ports:start"]
+        assert second.refreshed_sections == ["port_scan"]
+        assert "whois_lookup" in second.reused_sections
+        assert second.whois == {"registrar": "Example"}
+        assert second.section_times["whois_lookup"] == first.section_times["whois_lookup"]
+        assert (InvestigationStage.WHOIS_LOOKUP, "cached") in stages
+
+        # Refreshing DNS also refreshes the IP enrichment built on it
+        config.freshness_ttls = {"dns_recon": 0}
+        third = asyncio.run(orch.run_investigation(config, previous=second))
+        assert sorted(third.refreshed_sections) == ["dns_recon", "ip_enrichment"]
+
+    def test_other_targets_are_ignored(self):
+        """A previous result for a different target is not merged."""
+        orch = InvestigationOrchestrator()
+        _FakeModules(delay=0).install(orch)
+        previous = InvestigationResult(target="other.example", entity_type="domain",
+                                       whois={"registrar": "Other"},
+                                       section_times={"whois_lookup": "2999-01-01T00:00:00"})
+        result = asyncio.run(orch.run_investigation(InvestigationConfig(target="example.com"),
+                                                    previous=previous))
+        assert result.whois == {"registrar": "Example"}
+        assert not result.reused_sections
+
+
+class TestEntityResolution:
+    """Test the indexed entity table behind _resolve_entities."""
+
+    def test_table_deduplicates_with_stable_ids(self):
+        """Equivalent values map to one ID; relationships are added once."""
+        table = EntityTable()
+        target = table.add("domain", "example.com", is_target=True)
+        ip = table.add("ip", "2001:DB8::0001")
+        assert table.add("ip", "2001:db8::1") == ip
+        assert table.add("nameserver", "NS1.Example.net.") == table.add("nameserver", "ns1.example.net")
+        table.link(target, ip, "resolves_to", label="A record")
+        table.link(target, ip, "resolves_to", label="A record")
+        table.link(target, target, "self")
+        assert table.first("ip") == ip and table.has_value("EXAMPLE.COM")
+        assert [e["id"] for e in table.entities] == [0, 1, 2]
+        assert table.relationship_dicts() == [
+            {"source": 0, "target": 1, "type": "resolves_to", "label": "A record"}]
+
+    def test_resolve_merges_repeated_findings(self):
+        """Subdomains seen by DNS and CT, and repeated services, appear once."""
+        orch = InvestigationOrchestrator()
+        result = InvestigationResult(target="example.com", entity_type="domain")
+        result.dns = {"ip_addresses": ["192.0.2.1"], "subdomains": ["www.example.com"]}
+        result.certificates = {"unique_subdomains": ["www.example.com", "api.example.com"]}
+        result.ports = {"open_ports": [{"service": "http", "port": 80}] * 2}
+        orch._resolve_entities(result)
+
+        values = [e["value"] for e in result.entities]
+        assert values == ["example.com", "192.0.2.1", "www.example.com", "api.example.com", "http:80"]
+        assert {"source": 1, "target": 4, "type": "runs_service"} in result.relationships
+        assert len(result.relationships) == 4
+
+
+class TestBatchRunner:
+    """Test portfolio runs through one shared orchestrator."""
+
+    def test_runs_targets_with_shared_limits(self, tmp_path):
+        """Targets run concurrently, stage limits hold across them, results land on disk."""
+        orch = InvestigationOrchestrator()
+        fakes = _FakeModules(delay=0.05)
+        fakes.install(orch)
+        targets = [f"site{i}.example" for i in range(6)]
+        runner = BatchRunner(str(tmp_path / "out"), max_concurrent=3,
+                             stage_limits={"port_scan": 1}, orchestrator=orch)
+        seen = []
+
+        stats = asyncio.run(runner.run(
+            [InvestigationConfig(target=t) for t in targets],
+            progress_callback=lambda stats, result: seen.append(result.target),
+        ))
+
+        assert stats.completed == 6 and stats.failed == 0
+        assert sorted(seen) == targets
+        assert stats.elapsed_seconds < 6 * 0.3
+        # The port_scan limit of 1 serialises scans across the three workers
+        scans = [c for c in fakes.calls if c.startswith("ports:")]
+        assert scans == ["ports:start", "ports:end"] * 6
+        index = [json.loads(line) for line in (tmp_path / "out" / "index.ndjson").read_text().splitlines()]
+        assert sorted(row["target"] for row in index) == targets
+        report = json.loads((tmp_path / "out" / "site0.example.json").read_text())
+        assert report["whois"] == {"registrar": "Example"}
+
+    def test_read_targets(self, tmp_path):
+        """Blank lines, comments and duplicates are dropped."""
+        path = tmp_path / "targets.txt"
+        path.write_text("# portfolio\nexample.com\n\nexample.org  # second\nexample.com\n")
+        assert read_targets(str(path)) == ["example.com", "example.org"]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "-s"])
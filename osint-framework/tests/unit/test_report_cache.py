@@ -0,0 +1,102 @@
+"""
+Unit tests for the rendered report export cache
+
+Tests:
+- ETag matching and Accept-Encoding negotiation
+- Exports are compressed once and served from memory or disk
+- Exports of deleted reports are discarded and the directory stays bounded
+"""
+
+import pytest
+import sys
+import asyncio
+import gzip
+import os
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from src.api.report_cache import RenderedReport, ReportExportCache, HAS_BROTLI
+
+
+class TestRenderedReport:
+    """Test conditional request and encoding helpers."""
+
+    def test_etags_and_negotiation(self):
+        """Every representation shares the body hash; clients get their best encoding."""
+        rendered = RenderedReport(body=b'{"report": 1}', media_type="application/json",
+                                  encoded={"gzip": gzip.compress(b'{"report": 1}')})
+        assert rendered.etag_for(None) == f'"{rendered.etag}"'
+        assert rendered.matches(rendered.etag_for("gzip"))
+        assert rendered.matches(f'"other", W/{rendered.etag_for(None)}')
+        assert not rendered.matches('"0123"') and not rendered.matches(None)
+
+        assert rendered.negotiate("gzip, deflate, br")[0] == "gzip"
+        assert rendered.negotiate("br;q=1.0, gzip;q=0") == (None, rendered.body)
+        assert rendered.negotiate(None) == (None, rendered.body)
+
+
+class TestReportExportCache:
+    """Test the memory and disk layers."""
+
+    def test_put_then_get_from_memory_and_disk(self, tmp_path):
+        """A second process finds the compressed export on disk."""
+        body = b"# Report\n" + b"finding line\n" * 500
+
+        async def scenario():
+            cache = ReportExportCache(directory=str(tmp_path / "exports"))
+            assert await cache.get("r-1", "markdown") is None
+            stored = await cache.put("r-1", "markdown", body, "text/markdown")
+            again = await cache.get("r-1", "markdown")
+            restarted = ReportExportCache(directory=str(tmp_path / "exports"))
+            from_disk = await restarted.get("r-1", "markdown")
+            return cache, stored, again, restarted, from_disk
+
+        cache, stored, again, restarted, from_disk = asyncio.run(scenario())
+        assert again is stored and cache.stats()["hits"] == 1 and cache.stats()["misses"] == 1
+        assert gzip.decompress(stored.encoded["gzip"]) == body
+        assert len(stored.encoded["gzip"]) < len(body) / 10
+        assert ("br" in stored.encoded) == HAS_BROTLI
+        assert from_disk.etag == stored.etag and from_disk.encoded == stored.encoded
+        assert from_disk.media_type == "text/markdown" and restarted.stats()["disk_hits"] == 1
+
+    def test_lru_bound(self):
+        """Only max_entries exports stay in memory."""
+        async def scenario():
+            cache = ReportExportCache(max_entries=2)
+            for report_id in ("a", "b", "c"):
+                await cache.put(report_id, "json", report_id.encode(), "application/json")
+            return [await cache.get(report_id, "json") for report_id in ("a", "b", "c")]
+
+        assert [r is not None for r in asyncio.run(scenario())] == [False, True, True]
+
+    def test_discard_and_prune(self, tmp_path):
+        """Deleted reports lose their exports; pruning evicts the least recently used."""
+        directory = tmp_path / "exports"
+
+        async def known_reports(report_ids):
+            return set(report_ids) - {"deleted"}
+
+        async def scenario():
+            cache = ReportExportCache(directory=str(directory))
+            for report_id in ("gone", "deleted", "old", "new"):
+                await cache.put(report_id, "json", report_id.encode() * 100, "application/json")
+                await cache.put(report_id, "markdown", b"# " + report_id.encode(), "text/markdown")
+            os.utime(directory / "old.json", (1, 1))
+            os.utime(directory / "old.markdown", (1, 1))
+            await cache.discard(["gone"])
+            on_disk = cache._scan()
+            budget = on_disk["new"]["bytes"] + 1
+            return cache, await cache.prune(budget, known_reports), budget
+
+        cache, pruned, budget = asyncio.run(scenario())
+        assert sorted({path.name.split(".")[0] for path in directory.iterdir()}) == ["new"]
+        assert pruned == {"removed": 2, "bytes": budget - 1}
+        assert asyncio.run(cache.get("gone", "json")) is None
+        assert asyncio.run(cache.get("deleted", "markdown")) is None
+        assert asyncio.run(cache.get("new", "json")) is not None
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "-s"])
@@ -0,0 +1,162 @@
+"""
+Unit tests for the batched investigation status writer
+
+Tests:
+- Rapid updates to one investigation are merged into a single write
+- Updates never wait on a slow database
+- Failed batches are retried without losing newer values
+- flush() and stop() report updates that could not be written
+- Batched UPDATEs against a real SQLite database
+"""
+
+import pytest
+import sys
+import asyncio
+import time
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from src.api.status_writer import StatusWriter
+from src.db import Base, Investigation, update_investigations
+
+
+class TestStatusWriter:
+    """Test coalescing and batching of status updates."""
+
+    def test_updates_are_coalesced(self):
+        """Later values win and a burst becomes one batch."""
+        batches = []
+
+        async def write(batch):
+            batches.append(batch)
+            return len(batch)
+
+        async def scenario():
+            writer = StatusWriter(flush_interval=0.02, write=write)
+            for pct in (5.0, 25.0, 50.0):
+                writer.update("inv-1", status="running", progress_percentage=pct)
+            writer.update("inv-2", status="running", current_stage="fetching")
+            await asyncio.sleep(0.1)
+            writer.update("inv-1", status="completed", progress_percentage=100.0)
+            await writer.stop()
+            return writer.stats()
+
+        stats = asyncio.run(scenario())
+        assert batches == [
+            {"inv-1": {"status": "running", "progress_percentage": 50.0},
+             "inv-2": {"status": "running", "current_stage": "fetching"}},
+            {"inv-1": {"status": "completed", "progress_percentage": 100.0}},
+        ]
+        assert stats["updates"] == 5 and stats["batches"] == 2 and stats["pending"] == 0
+
+    def test_update_does_not_block_on_slow_writes(self):
+        """The event loop keeps running while a batch is being committed."""
+        async def slow_write(batch):
+            await asyncio.sleep(0.2)
+            return len(batch)
+
+        async def scenario():
+            writer = StatusWriter(flush_interval=0, write=slow_write)
+            writer.update("inv-1", status="running")
+            await asyncio.sleep(0.01)  # the first batch is now in flight
+            start = time.monotonic()
+            for _ in range(100):
+                writer.update("inv-1", progress_percentage=10.0)
+                await asyncio.sleep(0)
+            elapsed = time.monotonic() - start
+            await writer.stop()
+            return elapsed, writer.stats()
+
+        elapsed, stats = asyncio.run(scenario())
+        assert elapsed < 0.1
+        assert stats["batches"] == 2
+
+    def test_failed_batch_is_retried(self):
+        """A failed batch is requeued under newer values and written on the retry."""
+        batches = []
+
+        async def flaky_write(batch):
+            batches.append(batch)
+            if len(batches) == 1:
+                writer.update("inv-1", status="completed")  # arrives mid-write
+                raise RuntimeError("database is locked")
+            return len(batch)
+
+        async def scenario():
+            writer.update("inv-1", status="running", progress_percentage=50.0)
+            writer.update("inv-2", current_stage="fetching")
+            while len(batches) < 2:
+                await asyncio.sleep(0.01)
+            await writer.stop()
+            return writer.stats()
+
+        writer = StatusWriter(flush_interval=0, write=flaky_write, retry_delay=0.02)
+        stats = asyncio.run(scenario())
+        assert batches[1] == {"inv-1": {"status": "completed", "progress_percentage": 50.0},
+                              "inv-2": {"current_stage": "fetching"}}
+        assert stats["failed_batches"] == 1 and stats["batches"] == 1 and stats["pending"] == 0
+
+    def test_flush_reports_failed_writes(self):
+        """A failed flush returns False and keeps the update; stop() retries it."""
+        attempts = []
+
+        async def flaky_write(batch):
+            attempts.append(batch)
+            if len(attempts) < 3:
+                raise RuntimeError("database is locked")
+            return len(batch)
+
+        async def scenario():
+            writer.update("inv-1", status="failed")
+            flushed = await writer.flush()
+            pending = writer.stats()["pending"]
+            return flushed, pending, await writer.stop()
+
+        writer = StatusWriter(flush_interval=60, write=flaky_write, retry_delay=0.01)
+        assert asyncio.run(scenario()) == (False, 1, True)
+        assert attempts[-1] == {"inv-1": {"status": "failed"}}
+        assert writer.stats()["pending"] == 0
+
+    def test_stop_reports_lost_updates(self):
+        """stop() returns False when pending updates still cannot be written."""
+        async def broken_write(batch):
+            raise RuntimeError("disk full")
+
+        async def scenario():
+            writer.update("inv-1", status="completed")
+            return await writer.stop(attempts=2)
+
+        writer = StatusWriter(flush_interval=60, write=broken_write, retry_delay=0.01)
+        assert asyncio.run(scenario()) is False
+        assert writer.stats() == {"pending": 1, "updates": 1, "batches": 0,
+                                  "rows_written": 0, "failed_batches": 2}
+
+    def test_update_investigations_batch(self, tmp_path):
+        """One transaction updates every investigation in the batch."""
+        engine = create_engine(f"sqlite:///{tmp_path / 'status.db'}")
+        Base.metadata.create_all(engine)
+        db = sessionmaker(bind=engine)()
+        db.add_all([Investigation(investigation_id=f"inv-{i}", correlation_id=f"c-{i}",
+                                  status="pending") for i in range(3)])
+        db.commit()
+
+        changed = asyncio.run(update_investigations({
+            "inv-0": {"status": "running", "progress_percentage": 25.0},
+            "inv-2": {"status": "failed"},
+            "missing": {"status": "running"},
+        }, db=db))
+
+        assert changed == 2
+        rows = {inv.investigation_id: inv for inv in db.query(Investigation)}
+        assert (rows["inv-0"].status, rows["inv-0"].progress_percentage) == ("running", 25.0)
+        assert rows["inv-1"].status == "pending" and rows["inv-2"].status == "failed"
+        db.close()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "-s"])